@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="avatar_thumbnail",
+            field=models.ImageField(blank=True, null=True, upload_to="avatars/thumbs/"),
+        ),
+    ]
@@ -1,5 +1,16 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
 from django.db import models
+from django.db.models.functions import Upper
+
+
+def user_search_vector():
+    """
+    Full-text vector over a user's names. Names are not stemmed, and
+    queries must build the vector here to match ``users_search_idx``.
+    """
+    return SearchVector("username", "first_name", "last_name", config="simple")
 
 
 class User(AbstractUser):
@@ -17,9 +28,28 @@ class User(AbstractUser):
     phone = models.CharField(max_length=20, blank=True)
     bio = models.TextField(blank=True)
     avatar = models.ImageField(upload_to="avatars/", blank=True, null=True)
+    avatar_thumbnail = models.ImageField(
+        upload_to="avatars/thumbs/", blank=True, null=True
+    )
 
     class Meta:
         db_table = "users"
+        # Case-insensitive prefix search (``istartswith``) for autocomplete.
+        indexes = [
+            models.Index(
+                OpClass(Upper("username"), name="text_pattern_ops"),
+                name="users_username_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("first_name"), name="text_pattern_ops"),
+                name="users_first_name_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("last_name"), name="text_pattern_ops"),
+                name="users_last_name_prefix_idx",
+            ),
+            GinIndex(user_search_vector(), name="users_search_idx"),
+        ]
 
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
@@ -18,9 +18,10 @@ class UserSerializer(serializers.ModelSerializer):
             "phone",
             "bio",
             "avatar",
+            "avatar_thumbnail",
             "date_joined",
         ]
-        read_only_fields = ["id", "date_joined"]
+        read_only_fields = ["id", "avatar_thumbnail", "date_joined"]
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -1,8 +1,12 @@
 from django.contrib.auth import login, logout
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Q
 
+from apps.media.models import MediaJob
+from apps.media.services import MediaService
 from core.exceptions import PermissionDeniedError, ValidationError
 
-from .models import User
+from .models import User, user_search_vector
 
 
 class AccountService:
@@ -45,6 +49,10 @@ class AccountService:
             ):
                 setattr(user, field, value)
         user.save()
+
+        if data.get("avatar"):
+            MediaService.enqueue(MediaJob.Kind.AVATAR, user.id, user.avatar.name)
+
         return user
 
     @staticmethod
@@ -72,3 +80,35 @@ class AccountService:
     @staticmethod
     def get_all_referees():
         return User.objects.filter(role=User.Role.REFEREE, is_active=True)
+
+    @staticmethod
+    def search_users(role, query="", exclude_tournament=None):
+        """
+        Active users with ``role`` whose username, first or last name starts
+        with ``query``, leaving out members of ``exclude_tournament``. Prefix
+        matching keeps the lookup on the ``users_*_prefix_idx`` indexes.
+        """
+        users = User.objects.filter(role=role, is_active=True)
+        query = query.strip()
+        if query:
+            users = users.filter(
+                Q(username__istartswith=query)
+                | Q(first_name__istartswith=query)
+                | Q(last_name__istartswith=query)
+            )
+        if exclude_tournament is not None:
+            if role == User.Role.REFEREE:
+                users = users.exclude(referee_tournaments=exclude_tournament)
+            else:
+                users = users.exclude(tournaments=exclude_tournament)
+        return users.order_by("username")
+
+    @staticmethod
+    def search_names(text, role=User.Role.PLAYER):
+        """Users with ``role`` whose names match the full-text query ``text``."""
+        query = SearchQuery(text, config="simple", search_type="websearch")
+        return (
+            User.objects.alias(search=user_search_vector())
+            .filter(search=query, role=role)
+            .order_by()
+        )
@@ -2,10 +2,16 @@
 Tests for accounts services.
 """
 
+from datetime import date, timedelta
+
+from django.db import connection
 from django.test import RequestFactory, TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
 
 from apps.accounts.models import User
 from apps.accounts.services import AccountService
+from apps.tournaments.models import Tournament
 from core.exceptions import PermissionDeniedError, ValidationError
 
 
@@ -198,3 +204,84 @@ class AccountServiceTest(TestCase):
         self.assertEqual(referees.count(), 2)
         for ref in referees:
             self.assertEqual(ref.role, User.Role.REFEREE)
+
+
+class UserSearchTest(TestCase):
+    """Test cases for the player and referee autocomplete."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass",
+            role=User.Role.ORGANIZER,
+        )
+        names = [("alice", "Alice", "Smith"), ("bob", "Robert", "Alderson")]
+        self.players = [
+            User.objects.create_user(
+                username=username,
+                email=f"{username}@example.com",
+                password="pass",
+                first_name=first_name,
+                last_name=last_name,
+                role=User.Role.PLAYER,
+            )
+            for username, first_name, last_name in names
+        ]
+        User.objects.create_user(
+            username="albert",
+            email="albert@example.com",
+            password="pass",
+            role=User.Role.REFEREE,
+        )
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            created_by=self.organizer,
+        )
+
+    def test_prefix_search(self):
+        """Test usernames and names match case-insensitively by prefix."""
+        players = AccountService.search_users(User.Role.PLAYER, "AL")
+
+        self.assertEqual(list(players), self.players)
+        self.assertFalse(AccountService.search_users(User.Role.PLAYER, "lice"))
+
+    def test_excludes_tournament_members(self):
+        """Test registered players are not offered again."""
+        self.tournament.players.add(self.players[0])
+
+        players = AccountService.search_users(
+            User.Role.PLAYER, "al", self.tournament.id
+        )
+
+        self.assertEqual(list(players), [self.players[1]])
+
+    def test_search_uses_prefix_index(self):
+        """Test the username prefix lookup can be answered from its index."""
+        queryset = User.objects.filter(
+            role=User.Role.PLAYER, username__istartswith="al"
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+
+        self.assertIn("users_username_prefix_idx", plan)
+
+    def test_player_list_endpoint(self):
+        """Test the endpoint filters and paginates candidates."""
+        self.tournament.players.add(self.players[1])
+        self.client.force_authenticate(user=self.organizer)
+
+        response = self.client.get(
+            "/api/accounts/players/",
+            {"q": "al", "exclude_tournament": self.tournament.id},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["username"], "alice")
@@ -95,20 +95,35 @@ class DeleteAccountView(APIView):
         )
 
 
-class PlayerListView(generics.ListAPIView):
-    serializer_class = UserPublicSerializer
-    permission_classes = [IsAuthenticated]
+class UserSearchMixin:
+    """
+    ``?q=`` filters by username or name prefix and ``?exclude_tournament=``
+    leaves out users already in that tournament, for autocomplete pickers.
+    """
+
+    role = None
 
     def get_queryset(self):
-        return AccountService.get_all_players()
+        exclude_tournament = self.request.query_params.get("exclude_tournament")
+        if exclude_tournament is not None and not exclude_tournament.isdigit():
+            exclude_tournament = None
+        return AccountService.search_users(
+            self.role,
+            self.request.query_params.get("q", ""),
+            exclude_tournament,
+        )
 
 
-class RefereeListView(generics.ListAPIView):
+class PlayerListView(UserSearchMixin, generics.ListAPIView):
     serializer_class = UserPublicSerializer
     permission_classes = [IsAuthenticated]
+    role = User.Role.PLAYER
 
-    def get_queryset(self):
-        return AccountService.get_all_referees()
+
+class RefereeListView(UserSearchMixin, generics.ListAPIView):
+    serializer_class = UserPublicSerializer
+    permission_classes = [IsAuthenticated]
+    role = User.Role.REFEREE
 
 
 class UserListView(generics.ListAPIView):
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import MediaJob
+
+
+@admin.register(MediaJob)
+class MediaJobAdmin(admin.ModelAdmin):
+    list_display = ["kind", "object_id", "status", "attempts", "created_at"]
+    list_filter = ["kind", "status"]
+    search_fields = ["source", "error"]
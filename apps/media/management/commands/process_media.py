@@ -0,0 +1,39 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.media.services import MediaService
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnails and web renditions for uploaded images."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=settings.MEDIA_WORKERS)
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument(
+            "--once", action="store_true", help="Exit when the queue is empty."
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        # Workers only see bytes, so they are spawned fresh instead of forking
+        # a process that holds an open database connection.
+        pool = ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        with pool:
+            while True:
+                count = MediaService.process_batch(pool, options["batch_size"])
+                processed += count
+                if count:
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(settings.MEDIA_POLL_INTERVAL)
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} media jobs."))
@@ -0,0 +1,40 @@
+from django.db import models
+
+from core.mixins import TimestampMixin
+
+
+class MediaJob(TimestampMixin):
+    class Kind(models.TextChoices):
+        EVIDENCE = "EVIDENCE", "Evidence"
+        AVATAR = "AVATAR", "Avatar"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        DONE = "DONE", "Done"
+        SKIPPED = "SKIPPED", "Skipped"
+        FAILED = "FAILED", "Failed"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.PositiveBigIntegerField()
+    source = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    started_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        db_table = "media_jobs"
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"],
+                condition=models.Q(status__in=["PENDING", "RUNNING"]),
+                name="media_jobs_open_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} job #{self.object_id} ({self.status})"
@@ -0,0 +1,33 @@
+import io
+import os
+
+from PIL import Image, ImageOps
+
+IMAGE_EXTENSIONS = {".bmp", ".gif", ".jpeg", ".jpg", ".png", ".tif", ".tiff", ".webp"}
+
+
+def is_image(name):
+    return os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def render_image(data, sizes, quality=85):
+    """
+    Runs in a worker process, so it works on bytes only and never touches the
+    database. Returns the upright size of the original and one JPEG per entry
+    in sizes. Metadata is not copied to the renditions, which strips EXIF.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        width, height = image.size
+        renditions = {}
+        for name, size in sizes.items():
+            rendition = image.copy()
+            rendition.thumbnail(size)
+            output = io.BytesIO()
+            rendition.save(output, "JPEG", quality=quality, optimize=True)
+            renditions[name] = output.getvalue()
+
+    return {"width": width, "height": height, "renditions": renditions}
@@ -0,0 +1,149 @@
+from concurrent.futures import as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from PIL import UnidentifiedImageError
+
+from apps.accounts.models import User
+from apps.scores.models import EvidenceBlob
+from core.storage import evidence_storage
+
+from . import processing
+from .models import MediaJob
+
+
+class MediaService:
+    @staticmethod
+    def enqueue(kind, object_id, source):
+        if not processing.is_image(source):
+            return None
+        return MediaJob.objects.create(kind=kind, object_id=object_id, source=source)
+
+    @staticmethod
+    def claim_jobs(batch_size):
+        """
+        Take up to batch_size jobs for this worker. Jobs left RUNNING longer
+        than MEDIA_JOB_TIMEOUT belonged to a worker that died and are retried.
+        """
+        stale = timezone.now() - timedelta(seconds=settings.MEDIA_JOB_TIMEOUT)
+        with transaction.atomic():
+            jobs = list(
+                MediaJob.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=MediaJob.Status.PENDING)
+                    | Q(status=MediaJob.Status.RUNNING, started_at__lt=stale)
+                )
+                .order_by("created_at")[:batch_size]
+            )
+            now = timezone.now()
+            for job in jobs:
+                job.status = MediaJob.Status.RUNNING
+                job.started_at = now
+                job.updated_at = now
+                job.attempts += 1
+            MediaJob.objects.bulk_update(
+                jobs, ["status", "started_at", "updated_at", "attempts"]
+            )
+        return jobs
+
+    @staticmethod
+    def process_batch(executor, batch_size=None):
+        jobs = MediaService.claim_jobs(batch_size or settings.MEDIA_BATCH_SIZE)
+
+        futures = {}
+        for job in jobs:
+            try:
+                storage = (
+                    evidence_storage
+                    if job.kind == MediaJob.Kind.EVIDENCE
+                    else default_storage
+                )
+                with storage.open(job.source, "rb") as f:
+                    data = f.read()
+            except OSError as e:
+                MediaService._fail(job, e)
+                continue
+            future = executor.submit(
+                processing.render_image, data, settings.MEDIA_RENDITION_SIZES
+            )
+            futures[future] = job
+
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                MediaService._apply(job, future.result())
+            except UnidentifiedImageError:
+                MediaService._finish(job, MediaJob.Status.SKIPPED)
+            except Exception as e:
+                MediaService._fail(job, e)
+
+        return len(jobs)
+
+    @staticmethod
+    @transaction.atomic
+    def _apply(job, result):
+        if job.kind == MediaJob.Kind.EVIDENCE:
+            MediaService._apply_evidence(job, result)
+        else:
+            MediaService._apply_avatar(job, result)
+        MediaService._finish(job, MediaJob.Status.DONE)
+
+    @staticmethod
+    def _apply_evidence(job, result):
+        blob = EvidenceBlob.objects.select_for_update().get(id=job.object_id)
+        renditions = result["renditions"]
+
+        # The original is evidence and keeps its bytes (and content hash);
+        # only the renditions that pages display are stripped.
+        blob.width = result["width"]
+        blob.height = result["height"]
+        blob.thumbnail.save(
+            f"{blob.sha256}_thumb.jpg", ContentFile(renditions["thumb"]), save=False
+        )
+        blob.preview.save(
+            f"{blob.sha256}_web.jpg", ContentFile(renditions["web"]), save=False
+        )
+        blob.save(update_fields=["width", "height", "thumbnail", "preview"])
+
+    @staticmethod
+    def _apply_avatar(job, result):
+        user = User.objects.select_for_update().get(id=job.object_id)
+        if user.avatar.name != job.source:
+            # A newer avatar was uploaded; its own job will handle it.
+            return
+
+        renditions = result["renditions"]
+        old_name = user.avatar.name
+        old_thumbnail = user.avatar_thumbnail.name
+        user.avatar.save(f"{user.id}.jpg", ContentFile(renditions["web"]), save=False)
+        user.avatar_thumbnail.save(
+            f"{user.id}.jpg", ContentFile(renditions["thumb"]), save=False
+        )
+        user.save(update_fields=["avatar", "avatar_thumbnail"])
+
+        def delete_old_files():
+            for name in (old_name, old_thumbnail):
+                if name:
+                    default_storage.delete(name)
+
+        transaction.on_commit(delete_old_files)
+
+    @staticmethod
+    def _finish(job, status):
+        job.status = status
+        job.error = ""
+        job.save(update_fields=["status", "error", "updated_at"])
+
+    @staticmethod
+    def _fail(job, error):
+        if job.attempts >= settings.MEDIA_JOB_MAX_ATTEMPTS:
+            job.status = MediaJob.Status.FAILED
+        else:
+            job.status = MediaJob.Status.PENDING
+        job.error = str(error)
+        job.save(update_fields=["status", "error", "updated_at"])
@@ -0,0 +1,204 @@
+"""
+Tests for background media processing.
+"""
+
+import io
+import multiprocessing
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from apps.accounts.models import User
+from apps.accounts.services import AccountService
+from apps.media import processing
+from apps.media.models import MediaJob
+from apps.media.services import MediaService
+from apps.scores.models import Dispute
+from apps.scores.services import DisputeService
+from apps.tournaments.models import Match, Tournament
+
+SIZES = {"thumb": (32, 32), "web": (100, 100)}
+
+
+def make_image(size=(400, 200), orientation=None):
+    image = Image.new("RGB", size, "red")
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"
+    if orientation:
+        exif[0x0112] = orientation
+    output = io.BytesIO()
+    image.save(output, "JPEG", exif=exif)
+    return output.getvalue()
+
+
+class RenderImageTest(SimpleTestCase):
+    """Test cases for the Pillow rendering step."""
+
+    def test_renditions_fit_sizes_and_drop_exif(self):
+        """Test renditions are scaled down and carry no EXIF."""
+        result = processing.render_image(make_image(), SIZES)
+
+        self.assertEqual((result["width"], result["height"]), (400, 200))
+        with Image.open(io.BytesIO(result["renditions"]["thumb"])) as thumb:
+            self.assertEqual(thumb.size, (32, 16))
+            self.assertEqual(len(thumb.getexif()), 0)
+
+    def test_orientation_is_applied(self):
+        """Test a rotated phone photo is stored upright."""
+        result = processing.render_image(make_image(orientation=6), SIZES)
+
+        self.assertEqual((result["width"], result["height"]), (200, 400))
+
+    def test_runs_in_spawned_process(self):
+        """Test rendering works in a fresh worker process."""
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(processing.render_image, make_image(), SIZES)
+
+            self.assertEqual(result.result()["width"], 400)
+
+
+class MediaServiceTest(TestCase):
+    """Test cases for the media job queue."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root, MEDIA_RENDITION_SIZES=SIZES
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown)
+
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.player = User.objects.create_user(
+            username="player1",
+            email="p1@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            created_by=self.organizer,
+        )
+        match = Match.objects.create(
+            tournament=tournament, player1=self.player, player2=self.organizer
+        )
+        self.dispute = Dispute.objects.create(
+            match=match, raised_by=self.player, reason="Line call"
+        )
+
+    def test_evidence_image_gets_renditions(self):
+        """Test a new evidence photo is queued and processed."""
+        evidence = DisputeService.add_evidence(
+            self.dispute.id,
+            SimpleUploadedFile("photo.jpg", make_image()),
+            "Ball mark",
+            self.player,
+        )
+        self.assertEqual(MediaJob.objects.get().status, MediaJob.Status.PENDING)
+
+        self.assertEqual(MediaService.process_batch(self.executor), 1)
+
+        blob = evidence.blob
+        blob.refresh_from_db()
+        self.assertEqual((blob.width, blob.height), (400, 200))
+        self.assertTrue(blob.thumbnail.name.endswith("_thumb.jpg"))
+        self.assertTrue(blob.preview.name.endswith("_web.jpg"))
+        self.assertEqual(MediaJob.objects.get().status, MediaJob.Status.DONE)
+
+    def test_duplicate_evidence_is_processed_once(self):
+        """Test a deduplicated upload does not queue another job."""
+        for _ in range(2):
+            DisputeService.add_evidence(
+                self.dispute.id,
+                SimpleUploadedFile("photo.jpg", make_image()),
+                "Ball mark",
+                self.player,
+            )
+
+        self.assertEqual(MediaJob.objects.count(), 1)
+
+    def test_videos_are_not_queued(self):
+        """Test non-image evidence is left alone."""
+        DisputeService.add_evidence(
+            self.dispute.id,
+            SimpleUploadedFile("clip.mp4", b"not an image"),
+            "Video",
+            self.player,
+        )
+
+        self.assertFalse(MediaJob.objects.exists())
+
+    def test_unreadable_image_is_skipped(self):
+        """Test a file Pillow cannot open is marked skipped."""
+        DisputeService.add_evidence(
+            self.dispute.id,
+            SimpleUploadedFile("broken.png", b"not an image"),
+            "Broken",
+            self.player,
+        )
+
+        MediaService.process_batch(self.executor)
+
+        self.assertEqual(MediaJob.objects.get().status, MediaJob.Status.SKIPPED)
+
+    def test_avatar_is_replaced_with_stripped_copy(self):
+        """Test avatars are resized, stripped and given a thumbnail."""
+        AccountService.update_profile(
+            self.player,
+            {"avatar": SimpleUploadedFile("me.jpg", make_image((3000, 3000)))},
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MediaService.process_batch(self.executor)
+
+        self.player.refresh_from_db()
+        with self.player.avatar.open("rb") as f, Image.open(f) as avatar:
+            self.assertEqual(avatar.size, (100, 100))
+            self.assertEqual(len(avatar.getexif()), 0)
+        self.assertTrue(self.player.avatar_thumbnail)
+
+    def test_failed_job_is_retried_then_given_up(self):
+        """Test a job whose source is missing fails after max attempts."""
+        job = MediaJob.objects.create(
+            kind=MediaJob.Kind.EVIDENCE, object_id=1, source="missing.jpg"
+        )
+
+        with self.settings(MEDIA_JOB_MAX_ATTEMPTS=2):
+            MediaService.process_batch(self.executor)
+            job.refresh_from_db()
+            self.assertEqual(job.status, MediaJob.Status.PENDING)
+
+            MediaService.process_batch(self.executor)
+            job.refresh_from_db()
+            self.assertEqual(job.status, MediaJob.Status.FAILED)
+
+    def test_abandoned_running_job_is_reclaimed(self):
+        """Test jobs from a crashed worker are picked up again."""
+        job = MediaJob.objects.create(
+            kind=MediaJob.Kind.EVIDENCE,
+            object_id=1,
+            source="missing.jpg",
+            status=MediaJob.Status.RUNNING,
+            started_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertEqual(MediaService.claim_jobs(10), [job])
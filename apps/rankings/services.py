@@ -79,13 +79,15 @@ class RankingService:
 
     @staticmethod
     def recalculate_positions(tournament):
-        rankings = Ranking.objects.filter(tournament=tournament).order_by(
-            "-points", "-wins", "losses", "-sets_won"
+        rankings = list(
+            Ranking.objects.filter(tournament=tournament).order_by(
+                "-points", "-wins", "losses", "-sets_won"
+            )
         )
 
         for i, ranking in enumerate(rankings, 1):
             ranking.position = i
-            ranking.save(update_fields=["position"])
+        Ranking.objects.bulk_update(rankings, ["position"])
 
     @staticmethod
     @transaction.atomic
@@ -1,6 +1,15 @@
 from django.contrib import admin
 
-from .models import Dispute, Evidence, Score
+from .models import (
+    Dispute,
+    DisputeRollup,
+    Evidence,
+    EvidenceUpload,
+    IdempotencyKey,
+    PointEvent,
+    Score,
+    ScoreRevision,
+)
 
 
 @admin.register(Score)
@@ -19,9 +28,43 @@ class DisputeAdmin(admin.ModelAdmin):
     raw_id_fields = ["match", "raised_by", "resolved_by", "final_score"]
 
 
+@admin.register(DisputeRollup)
+class DisputeRollupAdmin(admin.ModelAdmin):
+    list_display = ["day", "period", "tournament", "referee", "court", "round"]
+    list_filter = ["period", "round"]
+    raw_id_fields = ["tournament", "referee"]
+
+
 @admin.register(Evidence)
 class EvidenceAdmin(admin.ModelAdmin):
     list_display = ["dispute", "submitted_by", "created_at"]
     list_filter = ["created_at"]
     search_fields = ["dispute__match__tournament__name", "description"]
     raw_id_fields = ["dispute", "submitted_by"]
+
+
+@admin.register(EvidenceUpload)
+class EvidenceUploadAdmin(admin.ModelAdmin):
+    list_display = ["filename", "dispute", "submitted_by", "offset", "size"]
+    search_fields = ["filename", "submitted_by__username"]
+    raw_id_fields = ["dispute", "submitted_by", "evidence"]
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ["key", "user", "response_status", "created_at", "expires_at"]
+    list_filter = ["response_status"]
+    search_fields = ["key", "user__username"]
+    raw_id_fields = ["user"]
+
+
+@admin.register(PointEvent)
+class PointEventAdmin(admin.ModelAdmin):
+    list_display = ["match", "sequence", "winner", "created_at"]
+    raw_id_fields = ["match"]
+
+
+@admin.register(ScoreRevision)
+class ScoreRevisionAdmin(admin.ModelAdmin):
+    list_display = ["score", "revision", "changed_by", "created_at"]
+    raw_id_fields = ["score", "match", "changed_by"]
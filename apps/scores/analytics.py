@@ -0,0 +1,64 @@
+from bisect import bisect_left
+
+# Upper bounds (seconds) of the resolution time histogram buckets; the last
+# bucket holds everything slower than a week.
+RESOLUTION_BUCKETS = [
+    minutes * 60
+    for minutes in (
+        5,
+        10,
+        15,
+        30,
+        45,
+        60,
+        90,
+        120,
+        180,
+        240,
+        360,
+        480,
+        720,
+        1080,
+        1440,
+        2160,
+        2880,
+        4320,
+        7200,
+        10080,
+    )
+]
+
+
+def empty_histogram():
+    return [0] * (len(RESOLUTION_BUCKETS) + 1)
+
+
+def bucket_for(seconds):
+    return bisect_left(RESOLUTION_BUCKETS, seconds)
+
+
+def merge_histograms(target, other):
+    for i, count in enumerate(other):
+        target[i] += count
+    return target
+
+
+def histogram_median(histogram):
+    """
+    Estimate the median from bucket counts, interpolating inside the bucket
+    that holds the middle value.
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+
+    middle = total / 2
+    seen = 0
+    for i, count in enumerate(histogram):
+        if seen + count >= middle and count:
+            lower = RESOLUTION_BUCKETS[i - 1] if i else 0
+            if i == len(RESOLUTION_BUCKETS):
+                return lower
+            upper = RESOLUTION_BUCKETS[i]
+            return round(lower + (upper - lower) * (middle - seen) / count)
+        seen += count
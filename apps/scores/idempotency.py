@@ -0,0 +1,70 @@
+import hashlib
+from functools import wraps
+
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from .services import IdempotencyService
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def _request_hash(request):
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(request.path.encode())
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _replay(stored, request_hash):
+    if stored.request_hash != request_hash:
+        return Response(
+            {"error": "Idempotency-Key was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(
+        stored.response_body,
+        status=stored.response_status,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def idempotent(view_method):
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {
+                    "error": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        request_hash = _request_hash(request)
+        stored = IdempotencyService.get_stored_response(request.user, key)
+        if stored:
+            return _replay(stored, request_hash)
+
+        try:
+            with transaction.atomic():
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code < 500:
+                    IdempotencyService.store_response(
+                        request.user, key, request_hash, response
+                    )
+        except IntegrityError:
+            stored = IdempotencyService.get_stored_response(request.user, key)
+            if stored is None:
+                raise
+            return _replay(stored, request_hash)
+
+        return response
+
+    return wrapper
@@ -0,0 +1,160 @@
+import threading
+
+from django.conf import settings
+from django.db.models import Max
+
+from core.exceptions import InvalidStateError
+
+from .models import PointEvent
+
+POINT_NAMES = ["0", "15", "30", "40"]
+
+
+class LiveMatch:
+    def __init__(self, best_of=3):
+        self.best_of = best_of
+        self.sets = []
+        self.games = [0, 0]
+        self.points = [0, 0]
+        self.winner = None
+
+    @property
+    def is_tiebreak(self):
+        return self.games == [6, 6]
+
+    @property
+    def is_finished(self):
+        return self.winner is not None
+
+    def add_point(self, player):
+        if self.is_finished:
+            raise InvalidStateError("Match is already finished.")
+
+        won, lost = player - 1, 2 - player
+        self.points[won] += 1
+
+        target = 7 if self.is_tiebreak else 4
+        if self.points[won] >= target and self.points[won] - self.points[lost] >= 2:
+            self._win_game(won, lost)
+
+    def _win_game(self, won, lost):
+        self.points = [0, 0]
+        self.games[won] += 1
+
+        games_won, games_lost = self.games[won], self.games[lost]
+        if games_won == 7 or (games_won >= 6 and games_won - games_lost >= 2):
+            self._win_set(won)
+
+    def _win_set(self, won):
+        self.sets.append(tuple(self.games))
+        self.games = [0, 0]
+
+        sets_won = sum(1 for games in self.sets if games[won] > games[1 - won])
+        if sets_won > self.best_of // 2:
+            self.winner = won + 1
+
+    def point_display(self):
+        p1, p2 = self.points
+        if self.is_tiebreak:
+            return str(p1), str(p2)
+        if p1 >= 3 and p2 >= 3:
+            if p1 == p2:
+                return "40", "40"
+            return ("AD", "40") if p1 > p2 else ("40", "AD")
+        return POINT_NAMES[p1], POINT_NAMES[p2]
+
+    def set_scores(self):
+        return [{"player1": p1, "player2": p2} for p1, p2 in self.sets]
+
+    def to_dict(self):
+        p1_points, p2_points = self.point_display()
+        return {
+            "sets": self.set_scores(),
+            "games": {"player1": self.games[0], "player2": self.games[1]},
+            "points": {"player1": p1_points, "player2": p2_points},
+            "tiebreak": self.is_tiebreak,
+            "finished": self.is_finished,
+            "winner": f"player{self.winner}" if self.winner else None,
+        }
+
+
+class LiveSession:
+    def __init__(self, match_id, best_of):
+        self.match_id = match_id
+        self.state = LiveMatch(best_of)
+        self.sequence = 0
+
+    def replay(self, winners):
+        for player in winners:
+            self.state.add_point(player)
+            self.sequence += 1
+
+    def record(self, points):
+        """
+        Apply ``points`` until the match is decided and write them with one
+        insert. Call with the match row locked.
+        """
+        events = []
+        for player in points:
+            if self.state.is_finished:
+                break
+            self.state.add_point(player)
+            self.sequence += 1
+            events.append(
+                PointEvent(
+                    match_id=self.match_id, sequence=self.sequence, winner=player
+                )
+            )
+        PointEvent.objects.bulk_create(events)
+        return events
+
+    def to_dict(self):
+        return {
+            "match": self.match_id,
+            "sequence": self.sequence,
+            **self.state.to_dict(),
+        }
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def load_session(match_id):
+    session = LiveSession(match_id, settings.LIVE_SCORING_BEST_OF)
+    session.replay(
+        PointEvent.objects.filter(match_id=match_id)
+        .order_by("sequence")
+        .values_list("winner", flat=True)
+    )
+    return session
+
+
+def last_sequence(match_id):
+    return (
+        PointEvent.objects.filter(match_id=match_id).aggregate(last=Max("sequence"))[
+            "last"
+        ]
+        or 0
+    )
+
+
+def get_session(match_id):
+    """
+    This process's session for ``match_id``, rebuilt from the point events
+    when another process has written points since it was cached (or a
+    write it made was rolled back). Call with the match row locked so the
+    check still holds when the new points are inserted.
+    """
+    with _sessions_lock:
+        session = _sessions.get(match_id)
+    if session is None or session.sequence != last_sequence(match_id):
+        session = load_session(match_id)
+        with _sessions_lock:
+            _sessions[match_id] = session
+    return session
+
+
+def discard_session(match_id):
+    with _sessions_lock:
+        _sessions.pop(match_id, None)
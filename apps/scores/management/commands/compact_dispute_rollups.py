@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from apps.scores.services import DisputeAnalyticsService
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold daily dispute rollups older than DISPUTE_ROLLUP_DAILY_DAYS into "
+        "monthly rows. Run it once a day."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-days", type=int)
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute all rollups from the disputes and matches tables first.",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            rebuilt = DisputeAnalyticsService.rebuild_rollups()
+            self.stdout.write(f"Rebuilt {rebuilt} daily rollups.")
+
+        compacted = DisputeAnalyticsService.compact_rollups(options["keep_days"])
+        self.stdout.write(self.style.SUCCESS(f"Compacted {compacted} daily rollups."))
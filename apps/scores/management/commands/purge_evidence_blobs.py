@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.scores.services import EvidenceBlobService
+
+
+class Command(BaseCommand):
+    help = "Delete evidence blobs no evidence points to."
+
+    def handle(self, *args, **options):
+        deleted = EvidenceBlobService.purge_unreferenced_blobs()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} unreferenced blobs."))
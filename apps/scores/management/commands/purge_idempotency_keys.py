@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.scores.services import IdempotencyService
+
+
+class Command(BaseCommand):
+    help = "Delete idempotency keys whose TTL has expired."
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyService.purge_expired_keys()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} expired keys."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.scores.services import EvidenceUploadService
+
+
+class Command(BaseCommand):
+    help = "Delete unfinished evidence uploads older than EVIDENCE_UPLOAD_EXPIRY_HOURS."
+
+    def handle(self, *args, **options):
+        deleted = EvidenceUploadService.purge_stale_uploads()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} stale uploads."))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from apps.scores.services import SweeperService
+
+
+class Command(BaseCommand):
+    help = (
+        "Auto-confirm or escalate unconfirmed scores on matches that have been "
+        "in progress longer than SCORE_AUTO_CONFIRM_AFTER_HOURS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--max-batches", type=int)
+
+    def handle(self, *args, **options):
+        results = SweeperService.sweep(
+            batch_size=options["batch_size"], max_batches=options["max_batches"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Confirmed {len(results['confirmed'])}, "
+                f"escalated {len(results['escalated'])} matches."
+            )
+        )
+        if results["stuck"]:
+            stuck = ", ".join(str(match_id) for match_id in results["stuck"])
+            self.stdout.write(f"Still waiting on matches: {stuck}")
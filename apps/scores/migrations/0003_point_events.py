@@ -0,0 +1,52 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0002_idempotency_keys"),
+        ("tournaments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PointEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sequence", models.PositiveIntegerField()),
+                (
+                    "winner",
+                    models.PositiveSmallIntegerField(
+                        choices=[(1, "Player 1"), (2, "Player 2")]
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "match",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="point_events",
+                        to="tournaments.match",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "point_events",
+                "ordering": ["match", "sequence"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("match", "sequence"), name="unique_point_event_sequence"
+                    )
+                ],
+            },
+        ),
+    ]
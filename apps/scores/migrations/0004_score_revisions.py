@@ -0,0 +1,93 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_initial_revisions(apps, schema_editor):
+    Score = apps.get_model("scores", "Score")
+    ScoreRevision = apps.get_model("scores", "ScoreRevision")
+    ScoreRevision.objects.bulk_create(
+        (
+            ScoreRevision(
+                score_id=score.id,
+                match_id=score.match_id,
+                revision=1,
+                changed_by_id=score.submitted_by_id,
+                set_scores=score.set_scores,
+            )
+            for score in Score.objects.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0003_point_events"),
+        ("tournaments", "0002_feed_versions"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScoreRevision",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("revision", models.PositiveIntegerField()),
+                ("set_scores", models.JSONField(blank=True, null=True)),
+                ("changes", models.JSONField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "changed_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="score_revisions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "match",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="score_revisions",
+                        to="tournaments.match",
+                    ),
+                ),
+                (
+                    "score",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="revisions",
+                        to="scores.score",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "score_revisions",
+                "ordering": ["score", "revision"],
+                "indexes": [
+                    models.Index(
+                        fields=["match", "score", "revision"],
+                        name="score_revis_match_i_55692f_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("score", "revision"), name="unique_score_revision"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_initial_revisions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0004_score_revisions"),
+        ("tournaments", "0003_stale_match_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="score",
+            index=models.Index(
+                condition=models.Q(("is_confirmed", False)),
+                fields=["match", "updated_at"],
+                name="scores_unconfirmed_idx",
+            ),
+        ),
+    ]
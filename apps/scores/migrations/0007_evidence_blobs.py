@@ -0,0 +1,80 @@
+import hashlib
+
+import django.db.models.deletion
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+
+def link_existing_files(apps, schema_editor):
+    """
+    Point existing evidence at blobs keyed by the hash of their current file.
+    Files stay where they are; duplicates share the first blob that was found.
+    """
+    Evidence = apps.get_model("scores", "Evidence")
+    EvidenceBlob = apps.get_model("scores", "EvidenceBlob")
+
+    for evidence in Evidence.objects.exclude(file="").exclude(file__isnull=True):
+        if not default_storage.exists(evidence.file.name):
+            continue
+
+        digest = hashlib.sha256()
+        with default_storage.open(evidence.file.name, "rb") as f:
+            for block in f.chunks():
+                digest.update(block)
+
+        blob, _ = EvidenceBlob.objects.get_or_create(
+            sha256=digest.hexdigest(),
+            defaults={
+                "file": evidence.file.name,
+                "size": default_storage.size(evidence.file.name),
+            },
+        )
+        blob.ref_count += 1
+        blob.save(update_fields=["ref_count"])
+        evidence.blob = blob
+        evidence.file = blob.file.name
+        evidence.save(update_fields=["blob", "file"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0006_evidence_uploads"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EvidenceBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sha256", models.CharField(max_length=64, unique=True)),
+                ("file", models.FileField(max_length=255, upload_to="")),
+                ("size", models.PositiveBigIntegerField()),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "evidence_blobs",
+            },
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="blob",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="evidence",
+                to="scores.evidenceblob",
+            ),
+        ),
+        migrations.RunPython(link_existing_files, migrations.RunPython.noop),
+    ]
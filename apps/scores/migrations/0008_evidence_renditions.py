@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0007_evidence_blobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evidenceblob",
+            name="height",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="evidenceblob",
+            name="preview",
+            field=models.ImageField(
+                blank=True, null=True, upload_to="evidence/renditions/"
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidenceblob",
+            name="thumbnail",
+            field=models.ImageField(
+                blank=True, null=True, upload_to="evidence/renditions/"
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidenceblob",
+            name="width",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
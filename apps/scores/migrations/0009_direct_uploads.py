@@ -0,0 +1,55 @@
+import core.storage
+import core.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0008_evidence_renditions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evidenceupload",
+            name="direct",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name="evidence",
+            name="file",
+            field=models.FileField(
+                blank=True,
+                null=True,
+                storage=core.storage.get_evidence_storage,
+                upload_to=core.utils.evidence_upload_path,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="evidenceblob",
+            name="file",
+            field=models.FileField(
+                max_length=255, storage=core.storage.get_evidence_storage, upload_to=""
+            ),
+        ),
+        migrations.AlterField(
+            model_name="evidenceblob",
+            name="preview",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=core.storage.get_evidence_storage,
+                upload_to="evidence/renditions/",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="evidenceblob",
+            name="thumbnail",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=core.storage.get_evidence_storage,
+                upload_to="evidence/renditions/",
+            ),
+        ),
+    ]
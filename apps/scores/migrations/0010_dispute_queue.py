@@ -0,0 +1,65 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+ROUND_PRIORITY = {"F": 0, "SF": 1, "QF": 2, "R16": 3, "R32": 4, "R64": 5, "R128": 6}
+
+
+def fill_queue_fields(apps, schema_editor):
+    """
+    Copy the match round and tournament end date onto existing disputes.
+    """
+    Dispute = apps.get_model("scores", "Dispute")
+
+    disputes = Dispute.objects.select_related("match__tournament")
+    for dispute in disputes.iterator():
+        dispute.priority = ROUND_PRIORITY.get(dispute.match.round, 0)
+        dispute.deadline = dispute.match.tournament.end_date
+        dispute.save(update_fields=["priority", "deadline"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0009_direct_uploads"),
+        ("tournaments", "0003_stale_match_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dispute",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="dispute",
+            name="claimed_by",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="claimed_disputes",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="dispute",
+            name="deadline",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="dispute",
+            name="priority",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="dispute",
+            index=models.Index(
+                condition=models.Q(("status__in", ["OPEN", "UNDER_REVIEW"])),
+                fields=["priority", "deadline", "created_at", "id"],
+                name="disputes_queue_idx",
+            ),
+        ),
+        migrations.RunPython(fill_queue_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+import apps.scores.analytics
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0010_dispute_queue"),
+        ("tournaments", "0003_stale_match_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DisputeRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("DAY", "Day"), ("MONTH", "Month")],
+                        default="DAY",
+                        max_length=5,
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("court", models.CharField(blank=True, max_length=50)),
+                ("round", models.CharField(max_length=10)),
+                ("matches", models.PositiveIntegerField(default=0)),
+                ("opened", models.PositiveIntegerField(default=0)),
+                ("resolved", models.PositiveIntegerField(default=0)),
+                ("resolution_seconds", models.BigIntegerField(default=0)),
+                (
+                    "resolution_histogram",
+                    models.JSONField(default=apps.scores.analytics.empty_histogram),
+                ),
+                (
+                    "referee",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="dispute_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "tournament",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dispute_rollups",
+                        to="tournaments.tournament",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "dispute_rollups",
+                "ordering": ["day"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "period",
+                            "day",
+                            "tournament",
+                            "referee",
+                            "court",
+                            "round",
+                        ),
+                        name="unique_dispute_rollup",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+    ]
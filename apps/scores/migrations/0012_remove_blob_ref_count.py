@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0011_dispute_rollups"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="evidenceblob",
+            name="ref_count",
+        ),
+    ]
@@ -1,9 +1,15 @@
+import uuid
+
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
 from core.mixins import TimestampMixin
+from core.storage import get_evidence_storage
 from core.utils import evidence_upload_path
 
+from .analytics import empty_histogram
+
 
 class Score(TimestampMixin):
     match = models.ForeignKey(
@@ -37,11 +43,54 @@ class Score(TimestampMixin):
     class Meta:
         db_table = "scores"
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["match", "submitted_by"], name="unique_score_per_submitter"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["match", "updated_at"],
+                condition=models.Q(is_confirmed=False),
+                name="scores_unconfirmed_idx",
+            )
+        ]
 
     def __str__(self):
         return f"Score for {self.match} by {self.submitted_by.username}"
 
 
+class ScoreRevision(models.Model):
+    score = models.ForeignKey(Score, on_delete=models.CASCADE, related_name="revisions")
+    match = models.ForeignKey(
+        "tournaments.Match", on_delete=models.CASCADE, related_name="score_revisions"
+    )
+    revision = models.PositiveIntegerField()
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="score_revisions",
+    )
+    set_scores = models.JSONField(null=True, blank=True)
+    changes = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "score_revisions"
+        ordering = ["score", "revision"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["score", "revision"], name="unique_score_revision"
+            )
+        ]
+        indexes = [models.Index(fields=["match", "score", "revision"])]
+
+    def __str__(self):
+        return f"Revision {self.revision} of score #{self.score_id}"
+
+
 class Dispute(TimestampMixin):
     class Status(models.TextChoices):
         OPEN = "OPEN", "Open"
@@ -76,15 +125,101 @@ class Dispute(TimestampMixin):
         blank=True,
         related_name="dispute_resolutions",
     )
+    priority = models.PositiveSmallIntegerField(default=0)
+    deadline = models.DateField(null=True, blank=True)
+    claimed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="claimed_disputes",
+    )
+    claimed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = "disputes"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["priority", "deadline", "created_at", "id"],
+                condition=models.Q(status__in=["OPEN", "UNDER_REVIEW"]),
+                name="disputes_queue_idx",
+            )
+        ]
 
     def __str__(self):
         return f"Dispute for {self.match} by {self.raised_by.username}"
 
 
+class DisputeRollup(models.Model):
+    class Period(models.TextChoices):
+        DAY = "DAY", "Day"
+        MONTH = "MONTH", "Month"
+
+    period = models.CharField(max_length=5, choices=Period.choices, default=Period.DAY)
+    day = models.DateField()
+    tournament = models.ForeignKey(
+        "tournaments.Tournament",
+        on_delete=models.CASCADE,
+        related_name="dispute_rollups",
+    )
+    referee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="dispute_rollups",
+    )
+    court = models.CharField(max_length=50, blank=True)
+    round = models.CharField(max_length=10)
+    matches = models.PositiveIntegerField(default=0)
+    opened = models.PositiveIntegerField(default=0)
+    resolved = models.PositiveIntegerField(default=0)
+    resolution_seconds = models.BigIntegerField(default=0)
+    resolution_histogram = models.JSONField(default=empty_histogram)
+
+    class Meta:
+        db_table = "dispute_rollups"
+        ordering = ["day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "day", "tournament", "referee", "court", "round"],
+                name="unique_dispute_rollup",
+                nulls_distinct=False,
+            )
+        ]
+
+    def __str__(self):
+        return f"Dispute rollup {self.period} {self.day} for {self.tournament_id}"
+
+
+class EvidenceBlob(models.Model):
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(max_length=255, storage=get_evidence_storage)
+    size = models.PositiveBigIntegerField()
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    thumbnail = models.ImageField(
+        upload_to="evidence/renditions/",
+        storage=get_evidence_storage,
+        blank=True,
+        null=True,
+    )
+    preview = models.ImageField(
+        upload_to="evidence/renditions/",
+        storage=get_evidence_storage,
+        blank=True,
+        null=True,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "evidence_blobs"
+
+    def __str__(self):
+        return f"Blob {self.sha256[:12]}"
+
+
 class Evidence(TimestampMixin):
     dispute = models.ForeignKey(
         Dispute, on_delete=models.CASCADE, related_name="evidence"
@@ -94,7 +229,19 @@ class Evidence(TimestampMixin):
         on_delete=models.CASCADE,
         related_name="submitted_evidence",
     )
-    file = models.FileField(upload_to=evidence_upload_path, blank=True, null=True)
+    file = models.FileField(
+        upload_to=evidence_upload_path,
+        storage=get_evidence_storage,
+        blank=True,
+        null=True,
+    )
+    blob = models.ForeignKey(
+        EvidenceBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="evidence",
+    )
     description = models.TextField()
 
     class Meta:
@@ -106,3 +253,89 @@ class Evidence(TimestampMixin):
         return (
             f"Evidence for dispute #{self.dispute.id} by {self.submitted_by.username}"
         )
+
+
+class EvidenceUpload(TimestampMixin):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    dispute = models.ForeignKey(
+        Dispute, on_delete=models.CASCADE, related_name="evidence_uploads"
+    )
+    submitted_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="evidence_uploads",
+    )
+    description = models.TextField()
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)
+    direct = models.BooleanField(default=False)
+    evidence = models.OneToOneField(
+        Evidence,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="upload",
+    )
+
+    class Meta:
+        db_table = "evidence_uploads"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Upload of {self.filename} ({self.offset}/{self.size} bytes)"
+
+    @property
+    def is_complete(self):
+        return self.evidence_id is not None
+
+
+class IdempotencyKey(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys",
+    )
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField()
+    response_body = models.JSONField(encoder=DjangoJSONEncoder, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "idempotency_keys"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="unique_idempotency_key_per_user"
+            )
+        ]
+
+    def __str__(self):
+        return f"Idempotency key {self.key} for {self.user.username}"
+
+
+class PointEvent(models.Model):
+    class Player(models.IntegerChoices):
+        PLAYER1 = 1, "Player 1"
+        PLAYER2 = 2, "Player 2"
+
+    match = models.ForeignKey(
+        "tournaments.Match", on_delete=models.CASCADE, related_name="point_events"
+    )
+    sequence = models.PositiveIntegerField()
+    winner = models.PositiveSmallIntegerField(choices=Player.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "point_events"
+        ordering = ["match", "sequence"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["match", "sequence"], name="unique_point_event_sequence"
+            )
+        ]
+
+    def __str__(self):
+        return f"Point {self.sequence} of match #{self.match_id}"
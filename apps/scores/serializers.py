@@ -1,9 +1,18 @@
+from django.urls import reverse
 from rest_framework import serializers
 
 from apps.accounts.serializers import UserPublicSerializer
+from apps.tournaments.models import Match
 from core.utils import validate_set_scores
 
-from .models import Dispute, Evidence, Score
+from .models import (
+    Dispute,
+    Evidence,
+    EvidenceUpload,
+    PointEvent,
+    Score,
+    ScoreRevision,
+)
 
 
 class ScoreSerializer(serializers.ModelSerializer):
@@ -65,6 +74,7 @@ class ScoreUpdateSerializer(serializers.ModelSerializer):
 class DisputeSerializer(serializers.ModelSerializer):
     raised_by = UserPublicSerializer(read_only=True)
     resolved_by = UserPublicSerializer(read_only=True)
+    claimed_by = UserPublicSerializer(read_only=True)
     evidence_count = serializers.SerializerMethodField()
 
     class Meta:
@@ -75,6 +85,10 @@ class DisputeSerializer(serializers.ModelSerializer):
             "raised_by",
             "reason",
             "status",
+            "priority",
+            "deadline",
+            "claimed_by",
+            "claimed_at",
             "resolved_by",
             "resolution_notes",
             "resolved_at",
@@ -85,6 +99,8 @@ class DisputeSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
     def get_evidence_count(self, obj):
+        if hasattr(obj, "evidence_total"):
+            return obj.evidence_total
         return obj.evidence.count()
 
 
@@ -100,14 +116,71 @@ class DisputeResolveSerializer(serializers.Serializer):
     winner_id = serializers.IntegerField(required=False, allow_null=True)
 
 
+class DisputeBulkResolutionSerializer(DisputeResolveSerializer):
+    dispute = serializers.IntegerField()
+
+
+class DisputeBulkResolveSerializer(serializers.Serializer):
+    resolutions = DisputeBulkResolutionSerializer(many=True, allow_empty=False)
+
+
+class DisputeAnalyticsQuerySerializer(serializers.Serializer):
+    tournament = serializers.IntegerField(required=False)
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+
 class EvidenceSerializer(serializers.ModelSerializer):
+    """
+    Files are only linked through the permission-checked download endpoint;
+    storage URLs and content hashes would let anyone fetch them directly.
+    """
+
     submitted_by = UserPublicSerializer(read_only=True)
+    download_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
+    width = serializers.IntegerField(source="blob.width", read_only=True, default=None)
+    height = serializers.IntegerField(
+        source="blob.height", read_only=True, default=None
+    )
 
     class Meta:
         model = Evidence
-        fields = ["id", "dispute", "submitted_by", "file", "description", "created_at"]
+        fields = [
+            "id",
+            "dispute",
+            "submitted_by",
+            "download_url",
+            "thumbnail_url",
+            "preview_url",
+            "width",
+            "height",
+            "description",
+            "created_at",
+        ]
         read_only_fields = ["id", "created_at"]
 
+    def _download_url(self, obj, rendition=None):
+        url = reverse("scores:evidence-download", args=[obj.id])
+        if rendition:
+            url = f"{url}?rendition={rendition}"
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+    def get_download_url(self, obj):
+        return self._download_url(obj) if obj.file else None
+
+    def get_thumbnail_url(self, obj):
+        if obj.blob and obj.blob.thumbnail:
+            return self._download_url(obj, "thumbnail")
+        return None
+
+    def get_preview_url(self, obj):
+        if obj.blob and obj.blob.preview:
+            return self._download_url(obj, "preview")
+        return None
+
 
 class EvidenceCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -115,6 +188,43 @@ class EvidenceCreateSerializer(serializers.ModelSerializer):
         fields = ["dispute", "file", "description"]
 
 
+class EvidenceUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EvidenceUpload
+        fields = [
+            "id",
+            "dispute",
+            "filename",
+            "size",
+            "offset",
+            "description",
+            "direct",
+            "evidence",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
+class EvidenceUploadCreateSerializer(serializers.ModelSerializer):
+    sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$", required=False)
+
+    class Meta:
+        model = EvidenceUpload
+        fields = ["dispute", "filename", "size", "description", "sha256"]
+
+
+class EvidenceDirectUploadSerializer(EvidenceUploadCreateSerializer):
+    sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$")
+    content_type = serializers.CharField(max_length=255, required=False)
+
+    class Meta(EvidenceUploadCreateSerializer.Meta):
+        fields = EvidenceUploadCreateSerializer.Meta.fields + ["content_type"]
+
+
+class EvidenceUploadCompleteSerializer(serializers.Serializer):
+    sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$", required=False)
+
+
 class ScoreListSerializer(serializers.ModelSerializer):
     submitted_by_name = serializers.CharField(
         source="submitted_by.username", read_only=True
@@ -130,3 +240,48 @@ class ScoreListSerializer(serializers.ModelSerializer):
             "is_confirmed",
             "created_at",
         ]
+
+
+class LivePointsSerializer(serializers.Serializer):
+    points = serializers.ListField(
+        child=serializers.ChoiceField(choices=PointEvent.Player.values),
+        allow_empty=False,
+        max_length=100,
+    )
+    sequence = serializers.IntegerField(required=False, min_value=1)
+
+
+class MatchFeedSerializer(serializers.ModelSerializer):
+    score = serializers.JSONField(source="confirmed_set_scores", read_only=True)
+
+    class Meta:
+        model = Match
+        fields = [
+            "id",
+            "version",
+            "status",
+            "round",
+            "court",
+            "scheduled_time",
+            "player1",
+            "player2",
+            "winner",
+            "score",
+        ]
+
+
+class ScoreRevisionSerializer(serializers.ModelSerializer):
+    changed_by = UserPublicSerializer(read_only=True)
+    set_scores = serializers.JSONField(source="full_set_scores", read_only=True)
+
+    class Meta:
+        model = ScoreRevision
+        fields = [
+            "id",
+            "score",
+            "revision",
+            "changed_by",
+            "set_scores",
+            "changes",
+            "created_at",
+        ]
@@ -1,26 +1,72 @@
-from django.db import transaction
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, Exists, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from apps.accounts.models import User
-from apps.tournaments.models import Match
+from apps.media.models import MediaJob
+from apps.media.services import MediaService
+from apps.rankings.services import RankingService
+from apps.tournaments.models import Match, Tournament
+from apps.tournaments.services import (
+    BRACKET_CACHE_KEY,
+    MATCH_VERSION_CACHE_KEY,
+    TOURNAMENT_VERSION_CACHE_KEY,
+    MatchService,
+)
 from core.exceptions import (
     DisputeError,
     InvalidStateError,
     NotFoundError,
     PermissionDeniedError,
     ScoreConflictError,
+    UploadOffsetError,
     ValidationError,
 )
-from core.utils import determine_match_winner, validate_set_scores
+from core.storage import DirectUploads, evidence_storage, supports_direct_upload
+from core.utils import (
+    apply_set_scores_diff,
+    determine_match_winner,
+    diff_set_scores,
+    evidence_blob_path,
+    validate_set_scores,
+)
 
-from .models import Dispute, Evidence, Score
+from . import analytics, live, uploads
+from .models import (
+    Dispute,
+    DisputeRollup,
+    Evidence,
+    EvidenceBlob,
+    EvidenceUpload,
+    IdempotencyKey,
+    Score,
+    ScoreRevision,
+)
+
+LIVE_STATE_CACHE_KEY = "feed:match:{}:live:v{}"
 
 
 class ScoreService:
+    CONFLICT_MESSAGE = "Score does not match the score submitted by your opponent."
+
     @staticmethod
     def submit_score(match_id, set_scores, user):
+        score, conflict = ScoreService._submit_score(match_id, set_scores, user)
+        if conflict:
+            raise ScoreConflictError(ScoreService.CONFLICT_MESSAGE, score)
+        return score
+
+    @staticmethod
+    @transaction.atomic
+    def _submit_score(match_id, set_scores, user):
         try:
-            match = Match.objects.get(id=match_id)
+            match = Match.objects.select_for_update().get(id=match_id)
         except Match.DoesNotExist:
             raise NotFoundError("Match not found.")
 
@@ -42,35 +88,57 @@ class ScoreService:
         if not is_valid:
             raise ValidationError(error)
 
-        existing_score = Score.objects.filter(match=match, submitted_by=user).first()
-        if existing_score:
-            raise ValidationError("You have already submitted a score for this match.")
-
         winner_key = determine_match_winner(set_scores)
         winner = None
         if winner_key:
             winner = match.player1 if winner_key == "player1" else match.player2
 
-        score = Score.objects.create(
-            match=match,
-            submitted_by=user,
-            set_scores=set_scores,
-            winner=winner,
-            is_confirmed=user.is_referee,
-        )
+        try:
+            with transaction.atomic():
+                score = Score.objects.create(
+                    match=match,
+                    submitted_by=user,
+                    set_scores=set_scores,
+                    winner=winner,
+                    is_confirmed=user.is_referee,
+                )
+                ScoreRevision.objects.create(
+                    score=score,
+                    match=match,
+                    revision=1,
+                    changed_by=user,
+                    set_scores=set_scores,
+                )
+        except IntegrityError:
+            raise ValidationError("You have already submitted a score for this match.")
 
+        conflict = False
         if user.is_referee:
             ScoreService._finalize_match(match, score)
+        else:
+            conflict = ScoreService._reconcile(match, score)
 
-        return score
+        MatchService.touch(match)
+        return score, conflict
 
     @staticmethod
     def update_score(score_id, set_scores, user):
+        score, conflict = ScoreService._update_score(score_id, set_scores, user)
+        if conflict:
+            raise ScoreConflictError(ScoreService.CONFLICT_MESSAGE, score)
+        return score
+
+    @staticmethod
+    @transaction.atomic
+    def _update_score(score_id, set_scores, user):
         try:
-            score = Score.objects.get(id=score_id)
+            match_id = Score.objects.values_list("match_id", flat=True).get(id=score_id)
         except Score.DoesNotExist:
             raise NotFoundError("Score not found.")
 
+        match = Match.objects.select_for_update().get(id=match_id)
+        score = Score.objects.select_for_update().get(id=score_id)
+
         if score.submitted_by != user:
             raise PermissionDeniedError(
                 "You can only update your own score submission."
@@ -86,14 +154,36 @@ class ScoreService:
         winner_key = determine_match_winner(set_scores)
         winner = None
         if winner_key:
-            match = score.match
             winner = match.player1 if winner_key == "player1" else match.player2
 
+        last_revision = score.revisions.aggregate(last=Max("revision"))["last"]
+        if last_revision is None:
+            # Scores saved without history (admin, older data) get their
+            # current sets as the base revision the diff applies to.
+            last_revision = 1
+            ScoreRevision.objects.create(
+                score=score,
+                match_id=score.match_id,
+                revision=last_revision,
+                changed_by=score.submitted_by,
+                set_scores=score.set_scores,
+            )
+        ScoreRevision.objects.create(
+            score=score,
+            match_id=score.match_id,
+            revision=last_revision + 1,
+            changed_by=user,
+            changes=diff_set_scores(score.set_scores, set_scores),
+        )
+
         score.set_scores = set_scores
         score.winner = winner
         score.save()
 
-        return score
+        conflict = ScoreService._reconcile(match, score)
+
+        MatchService.touch(match)
+        return score, conflict
 
     @staticmethod
     def delete_score(score_id, user):
@@ -111,15 +201,19 @@ class ScoreService:
             raise InvalidStateError("Cannot delete confirmed score.")
 
         score.delete()
+        MatchService.touch(score.match)
 
     @staticmethod
+    @transaction.atomic
     def confirm_score(score_id, user):
         try:
-            score = Score.objects.get(id=score_id)
+            match_id = Score.objects.values_list("match_id", flat=True).get(id=score_id)
         except Score.DoesNotExist:
             raise NotFoundError("Score not found.")
 
-        match = score.match
+        # Same lock order as submit and update: the match, then the score.
+        match = Match.objects.select_for_update().get(id=match_id)
+        score = Score.objects.select_for_update().get(id=score_id)
 
         if user.is_player:
             if not match.is_player_in_match(user):
@@ -143,21 +237,319 @@ class ScoreService:
 
         ScoreService._finalize_match(match, score)
 
+        MatchService.touch(match)
         return score
 
+    @staticmethod
+    def _reconcile(match, score):
+        if score.submitted_by_id == match.player1_id:
+            opponent = match.player2
+        else:
+            opponent = match.player1
+
+        opposing_score = (
+            Score.objects.select_for_update()
+            .filter(match=match, submitted_by=opponent, is_confirmed=False)
+            .first()
+        )
+        if opposing_score is None:
+            return False
+
+        if opposing_score.set_scores != score.set_scores:
+            return True
+
+        now = timezone.now()
+        for confirmed, confirmed_by in (
+            (score, opponent),
+            (opposing_score, score.submitted_by),
+        ):
+            confirmed.is_confirmed = True
+            confirmed.confirmed_by = confirmed_by
+            confirmed.confirmed_at = now
+            confirmed.save()
+
+        ScoreService._finalize_match(match, score)
+        return False
+
     @staticmethod
     def _finalize_match(match, score):
+        DisputeAnalyticsService.record_match_end(match)
         match.status = Match.Status.COMPLETED
         match.winner = score.winner
         match.save()
+        MatchService.advance_winner(match)
 
     @staticmethod
     def get_match_scores(match_id):
         return Score.objects.filter(match_id=match_id)
 
+    @staticmethod
+    def _rebuild_revisions(revisions):
+        current = {}
+        for revision in revisions:
+            if revision.set_scores is not None:
+                set_scores = revision.set_scores
+            else:
+                set_scores = apply_set_scores_diff(
+                    current[revision.score_id], revision.changes
+                )
+            current[revision.score_id] = set_scores
+            revision.full_set_scores = set_scores
+        return revisions
+
+    @staticmethod
+    def _revisions():
+        return ScoreRevision.objects.select_related("changed_by").order_by(
+            "score_id", "revision"
+        )
+
+    @staticmethod
+    def get_score_revisions(score_id):
+        revisions = list(ScoreService._revisions().filter(score_id=score_id))
+        if not revisions:
+            raise NotFoundError("Score not found.")
+        return ScoreService._rebuild_revisions(revisions)
+
+    @staticmethod
+    def get_score_revision(score_id, revision):
+        revisions = list(
+            ScoreService._revisions().filter(score_id=score_id, revision__lte=revision)
+        )
+        if not revisions or revisions[-1].revision != revision:
+            raise NotFoundError("Revision not found.")
+        return ScoreService._rebuild_revisions(revisions)[-1]
+
+    @staticmethod
+    def get_match_history(match_id):
+        revisions = list(ScoreService._revisions().filter(match_id=match_id))
+        return ScoreService._rebuild_revisions(revisions)
+
+
+class LiveScoringService:
+    @staticmethod
+    def record_points(match_id, points, user, sequence=None):
+        with transaction.atomic():
+            # Serializes writers across processes; the status and the
+            # session's sequence are checked while this lock is held.
+            try:
+                match = Match.objects.select_for_update().get(id=match_id)
+            except Match.DoesNotExist:
+                raise NotFoundError("Match not found.")
+
+            if not user.is_referee or match.referee_id != user.id:
+                raise PermissionDeniedError("Only the match referee can record points.")
+
+            if match.status != Match.Status.IN_PROGRESS:
+                raise InvalidStateError("Match must be in progress to record points.")
+
+            session = live.get_session(match.id)
+            if sequence is not None:
+                if sequence > session.sequence + 1:
+                    raise ValidationError(
+                        f"Points are missing; expected sequence {session.sequence + 1}."
+                    )
+                points = points[session.sequence + 1 - sequence :]
+
+            if session.record(points):
+                MatchService.touch(match)
+                # Feed readers get this snapshot instead of replaying points.
+                cache_key = LIVE_STATE_CACHE_KEY.format(match.id, match.version)
+                state = session.to_dict()
+                transaction.on_commit(
+                    lambda: cache.set(cache_key, state, settings.LIVE_STATE_CACHE_TTL)
+                )
+            if session.state.is_finished:
+                transaction.on_commit(lambda: live.discard_session(match.id))
+                ScoreService.submit_score(match.id, session.state.set_scores(), user)
+
+        return session
+
+    @staticmethod
+    def get_live_state(match_id):
+        try:
+            match = Match.objects.get(id=match_id)
+        except Match.DoesNotExist:
+            raise NotFoundError("Match not found.")
+
+        if match.status == Match.Status.IN_PROGRESS:
+            return live.get_session(match.id)
+        return live.load_session(match.id)
+
+
+class FeedService:
+    @staticmethod
+    def _get_version(cache_key, versions, not_found_message):
+        version = cache.get(cache_key)
+        if version is None:
+            version = versions.first()
+            if version is None:
+                raise NotFoundError(not_found_message)
+            cache.set(cache_key, version, settings.LIVE_FEED_CACHE_TTL)
+        return version
+
+    @staticmethod
+    def get_match_version(match_id):
+        return FeedService._get_version(
+            MATCH_VERSION_CACHE_KEY.format(match_id),
+            Match.objects.filter(id=match_id).values_list("version", flat=True),
+            "Match not found.",
+        )
+
+    @staticmethod
+    def get_tournament_version(tournament_id):
+        return FeedService._get_version(
+            TOURNAMENT_VERSION_CACHE_KEY.format(tournament_id),
+            Tournament.objects.filter(id=tournament_id).values_list(
+                "feed_version", flat=True
+            ),
+            "Tournament not found.",
+        )
+
+    @staticmethod
+    def wait_for_change(get_version, since, timeout):
+        """
+        Re-read ``get_version`` every ``LIVE_FEED_WAIT_INTERVAL`` seconds
+        until it passes ``since`` or ``timeout`` seconds have gone by.
+        """
+        deadline = time.monotonic() + timeout
+        version = get_version()
+        while version <= since:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(settings.LIVE_FEED_WAIT_INTERVAL, remaining))
+            version = get_version()
+        return version
+
+    @staticmethod
+    def get_feed_matches():
+        confirmed_scores = Score.objects.filter(
+            match=OuterRef("pk"), is_confirmed=True
+        ).order_by("-confirmed_at")
+        return Match.objects.annotate(
+            confirmed_set_scores=Subquery(
+                confirmed_scores.values("set_scores")[:1],
+                output_field=models.JSONField(),
+            )
+        )
+
+    @staticmethod
+    def get_match_changes(match_id):
+        try:
+            match = FeedService.get_feed_matches().get(id=match_id)
+        except Match.DoesNotExist:
+            raise NotFoundError("Match not found.")
+
+        live_state = None
+        if match.status == Match.Status.IN_PROGRESS:
+            cache_key = LIVE_STATE_CACHE_KEY.format(match.id, match.version)
+            live_state = cache.get(cache_key)
+            if live_state is None:
+                live_state = live.load_session(match.id).to_dict()
+                cache.set(cache_key, live_state, settings.LIVE_STATE_CACHE_TTL)
+        return match, live_state
+
+    @staticmethod
+    def get_tournament_changes(tournament_id, since=None):
+        matches = FeedService.get_feed_matches().filter(tournament_id=tournament_id)
+        if since:
+            matches = matches.filter(version__gt=since)
+        return matches.order_by("version")
+
+    @staticmethod
+    def get_bracket(tournament_id):
+        """
+        The whole bracket as one document, cached under the tournament feed
+        version. Every match or score change bumps that version, so a stale
+        tree is never read back.
+        """
+        version = FeedService.get_tournament_version(tournament_id)
+        cache_key = BRACKET_CACHE_KEY.format(tournament_id, version)
+        bracket = cache.get(cache_key)
+        if bracket is None:
+            bracket = FeedService.build_bracket(tournament_id)
+            cache.set(cache_key, bracket, settings.BRACKET_CACHE_TTL)
+        return bracket
+
+    @staticmethod
+    def build_bracket(tournament_id):
+        matches = (
+            FeedService.get_feed_matches()
+            .filter(tournament_id=tournament_id)
+            .order_by("bracket_position", "id")
+            .values(
+                "id",
+                "round",
+                "bracket_position",
+                "status",
+                "court",
+                "scheduled_time",
+                "player1_id",
+                "player1__username",
+                "player2_id",
+                "player2__username",
+                "winner_id",
+                "next_match_id",
+                "next_slot",
+                "confirmed_set_scores",
+            )
+        )
+
+        rounds = {value: [] for value in Match.Round.values}
+        for match in matches:
+            rounds[match["round"]].append(
+                {
+                    "id": match["id"],
+                    "position": match["bracket_position"],
+                    "status": match["status"],
+                    "court": match["court"],
+                    "scheduled_time": match["scheduled_time"],
+                    "player1": FeedService._bracket_player(match, "player1"),
+                    "player2": FeedService._bracket_player(match, "player2"),
+                    "winner": match["winner_id"],
+                    "score": match["confirmed_set_scores"],
+                    "next_match": match["next_match_id"],
+                    "next_slot": match["next_slot"],
+                }
+            )
+
+        return {
+            "tournament": tournament_id,
+            "rounds": [
+                {"round": value, "matches": round_matches}
+                for value, round_matches in rounds.items()
+                if round_matches
+            ],
+        }
+
+    @staticmethod
+    def _bracket_player(match, slot):
+        if match[f"{slot}_id"] is None:
+            return None
+        return {"id": match[f"{slot}_id"], "username": match[f"{slot}__username"]}
+
 
 class DisputeService:
+    ROUND_PRIORITY = {
+        Match.Round.FINAL: 0,
+        Match.Round.SEMIFINAL: 1,
+        Match.Round.QUARTERFINAL: 2,
+        Match.Round.ROUND_16: 3,
+        Match.Round.ROUND_32: 4,
+        Match.Round.ROUND_64: 5,
+        Match.Round.ROUND_128: 6,
+    }
+    QUEUE_ORDERING = ["priority", "deadline", "created_at", "id"]
+
     @staticmethod
+    def _queue_fields(match):
+        return {
+            "priority": DisputeService.ROUND_PRIORITY.get(match.round, 0),
+            "deadline": match.tournament.end_date,
+        }
+
+    @staticmethod
+    @transaction.atomic
     def create_dispute(match_id, reason, user):
         try:
             match = Match.objects.get(id=match_id)
@@ -175,20 +567,23 @@ class DisputeService:
         if existing_dispute:
             raise DisputeError("There is already an open dispute for this match.")
 
-        dispute = Dispute.objects.create(match=match, raised_by=user, reason=reason)
+        dispute = Dispute.objects.create(
+            match=match,
+            raised_by=user,
+            reason=reason,
+            **DisputeService._queue_fields(match),
+        )
 
+        DisputeAnalyticsService.record_match_end(match)
+        DisputeAnalyticsService.record_dispute_opened(dispute)
         match.status = Match.Status.DISPUTED
         match.save()
 
+        MatchService.touch(match)
         return dispute
 
     @staticmethod
-    def add_evidence(dispute_id, file, description, user):
-        try:
-            dispute = Dispute.objects.get(id=dispute_id)
-        except Dispute.DoesNotExist:
-            raise NotFoundError("Dispute not found.")
-
+    def _check_evidence_access(dispute, user):
         if dispute.status == Dispute.Status.RESOLVED:
             raise InvalidStateError("Cannot add evidence to resolved dispute.")
 
@@ -199,8 +594,23 @@ class DisputeService:
         elif not (user.is_referee or user.is_organizer):
             raise PermissionDeniedError("Only involved parties can submit evidence.")
 
+    @staticmethod
+    @transaction.atomic
+    def add_evidence(dispute_id, file, description, user):
+        try:
+            dispute = Dispute.objects.get(id=dispute_id)
+        except Dispute.DoesNotExist:
+            raise NotFoundError("Dispute not found.")
+
+        DisputeService._check_evidence_access(dispute, user)
+
+        blob = EvidenceBlobService.store(file, file.name) if file else None
         evidence = Evidence.objects.create(
-            dispute=dispute, submitted_by=user, file=file, description=description
+            dispute=dispute,
+            submitted_by=user,
+            file=blob.file.name if blob else None,
+            blob=blob,
+            description=description,
         )
 
         return evidence
@@ -256,23 +666,223 @@ class DisputeService:
         match.status = Match.Status.COMPLETED
         match.winner = winner
         match.save()
+        MatchService.advance_winner(match)
 
+        DisputeAnalyticsService.record_disputes_resolved([dispute])
+        MatchService.touch(match)
         return dispute
 
+    @staticmethod
+    @transaction.atomic
+    def resolve_disputes(resolutions, user):
+        """
+        Resolve many disputes in one transaction. Each resolution is a dict
+        with ``dispute``, ``resolution_notes`` and optional ``final_score_id``
+        and ``winner_id``; any invalid entry rolls back the whole batch.
+        """
+        if not user.is_organizer:
+            raise PermissionDeniedError("Only organizers can resolve disputes in bulk.")
+
+        dispute_ids = [resolution["dispute"] for resolution in resolutions]
+        if len(set(dispute_ids)) != len(dispute_ids):
+            raise ValidationError("Each dispute can only be resolved once.")
+
+        disputes = {
+            dispute.id: dispute
+            for dispute in Dispute.objects.select_for_update(of=("self",))
+            .select_related("match__tournament")
+            .filter(id__in=dispute_ids)
+        }
+        missing = set(dispute_ids) - set(disputes)
+        if missing:
+            raise NotFoundError(f"Dispute {min(missing)} not found.")
+
+        score_ids = [
+            r["final_score_id"] for r in resolutions if r.get("final_score_id")
+        ]
+        scores = Score.objects.in_bulk(score_ids)
+
+        now = timezone.now()
+        resolved = []
+        for resolution in resolutions:
+            dispute = disputes[resolution["dispute"]]
+            match = dispute.match
+            if dispute.status == Dispute.Status.RESOLVED:
+                raise InvalidStateError(f"Dispute {dispute.id} is already resolved.")
+
+            final_score = None
+            if resolution.get("final_score_id"):
+                final_score = scores.get(resolution["final_score_id"])
+                if final_score is None or final_score.match_id != match.id:
+                    raise NotFoundError(
+                        f"Final score for dispute {dispute.id} not found."
+                    )
+
+            winner_id = resolution.get("winner_id")
+            if winner_id:
+                if winner_id not in (match.player1_id, match.player2_id):
+                    raise ValidationError(
+                        f"Winner for dispute {dispute.id} must be a player in the match."
+                    )
+            elif final_score:
+                winner_id = final_score.winner_id
+
+            dispute.status = Dispute.Status.RESOLVED
+            dispute.resolved_by = user
+            dispute.resolution_notes = resolution["resolution_notes"]
+            dispute.resolved_at = now
+            dispute.final_score = final_score
+            dispute.updated_at = now
+
+            match.status = Match.Status.COMPLETED
+            match.winner_id = winner_id
+            match.updated_at = now
+            resolved.append(dispute)
+
+        matches = [dispute.match for dispute in resolved]
+        Dispute.objects.bulk_update(
+            resolved,
+            [
+                "status",
+                "resolved_by",
+                "resolution_notes",
+                "resolved_at",
+                "final_score",
+                "updated_at",
+            ],
+        )
+        Match.objects.bulk_update(matches, ["status", "winner", "updated_at"])
+        MatchService.touch_many(matches)
+        for match in matches:
+            MatchService.advance_winner(match)
+        DisputeAnalyticsService.record_disputes_resolved(resolved)
+
+        tournaments = {match.tournament_id: match.tournament for match in matches}
+        for tournament in tournaments.values():
+            RankingService.recalculate_positions(tournament)
+
+        return resolved
+
+    @staticmethod
+    def get_evidence_for_download(evidence_id, user):
+        try:
+            evidence = Evidence.objects.select_related("dispute__match", "blob").get(
+                id=evidence_id
+            )
+        except Evidence.DoesNotExist:
+            raise NotFoundError("Evidence not found.")
+
+        match = evidence.dispute.match
+        if user.is_player:
+            allowed = match.is_player_in_match(user)
+        elif user.is_referee:
+            allowed = match.referee_id == user.id
+        else:
+            allowed = user.is_organizer
+        if not allowed:
+            raise PermissionDeniedError("You cannot view evidence for this dispute.")
+
+        if not evidence.file:
+            raise NotFoundError("This evidence has no file.")
+
+        return evidence
+
     @staticmethod
     def get_dispute_evidence(dispute_id):
-        return Evidence.objects.filter(dispute_id=dispute_id)
+        return Evidence.objects.filter(dispute_id=dispute_id).select_related(
+            "submitted_by", "blob"
+        )
+
+    @staticmethod
+    def get_disputes():
+        evidence = (
+            Evidence.objects.filter(dispute=OuterRef("pk"))
+            .values("dispute")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return (
+            Dispute.objects.select_related(
+                "match__player1",
+                "match__player2",
+                "raised_by",
+                "resolved_by",
+                "claimed_by",
+            )
+            .annotate(evidence_total=Coalesce(Subquery(evidence), 0))
+            .order_by("-created_at", "-id")
+        )
+
+    @staticmethod
+    def get_user_disputes(user, status=None):
+        disputes = DisputeService.get_disputes()
+        if status:
+            disputes = disputes.filter(status=status)
+
+        if user.is_player:
+            # One index scan per player column instead of an OR across the join.
+            matches = (
+                Match.objects.filter(player1=user)
+                .order_by()
+                .values("id")
+                .union(Match.objects.filter(player2=user).order_by().values("id"))
+            )
+            disputes = disputes.filter(match_id__in=matches)
+        elif user.is_referee:
+            disputes = disputes.filter(match__referee=user)
+
+        return disputes
 
     @staticmethod
     def get_open_disputes():
+        return (
+            DisputeService.get_disputes()
+            .filter(status__in=[Dispute.Status.OPEN, Dispute.Status.UNDER_REVIEW])
+            .order_by(*DisputeService.QUEUE_ORDERING)
+        )
+
+    @staticmethod
+    def _claimable():
         return Dispute.objects.filter(
-            status__in=[Dispute.Status.OPEN, Dispute.Status.UNDER_REVIEW]
+            models.Q(status=Dispute.Status.OPEN)
+            | models.Q(status=Dispute.Status.UNDER_REVIEW, claimed_by__isnull=True)
         )
 
+    @staticmethod
+    @transaction.atomic
+    def claim_next_dispute(user):
+        """
+        Take the most urgent unclaimed dispute off the queue. Rows another
+        referee is claiming right now are skipped instead of waited on.
+        """
+        if not (user.is_referee or user.is_organizer):
+            raise PermissionDeniedError(
+                "Only referees and organizers can review disputes."
+            )
+
+        queue = DisputeService._claimable()
+        if user.is_referee:
+            queue = queue.filter(match__referee=user)
+
+        dispute = (
+            queue.select_for_update(skip_locked=True, of=("self",))
+            .order_by(*DisputeService.QUEUE_ORDERING)
+            .first()
+        )
+        if dispute is None:
+            return None
+
+        dispute.status = Dispute.Status.UNDER_REVIEW
+        dispute.claimed_by = user
+        dispute.claimed_at = timezone.now()
+        dispute.save(update_fields=["status", "claimed_by", "claimed_at", "updated_at"])
+
+        return dispute
+
     @staticmethod
     def mark_under_review(dispute_id, user):
         try:
-            dispute = Dispute.objects.get(id=dispute_id)
+            dispute = Dispute.objects.select_related("match").get(id=dispute_id)
         except Dispute.DoesNotExist:
             raise NotFoundError("Dispute not found.")
 
@@ -281,7 +891,618 @@ class DisputeService:
                 "Only referees and organizers can review disputes."
             )
 
-        dispute.status = Dispute.Status.UNDER_REVIEW
-        dispute.save()
+        if user.is_referee and dispute.match.referee_id != user.id:
+            raise PermissionDeniedError("You are not the referee for this match.")
+
+        now = timezone.now()
+        claimed = (
+            DisputeService._claimable()
+            .filter(id=dispute.id)
+            .update(
+                status=Dispute.Status.UNDER_REVIEW,
+                claimed_by=user,
+                claimed_at=now,
+                updated_at=now,
+            )
+        )
+        dispute.refresh_from_db()
+
+        if not claimed:
+            if dispute.status == Dispute.Status.RESOLVED:
+                raise InvalidStateError("Dispute is already resolved.")
+            if dispute.claimed_by_id != user.id:
+                raise DisputeError("Dispute is already claimed by another reviewer.")
 
         return dispute
+
+
+class EvidenceUploadService:
+    @staticmethod
+    @transaction.atomic
+    def create_upload(
+        dispute_id, filename, size, description, user, sha256=None, direct=False
+    ):
+        try:
+            dispute = Dispute.objects.select_related("match").get(id=dispute_id)
+        except Dispute.DoesNotExist:
+            raise NotFoundError("Dispute not found.")
+
+        DisputeService._check_evidence_access(dispute, user)
+
+        if size > settings.EVIDENCE_UPLOAD_MAX_SIZE:
+            raise ValidationError("File is larger than the upload limit.")
+
+        if direct and not supports_direct_upload():
+            raise InvalidStateError("Evidence storage does not take direct uploads.")
+
+        # Content the dispute already holds (both players filming the same
+        # point) is linked without sending the bytes again. Matching is limited
+        # to the same dispute so a hash alone never grants access to a file.
+        blob = None
+        if sha256:
+            blob = (
+                EvidenceBlob.objects.select_for_update()
+                .filter(sha256=sha256.lower(), size=size, evidence__dispute=dispute)
+                .first()
+            )
+
+        upload = EvidenceUpload.objects.create(
+            dispute=dispute,
+            submitted_by=user,
+            filename=filename,
+            size=size,
+            description=description,
+            sha256=sha256.lower() if direct else "",
+            direct=direct,
+        )
+
+        if blob is None:
+            if not direct:
+                uploads.create_part(upload)
+            return upload
+
+        upload.evidence = Evidence.objects.create(
+            dispute=dispute,
+            submitted_by=user,
+            file=blob.file.name,
+            blob=blob,
+            description=description,
+        )
+        upload.offset = size
+        upload.sha256 = blob.sha256
+        upload.save()
+
+        return upload
+
+    @staticmethod
+    def presign_upload(upload, content_type):
+        """Return the URL and headers the client PUTs the file to."""
+        return DirectUploads().presign_put(
+            uploads.incoming_name(upload), upload.size, upload.sha256, content_type
+        )
+
+    @staticmethod
+    def get_upload(upload_id, user):
+        try:
+            upload = EvidenceUpload.objects.get(id=upload_id)
+        except EvidenceUpload.DoesNotExist:
+            raise NotFoundError("Upload not found.")
+
+        if upload.submitted_by != user:
+            raise PermissionDeniedError("You did not start this upload.")
+
+        return upload
+
+    @staticmethod
+    @transaction.atomic
+    def append_chunk(upload_id, offset, stream, user, checksum=None):
+        upload = EvidenceUploadService.get_upload(upload_id, user)
+        # Held across the offset check, the write and the offset update, so
+        # two requests at the same offset never write the part file together.
+        upload = EvidenceUpload.objects.select_for_update().get(id=upload.id)
+
+        if upload.is_complete:
+            raise InvalidStateError("Upload is already complete.")
+        if upload.direct:
+            raise InvalidStateError("Direct uploads are sent to storage.")
+        if offset != upload.offset:
+            raise UploadOffsetError("Upload-Offset does not match.", upload.offset)
+
+        written = uploads.write_chunk(upload, offset, stream, checksum)
+
+        upload.offset = offset + written
+        upload.save(update_fields=["offset", "updated_at"])
+        return upload
+
+    @staticmethod
+    @transaction.atomic
+    def complete_upload(upload_id, user, sha256=None):
+        upload = EvidenceUploadService.get_upload(upload_id, user)
+        upload = EvidenceUpload.objects.select_for_update().get(id=upload.id)
+
+        if upload.is_complete:
+            return upload.evidence
+
+        DisputeService._check_evidence_access(upload.dispute, user)
+
+        if upload.direct:
+            blob = EvidenceUploadService._adopt_direct_upload(upload)
+        else:
+            blob = EvidenceUploadService._assemble_upload(upload, sha256)
+
+        evidence = Evidence.objects.create(
+            dispute=upload.dispute,
+            submitted_by=user,
+            file=blob.file.name,
+            blob=blob,
+            description=upload.description,
+        )
+
+        upload.evidence = evidence
+        upload.offset = upload.size
+        upload.sha256 = blob.sha256
+        upload.save()
+
+        return evidence
+
+    @staticmethod
+    def _assemble_upload(upload, sha256):
+        if upload.offset != upload.size:
+            raise InvalidStateError(
+                f"Upload has {upload.offset} of {upload.size} bytes."
+            )
+
+        path = uploads.part_path(upload)
+        digest = uploads.hash_file(path)
+        if sha256 and sha256.lower() != digest:
+            raise ValidationError("Checksum does not match the uploaded file.")
+
+        with uploads.StagedFile(open(path, "rb"), name=str(path)) as staged:
+            blob = EvidenceBlobService.store(staged, upload.filename, digest)
+        uploads.remove_part(upload)
+
+        return blob
+
+    @staticmethod
+    def _adopt_direct_upload(upload):
+        direct = DirectUploads()
+        incoming = uploads.incoming_name(upload)
+
+        stored = direct.head(incoming)
+        if stored is None:
+            raise InvalidStateError("The file has not been uploaded yet.")
+
+        size, sha256 = stored
+        if size != upload.size or (sha256 and sha256 != upload.sha256):
+            direct.delete(incoming)
+            raise ValidationError("Uploaded file does not match the declared file.")
+
+        return EvidenceBlobService.adopt(
+            direct, incoming, upload.filename, upload.sha256
+        )
+
+    @staticmethod
+    def purge_stale_uploads():
+        cutoff = timezone.now() - timedelta(hours=settings.EVIDENCE_UPLOAD_EXPIRY_HOURS)
+        stale = EvidenceUpload.objects.filter(
+            evidence__isnull=True, updated_at__lt=cutoff
+        )
+        for upload in stale:
+            if upload.direct:
+                DirectUploads().delete(uploads.incoming_name(upload))
+            else:
+                uploads.remove_part(upload)
+        return stale.delete()[0]
+
+
+class EvidenceBlobService:
+    @staticmethod
+    def store(file, filename, sha256=None):
+        """
+        Return the blob holding this content, writing the bytes only the first
+        time they are seen. The blob row stays locked until the caller's
+        transaction commits, so cleanup cannot remove it in between.
+        """
+        sha256 = sha256 or uploads.hash_file_object(file)
+        return EvidenceBlobService._link(
+            sha256,
+            lambda: evidence_storage.save(evidence_blob_path(sha256, filename), file),
+        )
+
+    @staticmethod
+    def adopt(direct, incoming, filename, sha256):
+        """Like store(), for an object a client already put into the bucket."""
+        moved = []
+
+        def move():
+            name = evidence_blob_path(sha256, filename)
+            direct.move(incoming, name)
+            moved.append(name)
+            return name
+
+        blob = EvidenceBlobService._link(sha256, move)
+        if not moved:
+            direct.delete(incoming)
+        return blob
+
+    @staticmethod
+    def _link(sha256, save):
+        blob = EvidenceBlob.objects.select_for_update().filter(sha256=sha256).first()
+        if blob is None:
+            name = save()
+            try:
+                with transaction.atomic():
+                    blob = EvidenceBlob.objects.create(
+                        sha256=sha256, file=name, size=evidence_storage.size(name)
+                    )
+                    MediaService.enqueue(MediaJob.Kind.EVIDENCE, blob.id, name)
+            except IntegrityError:
+                blob = EvidenceBlob.objects.select_for_update().get(sha256=sha256)
+                # Object stores overwrite by key, so the winner may own this name.
+                if name != blob.file.name:
+                    evidence_storage.delete(name)
+        return blob
+
+    @staticmethod
+    def purge_unreferenced_blobs():
+        cutoff = timezone.now() - timedelta(hours=settings.EVIDENCE_BLOB_GRACE_HOURS)
+        referenced = Exists(Evidence.objects.filter(blob=OuterRef("pk")))
+        with transaction.atomic():
+            locked = EvidenceBlob.objects.select_for_update(skip_locked=True).filter(
+                ~referenced, created_at__lt=cutoff
+            )
+            # Checked again once the rows are locked: evidence committed after
+            # the first statement started is visible to this one, and none can
+            # be added until the delete commits.
+            blobs = list(
+                EvidenceBlob.objects.filter(
+                    ~referenced, id__in=list(locked.values_list("id", flat=True))
+                )
+            )
+            EvidenceBlob.objects.filter(id__in=[blob.id for blob in blobs]).delete()
+
+            def delete_files():
+                for blob in blobs:
+                    for name in (
+                        blob.file.name,
+                        blob.thumbnail.name,
+                        blob.preview.name,
+                    ):
+                        if name:
+                            evidence_storage.delete(name)
+
+            transaction.on_commit(delete_files)
+
+        return len(blobs)
+
+
+class IdempotencyService:
+    @staticmethod
+    def get_stored_response(user, key):
+        stored = IdempotencyKey.objects.filter(user=user, key=key).first()
+        if stored and stored.expires_at <= timezone.now():
+            stored.delete()
+            return None
+        return stored
+
+    @staticmethod
+    def store_response(user, key, request_hash, response):
+        return IdempotencyKey.objects.create(
+            user=user,
+            key=key,
+            request_hash=request_hash,
+            response_status=response.status_code,
+            response_body=response.data,
+            expires_at=timezone.now() + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+        )
+
+    @staticmethod
+    def purge_expired_keys():
+        deleted, _ = IdempotencyKey.objects.filter(
+            expires_at__lte=timezone.now()
+        ).delete()
+        return deleted
+
+
+class SweeperService:
+    ESCALATION_REASON = (
+        "Automatically escalated: the players submitted different scores "
+        "and did not reconcile them within {hours} hours."
+    )
+
+    @staticmethod
+    def sweep(batch_size=None, max_batches=None):
+        batch_size = batch_size or settings.SWEEPER_BATCH_SIZE
+        cutoff = timezone.now() - timedelta(
+            hours=settings.SCORE_AUTO_CONFIRM_AFTER_HOURS
+        )
+        results = {"confirmed": [], "escalated": [], "stuck": []}
+        last = None
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            with transaction.atomic():
+                matches = Match.objects.select_for_update(skip_locked=True).filter(
+                    status=Match.Status.IN_PROGRESS, updated_at__lt=cutoff
+                )
+                if last:
+                    matches = matches.filter(
+                        models.Q(updated_at__gt=last[0])
+                        | models.Q(updated_at=last[0], id__gt=last[1])
+                    )
+                batch = list(matches.order_by("updated_at", "id")[:batch_size])
+                for match in batch:
+                    outcome = SweeperService._sweep_match(match, cutoff)
+                    results[outcome].append(match.id)
+
+            batches += 1
+            if len(batch) < batch_size:
+                break
+            last = (batch[-1].updated_at, batch[-1].id)
+
+        return results
+
+    @staticmethod
+    def _sweep_match(match, cutoff):
+        scores = list(
+            Score.objects.select_for_update()
+            .filter(match=match, is_confirmed=False)
+            .select_related("submitted_by")
+            .order_by("created_at")
+        )
+        if not scores or any(score.updated_at >= cutoff for score in scores):
+            return "stuck"
+
+        if any(score.set_scores != scores[0].set_scores for score in scores[1:]):
+            dispute = Dispute.objects.create(
+                match=match,
+                raised_by=scores[0].submitted_by,
+                reason=SweeperService.ESCALATION_REASON.format(
+                    hours=settings.SCORE_AUTO_CONFIRM_AFTER_HOURS
+                ),
+                **DisputeService._queue_fields(match),
+            )
+            DisputeAnalyticsService.record_match_end(match)
+            DisputeAnalyticsService.record_dispute_opened(dispute)
+            match.status = Match.Status.DISPUTED
+            match.save()
+            MatchService.touch(match)
+            return "escalated"
+
+        now = timezone.now()
+        for score in scores:
+            score.is_confirmed = True
+            score.confirmed_at = now
+            score.save()
+
+        ScoreService._finalize_match(match, scores[0])
+        MatchService.touch(match)
+        return "confirmed"
+
+
+class DisputeAnalyticsService:
+    FINISHED_STATUSES = (Match.Status.COMPLETED, Match.Status.DISPUTED)
+
+    @staticmethod
+    def _key(match, day):
+        return {
+            "period": DisputeRollup.Period.DAY,
+            "day": day,
+            "tournament_id": match.tournament_id,
+            "referee_id": match.referee_id,
+            "court": match.court,
+            "round": match.round,
+        }
+
+    @staticmethod
+    @transaction.atomic
+    def _bump(key, matches=0, opened=0, durations=()):
+        rollup, _ = DisputeRollup.objects.select_for_update().get_or_create(**key)
+        rollup.matches += matches
+        rollup.opened += opened
+        for seconds in durations:
+            rollup.resolved += 1
+            rollup.resolution_seconds += seconds
+            rollup.resolution_histogram[analytics.bucket_for(seconds)] += 1
+        rollup.save()
+
+    @staticmethod
+    def record_match_end(match):
+        """
+        Count a match once, when it first leaves play. Call before the status
+        changes; later moves between completed and disputed are not counted.
+        """
+        if match.status in DisputeAnalyticsService.FINISHED_STATUSES:
+            return
+        DisputeAnalyticsService._bump(
+            DisputeAnalyticsService._key(match, timezone.localdate()), matches=1
+        )
+
+    @staticmethod
+    def record_dispute_opened(dispute):
+        DisputeAnalyticsService._bump(
+            DisputeAnalyticsService._key(
+                dispute.match, timezone.localdate(dispute.created_at)
+            ),
+            opened=1,
+        )
+
+    @staticmethod
+    def record_disputes_resolved(disputes):
+        durations = {}
+        for dispute in disputes:
+            key = DisputeAnalyticsService._key(
+                dispute.match, timezone.localdate(dispute.resolved_at)
+            )
+            seconds = (dispute.resolved_at - dispute.created_at).total_seconds()
+            durations.setdefault(tuple(key.items()), []).append(int(seconds))
+
+        for key, seconds in durations.items():
+            DisputeAnalyticsService._bump(dict(key), durations=seconds)
+
+    @staticmethod
+    @transaction.atomic
+    def compact_rollups(keep_days=None):
+        """
+        Fold daily rows from months that ended more than ``keep_days`` ago
+        into one monthly row per tournament, referee, court and round.
+        """
+        keep_days = keep_days or settings.DISPUTE_ROLLUP_DAILY_DAYS
+        cutoff = (timezone.localdate() - timedelta(days=keep_days)).replace(day=1)
+
+        daily = list(
+            DisputeRollup.objects.select_for_update().filter(
+                period=DisputeRollup.Period.DAY, day__lt=cutoff
+            )
+        )
+        monthly = {}
+        for rollup in daily:
+            key = {
+                "period": DisputeRollup.Period.MONTH,
+                "day": rollup.day.replace(day=1),
+                "tournament_id": rollup.tournament_id,
+                "referee_id": rollup.referee_id,
+                "court": rollup.court,
+                "round": rollup.round,
+            }
+            month = monthly.get(tuple(key.items()))
+            if month is None:
+                month, _ = DisputeRollup.objects.select_for_update().get_or_create(
+                    **key
+                )
+                monthly[tuple(key.items())] = month
+
+            month.matches += rollup.matches
+            month.opened += rollup.opened
+            month.resolved += rollup.resolved
+            month.resolution_seconds += rollup.resolution_seconds
+            analytics.merge_histograms(
+                month.resolution_histogram, rollup.resolution_histogram
+            )
+
+        for month in monthly.values():
+            month.save()
+        DisputeRollup.objects.filter(id__in=[rollup.id for rollup in daily]).delete()
+
+        return len(daily)
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild_rollups():
+        """
+        Recompute the daily rollups from the raw matches and disputes tables,
+        e.g. after installing the rollups on an existing database.
+        """
+        DisputeRollup.objects.all().delete()
+
+        rollups = {}
+
+        def rollup_for(match, day):
+            key = tuple(DisputeAnalyticsService._key(match, day).items())
+            if key not in rollups:
+                rollups[key] = DisputeRollup(**dict(key))
+            return rollups[key]
+
+        matches = Match.objects.filter(
+            status__in=DisputeAnalyticsService.FINISHED_STATUSES
+        )
+        for match in matches.iterator():
+            played = match.scheduled_time or match.updated_at
+            rollup_for(match, timezone.localdate(played)).matches += 1
+
+        disputes = Dispute.objects.select_related("match")
+        for dispute in disputes.iterator():
+            rollup_for(
+                dispute.match, timezone.localdate(dispute.created_at)
+            ).opened += 1
+            if dispute.resolved_at:
+                seconds = int(
+                    (dispute.resolved_at - dispute.created_at).total_seconds()
+                )
+                rollup = rollup_for(
+                    dispute.match, timezone.localdate(dispute.resolved_at)
+                )
+                rollup.resolved += 1
+                rollup.resolution_seconds += seconds
+                rollup.resolution_histogram[analytics.bucket_for(seconds)] += 1
+
+        DisputeRollup.objects.bulk_create(rollups.values())
+        return len(rollups)
+
+    @staticmethod
+    def _summary():
+        return {
+            "matches": 0,
+            "opened": 0,
+            "resolved": 0,
+            "resolution_seconds": 0,
+            "histogram": analytics.empty_histogram(),
+        }
+
+    @staticmethod
+    def _finish(summary):
+        histogram = summary.pop("histogram")
+        resolution_seconds = summary.pop("resolution_seconds")
+        summary["dispute_rate"] = (
+            round(summary["opened"] / summary["matches"], 4)
+            if summary["matches"]
+            else None
+        )
+        summary["mean_resolution_seconds"] = (
+            round(resolution_seconds / summary["resolved"])
+            if summary["resolved"]
+            else None
+        )
+        summary["median_resolution_seconds"] = analytics.histogram_median(histogram)
+        return summary
+
+    @staticmethod
+    def get_analytics(tournament_id=None, since=None, until=None):
+        rollups = DisputeRollup.objects.select_related("referee")
+        if tournament_id:
+            rollups = rollups.filter(tournament_id=tournament_id)
+        if since:
+            rollups = rollups.filter(day__gte=since)
+        if until:
+            rollups = rollups.filter(day__lte=until)
+
+        totals = DisputeAnalyticsService._summary()
+        groups = {"referee": {}, "court": {}, "round": {}}
+        for rollup in rollups:
+            referee = rollup.referee.username if rollup.referee else None
+            dimensions = {
+                "referee": (rollup.referee_id, referee),
+                "court": rollup.court,
+                "round": rollup.round,
+            }
+            targets = [totals]
+            for name, value in dimensions.items():
+                if value not in groups[name]:
+                    groups[name][value] = DisputeAnalyticsService._summary()
+                targets.append(groups[name][value])
+
+            for summary in targets:
+                summary["matches"] += rollup.matches
+                summary["opened"] += rollup.opened
+                summary["resolved"] += rollup.resolved
+                summary["resolution_seconds"] += rollup.resolution_seconds
+                analytics.merge_histograms(
+                    summary["histogram"], rollup.resolution_histogram
+                )
+
+        finish = DisputeAnalyticsService._finish
+        return {
+            "totals": finish(totals),
+            "by_referee": [
+                {"referee": referee_id, "username": username, **finish(summary)}
+                for (referee_id, username), summary in groups["referee"].items()
+            ],
+            "by_court": [
+                {"court": court, **finish(summary)}
+                for court, summary in groups["court"].items()
+            ],
+            "by_round": [
+                {"round": round_, **finish(summary)}
+                for round_, summary in groups["round"].items()
+            ],
+        }
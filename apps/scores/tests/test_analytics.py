@@ -0,0 +1,189 @@
+"""
+Tests for dispute analytics rollups.
+"""
+
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.scores import analytics
+from apps.scores.models import Dispute, DisputeRollup
+from apps.scores.services import (
+    DisputeAnalyticsService,
+    DisputeService,
+    ScoreService,
+)
+from apps.tournaments.models import Match, Tournament
+
+
+class HistogramTest(SimpleTestCase):
+    """Test cases for the resolution time histogram."""
+
+    def test_median_interpolates_inside_bucket(self):
+        """Test the median falls between the bucket bounds."""
+        histogram = analytics.empty_histogram()
+        histogram[analytics.bucket_for(4 * 60)] += 1
+        histogram[analytics.bucket_for(7 * 60)] += 2
+        histogram[analytics.bucket_for(50 * 60)] += 1
+
+        self.assertEqual(analytics.histogram_median(histogram), 7 * 60 + 30)
+
+    def test_empty_histogram_has_no_median(self):
+        """Test no resolutions means no median."""
+        self.assertIsNone(analytics.histogram_median(analytics.empty_histogram()))
+
+
+class DisputeAnalyticsTest(TestCase):
+    """Test cases for DisputeAnalyticsService."""
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.player1 = User.objects.create_user(
+            username="player1",
+            email="p1@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.player2 = User.objects.create_user(
+            username="player2",
+            email="p2@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.referee = User.objects.create_user(
+            username="referee",
+            email="ref@example.com",
+            password="pass123",
+            role=User.Role.REFEREE,
+        )
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            status=Tournament.Status.IN_PROGRESS,
+            created_by=self.organizer,
+        )
+        self.matches = [
+            Match.objects.create(
+                tournament=self.tournament,
+                player1=self.player1,
+                player2=self.player2,
+                referee=self.referee,
+                court="Centre",
+                round=Match.Round.QUARTERFINAL,
+                status=Match.Status.IN_PROGRESS,
+            )
+            for _ in range(2)
+        ]
+        self.set_scores = [
+            {"player1": 6, "player2": 4},
+            {"player1": 6, "player2": 3},
+        ]
+
+    def play(self):
+        ScoreService.submit_score(self.matches[0].id, self.set_scores, self.referee)
+        dispute = DisputeService.create_dispute(
+            self.matches[1].id, "Wrong line call", self.player1
+        )
+        Dispute.objects.filter(id=dispute.id).update(
+            created_at=timezone.now() - timedelta(minutes=20)
+        )
+        DisputeService.resolve_dispute(
+            dispute.id, "Replay the point", self.referee, winner_id=self.player2.id
+        )
+
+    def test_rollups_follow_match_and_dispute_events(self):
+        """Test finishing matches and disputes update one daily rollup."""
+        self.play()
+
+        rollup = DisputeRollup.objects.get()
+        self.assertEqual(rollup.period, DisputeRollup.Period.DAY)
+        self.assertEqual((rollup.referee, rollup.court), (self.referee, "Centre"))
+        self.assertEqual((rollup.matches, rollup.opened, rollup.resolved), (2, 1, 1))
+        self.assertEqual(sum(rollup.resolution_histogram), 1)
+
+    def test_dispute_on_completed_match_counts_match_once(self):
+        """Test disputing a finished match does not count it again."""
+        ScoreService.submit_score(self.matches[0].id, self.set_scores, self.referee)
+        DisputeService.create_dispute(self.matches[0].id, "Wrong", self.player2)
+
+        rollup = DisputeRollup.objects.get()
+        self.assertEqual((rollup.matches, rollup.opened), (1, 1))
+
+    def test_analytics_endpoint(self):
+        """Test organizers get counts, rates and resolution times."""
+        self.play()
+        client = APIClient()
+        client.force_authenticate(user=self.organizer)
+
+        response = client.get(
+            "/api/scores/disputes/analytics/", {"tournament": self.tournament.id}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        totals = response.data["totals"]
+        self.assertEqual(totals["opened"], 1)
+        self.assertEqual(totals["dispute_rate"], 0.5)
+        self.assertEqual(totals["mean_resolution_seconds"], 20 * 60)
+        self.assertEqual(totals["median_resolution_seconds"], 1350)
+        self.assertEqual(response.data["by_referee"][0]["username"], "referee")
+        self.assertEqual(response.data["by_round"][0]["round"], "QF")
+
+        client.force_authenticate(user=self.referee)
+        response = client.get("/api/scores/disputes/analytics/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_compaction_folds_old_days_into_months(self):
+        """Test old daily rows become one monthly row with the same totals."""
+        old = (timezone.localdate() - timedelta(days=200)).replace(day=3)
+        for offset, opened in ((0, 2), (1, 3)):
+            rollup = DisputeRollup.objects.create(
+                day=old + timedelta(days=offset),
+                tournament=self.tournament,
+                referee=self.referee,
+                round=Match.Round.FINAL,
+                matches=4,
+                opened=opened,
+                resolved=1,
+                resolution_seconds=600,
+            )
+            rollup.resolution_histogram[analytics.bucket_for(600)] = 1
+            rollup.save()
+        DisputeRollup.objects.create(
+            day=timezone.localdate(),
+            tournament=self.tournament,
+            round=Match.Round.FINAL,
+            opened=1,
+        )
+
+        compacted = DisputeAnalyticsService.compact_rollups(keep_days=90)
+
+        self.assertEqual(compacted, 2)
+        month = DisputeRollup.objects.get(period=DisputeRollup.Period.MONTH)
+        self.assertEqual(month.day, old.replace(day=1))
+        self.assertEqual((month.matches, month.opened, month.resolved), (8, 5, 2))
+        self.assertEqual(month.resolution_histogram[analytics.bucket_for(600)], 2)
+        self.assertEqual(
+            DisputeRollup.objects.filter(period=DisputeRollup.Period.DAY).count(), 1
+        )
+
+    def test_rebuild_matches_incremental_rollups(self):
+        """Test rebuilding from raw tables gives the same counts."""
+        self.play()
+        expected = DisputeAnalyticsService.get_analytics()
+
+        DisputeAnalyticsService.rebuild_rollups()
+
+        self.assertEqual(DisputeAnalyticsService.get_analytics(), expected)
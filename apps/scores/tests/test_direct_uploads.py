@@ -0,0 +1,255 @@
+"""
+Tests for presigned direct-to-storage evidence uploads.
+
+Run against moto's in-process S3; skipped when boto3, moto or django-storages
+are not installed.
+"""
+
+import hashlib
+import unittest
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.scores.models import Dispute, EvidenceBlob
+from apps.scores.services import DisputeService
+from apps.tournaments.models import Match, Tournament
+
+try:
+    import boto3
+    import requests
+    import storages  # noqa: F401
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
+
+BUCKET = "evidence-test"
+CONTENT = b"line call video" * 1000
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+S3_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    "evidence": {
+        "BACKEND": "storages.backends.s3.S3Storage",
+        "OPTIONS": {
+            "bucket_name": BUCKET,
+            "region_name": "us-east-1",
+            "access_key": "testing",
+            "secret_key": "testing",
+        },
+    },
+}
+
+
+@unittest.skipIf(mock_aws is None, "boto3, moto and django-storages are required")
+@override_settings(STORAGES=S3_STORAGES)
+class DirectUploadTest(TestCase):
+    """Test cases for presigned evidence uploads."""
+
+    def setUp(self):
+        cache.clear()
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+        self.s3 = boto3.client(
+            "s3",
+            region_name="us-east-1",
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+        )
+        self.s3.create_bucket(Bucket=BUCKET)
+
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.player1 = User.objects.create_user(
+            username="player1",
+            email="p1@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.player2 = User.objects.create_user(
+            username="player2",
+            email="p2@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            created_by=self.organizer,
+        )
+        match = Match.objects.create(
+            tournament=tournament,
+            player1=self.player1,
+            player2=self.player2,
+            status=Match.Status.DISPUTED,
+        )
+        self.dispute = Dispute.objects.create(
+            match=match, raised_by=self.player1, reason="Line call"
+        )
+        self.client.force_authenticate(user=self.player1)
+
+    def start(self, sha256=SHA256, size=len(CONTENT)):
+        response = self.client.post(
+            "/api/scores/evidence/direct-uploads/",
+            {
+                "dispute": self.dispute.id,
+                "filename": "clip.mp4",
+                "size": size,
+                "sha256": sha256,
+                "description": "Phone video",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data
+
+    def complete(self, upload):
+        return self.client.post(
+            f"/api/scores/evidence/uploads/{upload['id']}/complete/", {}, format="json"
+        )
+
+    def keys(self):
+        listing = self.s3.list_objects_v2(Bucket=BUCKET)
+        return [item["Key"] for item in listing.get("Contents", [])]
+
+    def test_presigned_upload_creates_evidence(self):
+        """Test the client uploads to the bucket and completes the upload."""
+        upload = self.start()
+        self.assertTrue(upload["direct"])
+
+        put = requests.put(
+            upload["upload_url"], data=CONTENT, headers=upload["upload_headers"]
+        )
+        self.assertEqual(put.status_code, 200)
+
+        response = self.complete(upload)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        blob = EvidenceBlob.objects.get()
+        self.assertEqual(blob.sha256, SHA256)
+        self.assertEqual(self.keys(), [blob.file.name])
+        body = self.s3.get_object(Bucket=BUCKET, Key=blob.file.name)["Body"].read()
+        self.assertEqual(body, CONTENT)
+
+    def test_complete_before_upload(self):
+        """Test completing an upload with nothing in the bucket fails."""
+        upload = self.start()
+
+        response = self.complete(upload)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_wrong_object_is_rejected_and_removed(self):
+        """Test an object that does not match the declared size is discarded."""
+        upload = self.start()
+        key = f"evidence/incoming/{upload['id']}"
+        self.s3.put_object(Bucket=BUCKET, Key=key, Body=b"short")
+
+        response = self.complete(upload)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.keys(), [])
+
+    def test_known_content_needs_no_upload(self):
+        """Test a file the dispute already holds is linked without a URL."""
+        DisputeService.add_evidence(
+            self.dispute.id,
+            SimpleUploadedFile("clip.mp4", CONTENT),
+            "Video",
+            self.player2,
+        )
+
+        upload = self.start()
+
+        self.assertIsNone(upload["upload_url"])
+        self.assertIsNotNone(upload["evidence"])
+        self.assertEqual(EvidenceBlob.objects.get().evidence.count(), 2)
+
+    def test_duplicate_upload_drops_incoming_object(self):
+        """Test a second copy uploaded to the bucket is not kept."""
+        DisputeService.add_evidence(
+            self.dispute.id,
+            SimpleUploadedFile("clip.mp4", CONTENT),
+            "Video",
+            self.player2,
+        )
+        other = Dispute.objects.create(
+            match=self.dispute.match, raised_by=self.player1, reason="Again"
+        )
+        self.dispute = other
+        upload = self.start()
+        requests.put(
+            upload["upload_url"], data=CONTENT, headers=upload["upload_headers"]
+        )
+
+        response = self.complete(upload)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.keys(), [EvidenceBlob.objects.get().file.name])
+
+    def test_download_redirects_to_signed_url(self):
+        """Test downloads from the bucket are handed off with a redirect."""
+        evidence = DisputeService.add_evidence(
+            self.dispute.id,
+            SimpleUploadedFile("clip.mp4", CONTENT),
+            "Video",
+            self.player1,
+        )
+
+        response = self.client.get(f"/api/scores/evidence/{evidence.id}/download/")
+
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertIn("Signature=", response["Location"])
+
+
+class DirectUploadUnsupportedTest(TestCase):
+    """Test direct uploads on local file storage."""
+
+    def test_filesystem_storage_is_rejected(self):
+        """Test the endpoint explains the storage cannot take direct uploads."""
+        organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            created_by=organizer,
+        )
+        match = Match.objects.create(tournament=tournament)
+        dispute = Dispute.objects.create(
+            match=match, raised_by=organizer, reason="Line call"
+        )
+        client = APIClient()
+        client.force_authenticate(user=organizer)
+
+        response = client.post(
+            "/api/scores/evidence/direct-uploads/",
+            {
+                "dispute": dispute.id,
+                "filename": "clip.mp4",
+                "size": 10,
+                "sha256": SHA256,
+                "description": "Video",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
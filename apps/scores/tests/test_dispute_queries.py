@@ -0,0 +1,126 @@
+"""
+Query budget tests for the dispute read paths.
+"""
+
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.scores.models import Dispute, Evidence
+from apps.tournaments.models import Match, Tournament
+
+
+class DisputeQueryBudgetTest(TestCase):
+    """Test dispute list and detail pages run a fixed number of queries."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.referee = User.objects.create_user(
+            username="referee",
+            email="ref@example.com",
+            password="pass123",
+            role=User.Role.REFEREE,
+        )
+        self.players = [
+            User.objects.create_user(
+                username=f"player{i}",
+                email=f"p{i}@example.com",
+                password="pass123",
+                role=User.Role.PLAYER,
+            )
+            for i in range(4)
+        ]
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            status=Tournament.Status.IN_PROGRESS,
+            created_by=self.organizer,
+        )
+        for player1, player2 in [(0, 1), (2, 0), (2, 3)]:
+            match = Match.objects.create(
+                tournament=self.tournament,
+                player1=self.players[player1],
+                player2=self.players[player2],
+                referee=self.referee,
+                status=Match.Status.DISPUTED,
+            )
+            dispute = Dispute.objects.create(
+                match=match,
+                raised_by=self.players[player2],
+                reason="Wrong score",
+                resolved_by=self.referee,
+            )
+            for _ in range(2):
+                Evidence.objects.create(
+                    dispute=dispute,
+                    submitted_by=self.players[player1],
+                    description="Line call",
+                )
+        self.dispute = Dispute.objects.first()
+
+    def test_list_query_count(self):
+        """Test the API list is a count and a page query."""
+        self.client.force_authenticate(user=self.organizer)
+
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/scores/disputes/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(
+            [d["evidence_count"] for d in response.data["results"]], [2, 2, 2]
+        )
+
+    def test_list_player_filter(self):
+        """Test players see disputes on matches from either side."""
+        self.client.force_authenticate(user=self.players[0])
+
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/scores/disputes/")
+
+        self.assertEqual(response.data["count"], 2)
+
+    def test_detail_query_count(self):
+        """Test the API detail is a single query."""
+        self.client.force_authenticate(user=self.organizer)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/scores/disputes/{self.dispute.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["evidence_count"], 2)
+
+    def test_web_list_query_count(self):
+        """Test the dispute list page does not query per row."""
+        self.client.force_login(self.organizer)
+
+        # Session and user, then the disputes.
+        with self.assertNumQueries(3):
+            response = self.client.get("/disputes/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.context["disputes"]), 3)
+
+    def test_web_detail_query_count(self):
+        """Test the dispute page loads dispute, evidence and history once."""
+        self.client.force_login(self.organizer)
+
+        # Session and user, then dispute, evidence and score history.
+        with self.assertNumQueries(5):
+            response = self.client.get(f"/disputes/{self.dispute.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, "Line call", count=2)
@@ -0,0 +1,212 @@
+"""
+Tests for evidence downloads.
+"""
+
+import hashlib
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.scores.models import Dispute
+from apps.scores.services import DisputeService
+from apps.tournaments.models import Match, Tournament
+
+CONTENT = bytes(range(256)) * 40
+
+
+class EvidenceDownloadTest(TestCase):
+    """Test cases for the evidence download endpoint."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.player1 = User.objects.create_user(
+            username="player1",
+            email="p1@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.player2 = User.objects.create_user(
+            username="player2",
+            email="p2@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.outsider = User.objects.create_user(
+            username="outsider",
+            email="out@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.other_referee = User.objects.create_user(
+            username="referee",
+            email="ref@example.com",
+            password="pass123",
+            role=User.Role.REFEREE,
+        )
+        tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            created_by=self.organizer,
+        )
+        match = Match.objects.create(
+            tournament=tournament,
+            player1=self.player1,
+            player2=self.player2,
+            status=Match.Status.DISPUTED,
+        )
+        dispute = Dispute.objects.create(
+            match=match, raised_by=self.player1, reason="Line call"
+        )
+        self.evidence = DisputeService.add_evidence(
+            dispute.id, SimpleUploadedFile("clip.mp4", CONTENT), "Video", self.player1
+        )
+        self.url = f"/api/scores/evidence/{self.evidence.id}/download/"
+        self.etag = f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+        self.client.force_authenticate(user=self.player2)
+
+    def get(self, **headers):
+        response = self.client.get(self.url, **headers)
+        if getattr(response, "file_to_stream", None):
+            self.addCleanup(response.file_to_stream.close)
+        return response
+
+    def test_full_download(self):
+        """Test the whole file is returned with caching headers."""
+        response = self.get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT)
+        self.assertEqual(response["ETag"], self.etag)
+        self.assertEqual(response["Content-Type"], "video/mp4")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_range_request(self):
+        """Test a byte range returns 206 with just those bytes."""
+        response = self.get(HTTP_RANGE="bytes=100-199")
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT[100:200])
+        self.assertEqual(response["Content-Range"], f"bytes 100-199/{len(CONTENT)}")
+        self.assertEqual(response["Content-Length"], "100")
+
+    def test_suffix_and_open_ranges(self):
+        """Test bytes=-N and bytes=N- forms."""
+        response = self.get(HTTP_RANGE="bytes=-10")
+        self.assertEqual(b"".join(response.streaming_content), CONTENT[-10:])
+
+        response = self.get(HTTP_RANGE=f"bytes={len(CONTENT) - 5}-")
+        self.assertEqual(b"".join(response.streaming_content), CONTENT[-5:])
+
+    def test_unsatisfiable_range(self):
+        """Test a range past the end returns 416."""
+        response = self.get(HTTP_RANGE=f"bytes={len(CONTENT)}-")
+
+        self.assertEqual(
+            response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+        self.assertEqual(response["Content-Range"], f"bytes */{len(CONTENT)}")
+
+    def test_if_none_match(self):
+        """Test a cached copy is revalidated with 304."""
+        response = self.get(HTTP_IF_NONE_MATCH=self.etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_stale_if_range_sends_whole_file(self):
+        """Test a range for an older version is ignored."""
+        response = self.get(HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"old"')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_head_has_no_body(self):
+        """Test HEAD returns the size without the file."""
+        response = self.client.head(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Length"], str(len(CONTENT)))
+        self.assertEqual(response.content, b"")
+
+    @override_settings(
+        SENDFILE_HEADER="X-Accel-Redirect", SENDFILE_INTERNAL_URL="/protected/"
+    )
+    def test_x_accel_redirect(self):
+        """Test nginx is told to send the file."""
+        response = self.get(HTTP_RANGE="bytes=0-9")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected/{self.evidence.file.name}"
+        )
+        self.assertEqual(response.content, b"")
+
+    def test_outsider_is_forbidden(self):
+        """Test players outside the match cannot download evidence."""
+        self.client.force_authenticate(user=self.outsider)
+
+        self.assertEqual(self.get().status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_referee_of_other_match_is_forbidden(self):
+        """Test only the match referee may download evidence."""
+        self.client.force_authenticate(user=self.other_referee)
+
+        self.assertEqual(self.get().status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_organizer_can_download(self):
+        """Test organizers can download any evidence."""
+        self.client.force_authenticate(user=self.organizer)
+
+        self.assertEqual(self.get().status_code, status.HTTP_200_OK)
+
+    def test_renditions_are_served_through_the_endpoint(self):
+        """Test thumbnails need the same permission as the original."""
+        blob = self.evidence.blob
+        blob.thumbnail.save("thumb.jpg", ContentFile(b"jpeg bytes"))
+
+        response = self.client.get(self.url, {"rendition": "thumbnail"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), b"jpeg bytes")
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(
+            self.client.get(self.url, {"rendition": "preview"}).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        self.client.force_authenticate(user=self.outsider)
+        self.assertEqual(
+            self.client.get(self.url, {"rendition": "thumbnail"}).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    def test_evidence_list_hides_storage_urls(self):
+        """Test listed evidence links only to the download endpoint."""
+        response = self.client.get(
+            f"/api/scores/disputes/{self.evidence.dispute_id}/evidence/"
+        )
+
+        item = response.data["results"][0]
+        self.assertNotIn("file", item)
+        self.assertNotIn("sha256", item)
+        self.assertEqual(item["download_url"], f"http://testserver{self.url}")
+        self.assertIsNone(item["thumbnail_url"])
@@ -0,0 +1,263 @@
+"""
+Tests for the live score change feed.
+"""
+
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.scores import live
+from apps.scores.services import LiveScoringService, ScoreService
+from apps.tournaments.models import Match, Tournament
+from apps.tournaments.services import TOURNAMENT_VERSION_CACHE_KEY, MatchService
+
+
+class LiveFeedTest(TestCase):
+    """Test cases for match and tournament feed endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.player1 = User.objects.create_user(
+            username="player1",
+            email="p1@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.player2 = User.objects.create_user(
+            username="player2",
+            email="p2@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            status=Tournament.Status.IN_PROGRESS,
+            created_by=self.organizer,
+        )
+        self.match = Match.objects.create(
+            tournament=self.tournament,
+            player1=self.player1,
+            player2=self.player2,
+            status=Match.Status.IN_PROGRESS,
+        )
+        self.other_match = Match.objects.create(
+            tournament=self.tournament,
+            player1=self.player2,
+            player2=self.player1,
+            status=Match.Status.IN_PROGRESS,
+        )
+        self.set_scores = [
+            {"player1": 6, "player2": 4},
+            {"player1": 6, "player2": 3},
+        ]
+
+    def test_touch_bumps_tournament_sequence(self):
+        """Test every touch takes the next tournament version."""
+        first = MatchService.touch(self.match)
+        second = MatchService.touch(self.other_match)
+
+        self.assertEqual((first, second), (1, 2))
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.feed_version, 2)
+
+    def test_touch_many_bumps_tournament_once(self):
+        """Test touching several matches gives each its own version."""
+        with self.captureOnCommitCallbacks(execute=True):
+            MatchService.touch_many([self.match, self.other_match])
+
+        self.match.refresh_from_db()
+        self.other_match.refresh_from_db()
+        self.assertEqual((self.match.version, self.other_match.version), (1, 2))
+        self.assertEqual(
+            cache.get(TOURNAMENT_VERSION_CACHE_KEY.format(self.tournament.id)), 2
+        )
+
+    def test_match_feed_snapshot_and_not_modified(self):
+        """Test a client that is up to date gets 304."""
+        MatchService.touch(self.match)
+
+        response = self.client.get(f"/api/scores/feed/match/{self.match.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["version"], 1)
+        self.assertEqual(response.data["match"]["id"], self.match.id)
+
+        response = self.client.get(
+            f"/api/scores/feed/match/{self.match.id}/",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_match_feed_reports_score_changes(self):
+        """Test a score submission advances the match version."""
+        ScoreService.submit_score(self.match.id, self.set_scores, self.player1)
+        score = ScoreService.get_match_scores(self.match.id).get()
+        ScoreService.confirm_score(score.id, self.player2)
+
+        response = self.client.get(f"/api/scores/feed/match/{self.match.id}/?since=1")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["version"], 2)
+        self.assertEqual(response.data["match"]["status"], Match.Status.COMPLETED)
+        self.assertEqual(response.data["match"]["score"], self.set_scores)
+
+    def test_tournament_feed_returns_only_changed_matches(self):
+        """Test the tournament feed filters by version."""
+        MatchService.touch(self.match)
+        MatchService.touch(self.other_match)
+
+        response = self.client.get(
+            f"/api/scores/feed/tournament/{self.tournament.id}/?since=1"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["version"], 2)
+        self.assertEqual(
+            [m["id"] for m in response.data["matches"]], [self.other_match.id]
+        )
+
+    def test_poll_returns_immediately_with_retry_after(self):
+        """Test an up-to-date poll is answered at once with 304."""
+        with self.settings(LIVE_FEED_POLL_INTERVAL=3):
+            response = self.client.get(
+                f"/api/scores/feed/tournament/{self.tournament.id}/?since=0"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], f'"t{self.tournament.id}-v0"')
+        self.assertEqual(response["Retry-After"], "3")
+
+    def test_wait_is_off_by_default(self):
+        """Test wait is ignored unless LIVE_FEED_MAX_WAIT allows it."""
+        with mock.patch("apps.scores.services.time.sleep") as sleep:
+            response = self.client.get(
+                f"/api/scores/feed/tournament/{self.tournament.id}/?since=0&wait=5"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        sleep.assert_not_called()
+
+    def test_long_poll_returns_the_change(self):
+        """Test a waiting poll answers as soon as the version moves."""
+
+        def touch(_):
+            with self.captureOnCommitCallbacks(execute=True):
+                MatchService.touch(self.match)
+
+        with self.settings(LIVE_FEED_MAX_WAIT=5, LIVE_FEED_WAIT_INTERVAL=0.01):
+            with mock.patch(
+                "apps.scores.services.time.sleep", side_effect=touch
+            ) as sleep:
+                response = self.client.get(
+                    f"/api/scores/feed/match/{self.match.id}/?since=0&wait=30"
+                )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(response.data["version"], 0)
+        sleep.assert_called_once_with(0.01)
+
+    def test_long_poll_times_out_with_not_modified(self):
+        """Test waiting without changes ends in 304."""
+        with self.settings(LIVE_FEED_MAX_WAIT=1, LIVE_FEED_WAIT_INTERVAL=0.01):
+            response = self.client.get(
+                f"/api/scores/feed/tournament/{self.tournament.id}/?since=0&wait=0.05"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], f'"t{self.tournament.id}-v0"')
+
+    def test_live_state_comes_from_snapshot(self):
+        """Test the match feed reads the cached live score, not the events."""
+        referee = User.objects.create_user(
+            username="referee",
+            email="ref@example.com",
+            password="pass123",
+            role=User.Role.REFEREE,
+        )
+        Match.objects.filter(id=self.match.id).update(referee=referee)
+        self.addCleanup(live.discard_session, self.match.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            LiveScoringService.record_points(self.match.id, [1, 1, 2], referee)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/scores/feed/match/{self.match.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["live"]["sequence"], 3)
+        self.assertFalse([q for q in queries if "point_events" in q["sql"]])
+
+    def test_unknown_match(self):
+        """Test feed for a missing match returns 404."""
+        response = self.client.get("/api/scores/feed/match/999999/")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bracket_is_one_query_then_cached(self):
+        """Test the bracket is built from one query and then served from cache."""
+        self.client.force_authenticate(user=self.player1)
+        url = f"/api/scores/feed/tournament/{self.tournament.id}/bracket/"
+
+        # Tournament version, then the joined match query.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], f'"b{self.tournament.id}-v0"')
+        (round_,) = response.data["rounds"]
+        self.assertEqual(round_["round"], Match.Round.ROUND_32)
+        self.assertEqual(
+            round_["matches"][0]["player1"],
+            {"id": self.player1.id, "username": "player1"},
+        )
+
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+    def test_bracket_follows_score_changes(self):
+        """Test a confirmed score shows up in the cached bracket."""
+        url = f"/api/scores/feed/tournament/{self.tournament.id}/bracket/"
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ScoreService.submit_score(self.match.id, self.set_scores, self.player1)
+            score = ScoreService.get_match_scores(self.match.id).get()
+            ScoreService.confirm_score(score.id, self.player2)
+
+        response = self.client.get(url)
+        match = response.data["rounds"][0]["matches"][0]
+        self.assertEqual(response.data["version"], 2)
+        self.assertEqual(match["winner"], self.player1.id)
+        self.assertEqual(match["score"], self.set_scores)
+
+    def test_bracket_unknown_tournament(self):
+        """Test the bracket of a missing tournament returns 404."""
+        response = self.client.get("/api/scores/feed/tournament/999999/bracket/")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tournament_matches_query_count(self):
+        """Test the tournament match list does not query per match."""
+        self.client.force_authenticate(user=self.player1)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                f"/api/tournaments/{self.tournament.id}/matches/"
+            )
+
+        self.assertEqual(response.data["count"], 2)
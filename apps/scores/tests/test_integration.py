@@ -4,12 +4,15 @@ Integration tests for score submission and dispute resolution workflows.
 
 from datetime import date, timedelta
 
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from apps.accounts.models import User
-from apps.scores.models import Dispute, Score
+from apps.scores.models import Dispute, IdempotencyKey, Score
+from apps.scores.services import DisputeService, IdempotencyService
 from apps.tournaments.models import Match, Tournament
 
 
@@ -17,6 +20,7 @@ class ScoreSubmissionWorkflowTest(TestCase):
     """Integration tests for complete score submission workflow."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.organizer = User.objects.create_user(
             username="organizer",
@@ -95,6 +99,37 @@ class ScoreSubmissionWorkflowTest(TestCase):
         self.assertEqual(self.match.status, Match.Status.COMPLETED)
         self.assertEqual(self.match.winner, self.player1)
 
+    def test_conflicting_submission_returns_conflict(self):
+        """Test a submission that disagrees with the opponent returns 409."""
+        self.client.force_authenticate(user=self.player1)
+        self.client.post(
+            "/api/scores/submit/",
+            {
+                "match": self.match.id,
+                "set_scores": [
+                    {"player1": 6, "player2": 4},
+                    {"player1": 6, "player2": 3},
+                ],
+            },
+            format="json",
+        )
+
+        self.client.force_authenticate(user=self.player2)
+        response = self.client.post(
+            "/api/scores/submit/",
+            {
+                "match": self.match.id,
+                "set_scores": [
+                    {"player1": 4, "player2": 6},
+                    {"player1": 3, "player2": 6},
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(response.data["score"]["is_confirmed"])
+
     def test_referee_score_auto_confirms(self):
         """Test referee score submission auto-confirms."""
         self.client.force_authenticate(user=self.referee)
@@ -118,10 +153,133 @@ class ScoreSubmissionWorkflowTest(TestCase):
         self.assertEqual(self.match.status, Match.Status.COMPLETED)
 
 
+class IdempotentScoreSubmissionTest(TestCase):
+    """Integration tests for Idempotency-Key handling on score writes."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.player1 = User.objects.create_user(
+            username="player1",
+            email="p1@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.player2 = User.objects.create_user(
+            username="player2",
+            email="p2@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            status=Tournament.Status.IN_PROGRESS,
+            created_by=self.organizer,
+        )
+        self.tournament.players.add(self.player1, self.player2)
+        self.match = Match.objects.create(
+            tournament=self.tournament,
+            player1=self.player1,
+            player2=self.player2,
+            status=Match.Status.IN_PROGRESS,
+        )
+        self.payload = {
+            "match": self.match.id,
+            "set_scores": [
+                {"player1": 6, "player2": 4},
+                {"player1": 6, "player2": 3},
+            ],
+        }
+
+    def submit(self, payload, key):
+        return self.client.post(
+            "/api/scores/submit/",
+            payload,
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_original_response(self):
+        """Test retried submission replays the first response."""
+        self.client.force_authenticate(user=self.player1)
+
+        first = self.submit(self.payload, "retry-1")
+        second = self.submit(self.payload, "retry-1")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data["id"], first.data["id"])
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Score.objects.filter(match=self.match).count(), 1)
+
+    def test_retry_without_key_is_rejected(self):
+        """Test duplicate submission without a key still fails."""
+        self.client.force_authenticate(user=self.player1)
+        self.client.post("/api/scores/submit/", self.payload, format="json")
+
+        response = self.client.post("/api/scores/submit/", self.payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_key_reuse_with_different_payload(self):
+        """Test reusing a key for a different request is refused."""
+        self.client.force_authenticate(user=self.player1)
+        self.submit(self.payload, "reused")
+
+        changed = dict(self.payload, set_scores=[{"player1": 6, "player2": 0}] * 2)
+        response = self.submit(changed, "reused")
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_keys_are_scoped_per_user(self):
+        """Test the same key from another user is not replayed."""
+        self.client.force_authenticate(user=self.player1)
+        first = self.submit(self.payload, "shared")
+
+        self.client.force_authenticate(user=self.player2)
+        second = self.submit(self.payload, "shared")
+
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(second.data["id"], first.data["id"])
+
+    def test_confirm_retry_replays(self):
+        """Test retried confirmation does not fail as already confirmed."""
+        self.client.force_authenticate(user=self.player1)
+        score_id = self.submit(self.payload, "submit").data["id"]
+
+        self.client.force_authenticate(user=self.player2)
+        url = f"/api/scores/{score_id}/confirm/"
+        first = self.client.post(url, HTTP_IDEMPOTENCY_KEY="confirm")
+        second = self.client.post(url, HTTP_IDEMPOTENCY_KEY="confirm")
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+
+    def test_purge_expired_keys(self):
+        """Test expired keys are purged and no longer replayed."""
+        self.client.force_authenticate(user=self.player1)
+        self.submit(self.payload, "old")
+        IdempotencyKey.objects.update(expires_at=timezone.now())
+
+        self.assertEqual(IdempotencyService.purge_expired_keys(), 1)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+
 class DisputeResolutionWorkflowTest(TestCase):
     """Integration tests for dispute resolution workflow."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.organizer = User.objects.create_user(
             username="organizer",
@@ -230,11 +388,45 @@ class DisputeResolutionWorkflowTest(TestCase):
         self.assertEqual(self.match.status, Match.Status.COMPLETED)
         self.assertEqual(self.match.winner, self.player1)
 
+    def test_bulk_resolve(self):
+        """Test organizers resolve several disputes in one request."""
+        dispute = DisputeService.create_dispute(
+            self.match.id, "Wrong score", self.player1
+        )
+
+        self.client.force_authenticate(user=self.referee)
+        payload = {
+            "resolutions": [
+                {
+                    "dispute": dispute.id,
+                    "resolution_notes": "Player 2 wins.",
+                    "winner_id": self.player2.id,
+                }
+            ]
+        }
+        response = self.client.post(
+            "/api/scores/disputes/resolve/", payload, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.post(
+            "/api/scores/disputes/resolve/", payload, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["disputes"][0]["status"], "RESOLVED")
+
+        response = self.client.post(
+            "/api/scores/disputes/resolve/", payload, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 class RoleBasedAccessControlTest(TestCase):
     """Integration tests for role-based access control."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.organizer = User.objects.create_user(
             username="organizer",
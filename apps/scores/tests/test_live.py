@@ -0,0 +1,211 @@
+"""
+Tests for live point-by-point scoring.
+"""
+
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.scores import live
+from apps.scores.live import LiveMatch
+from apps.scores.models import PointEvent, Score
+from apps.scores.services import LiveScoringService
+from apps.tournaments.models import Match, Tournament
+from core.exceptions import InvalidStateError, PermissionDeniedError
+
+GAME = [1, 1, 1, 1]
+SET = GAME * 6
+
+
+class LiveMatchTest(SimpleTestCase):
+    """Test cases for the live scoring state machine."""
+
+    def play(self, state, points):
+        for player in points:
+            state.add_point(player)
+
+    def test_game_points(self):
+        """Test point names within a game."""
+        state = LiveMatch()
+        self.play(state, [1, 1, 2])
+
+        self.assertEqual(state.point_display(), ("30", "15"))
+
+    def test_deuce_and_advantage(self):
+        """Test a game needs a two point lead after deuce."""
+        state = LiveMatch()
+        self.play(state, [1, 1, 1, 2, 2, 2])
+        self.assertEqual(state.point_display(), ("40", "40"))
+
+        state.add_point(2)
+        self.assertEqual(state.point_display(), ("40", "AD"))
+
+        self.play(state, [1, 1])
+        self.assertEqual(state.point_display(), ("AD", "40"))
+
+        state.add_point(1)
+        self.assertEqual(state.games, [1, 0])
+
+    def test_set_won_six_four(self):
+        """Test a set ends at 6-4."""
+        state = LiveMatch()
+        self.play(state, GAME * 4 + [2, 2, 2, 2] * 4 + GAME * 2)
+
+        self.assertEqual(state.set_scores(), [{"player1": 6, "player2": 4}])
+        self.assertEqual(state.games, [0, 0])
+
+    def test_tiebreak(self):
+        """Test a tiebreak at 6-6 decides the set 7-6."""
+        state = LiveMatch()
+        self.play(state, (GAME + [2, 2, 2, 2]) * 6)
+        self.assertTrue(state.is_tiebreak)
+
+        self.play(state, [1] * 6 + [2] * 6)
+        self.assertEqual(state.point_display(), ("6", "6"))
+
+        self.play(state, [2, 2])
+        self.assertEqual(state.set_scores(), [{"player1": 6, "player2": 7}])
+
+    def test_match_finishes_best_of_three(self):
+        """Test two sets win a best of three match."""
+        state = LiveMatch(best_of=3)
+        self.play(state, SET * 2)
+
+        self.assertTrue(state.is_finished)
+        self.assertEqual(state.to_dict()["winner"], "player1")
+        with self.assertRaises(InvalidStateError):
+            state.add_point(2)
+
+
+class LiveScoringServiceTest(TestCase):
+    """Test cases for LiveScoringService."""
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.player1 = User.objects.create_user(
+            username="player1",
+            email="p1@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.player2 = User.objects.create_user(
+            username="player2",
+            email="p2@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.referee = User.objects.create_user(
+            username="referee",
+            email="ref@example.com",
+            password="pass123",
+            role=User.Role.REFEREE,
+        )
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            status=Tournament.Status.IN_PROGRESS,
+            created_by=self.organizer,
+        )
+        self.match = Match.objects.create(
+            tournament=self.tournament,
+            player1=self.player1,
+            player2=self.player2,
+            referee=self.referee,
+            status=Match.Status.IN_PROGRESS,
+        )
+        self.addCleanup(live.discard_session, self.match.id)
+
+    def test_points_are_written_before_acknowledging(self):
+        """Test each request's points are stored with one insert."""
+        with self.assertNumQueries(10):
+            LiveScoringService.record_points(self.match.id, [1] * 9, self.referee)
+
+        self.assertEqual(PointEvent.objects.filter(match=self.match).count(), 9)
+
+    def test_stale_session_is_reloaded(self):
+        """Test points written by another process are picked up first."""
+        session = LiveScoringService.record_points(self.match.id, [1, 1], self.referee)
+        # Another worker records the next point while this one's cache is stale.
+        PointEvent.objects.create(match=self.match, sequence=3, winner=2)
+
+        session = LiveScoringService.record_points(self.match.id, [2], self.referee)
+
+        self.assertEqual(session.sequence, 4)
+        self.assertEqual(session.state.point_display(), ("30", "30"))
+
+    def test_session_is_rebuilt_from_events(self):
+        """Test a fresh session replays persisted events."""
+        LiveScoringService.record_points(self.match.id, GAME * 3, self.referee)
+        live.discard_session(self.match.id)
+
+        session = LiveScoringService.get_live_state(self.match.id)
+
+        self.assertEqual(session.sequence, 12)
+        self.assertEqual(session.state.games, [3, 0])
+
+    def test_retried_points_are_not_applied_twice(self):
+        """Test a retried batch with the same sequence is ignored."""
+        LiveScoringService.record_points(self.match.id, [1, 2], self.referee, 1)
+        session = LiveScoringService.record_points(
+            self.match.id, [1, 2, 1], self.referee, 1
+        )
+
+        self.assertEqual(session.sequence, 3)
+        self.assertEqual(session.state.point_display(), ("30", "15"))
+
+    def test_finished_match_creates_confirmed_score(self):
+        """Test the final point submits and finalizes the score."""
+        LiveScoringService.record_points(self.match.id, SET * 2, self.referee)
+
+        score = Score.objects.get(match=self.match)
+        self.assertTrue(score.is_confirmed)
+        self.assertEqual(score.set_scores, [{"player1": 6, "player2": 0}] * 2)
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.status, Match.Status.COMPLETED)
+        self.assertEqual(self.match.winner, self.player1)
+        self.assertEqual(PointEvent.objects.filter(match=self.match).count(), 48)
+
+    def test_status_is_checked_under_lock(self):
+        """Test a match that is no longer in progress is read locked."""
+        Match.objects.filter(id=self.match.id).update(status=Match.Status.CANCELLED)
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.assertRaises(InvalidStateError):
+                LiveScoringService.record_points(self.match.id, [1], self.referee)
+
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 1)
+        self.assertTrue(selects[0].endswith("FOR UPDATE"))
+        self.assertFalse(PointEvent.objects.filter(match=self.match).exists())
+
+    def test_only_match_referee_records_points(self):
+        """Test other users cannot record points."""
+        with self.assertRaises(PermissionDeniedError):
+            LiveScoringService.record_points(self.match.id, [1], self.player1)
+
+    def test_points_api(self):
+        """Test recording points through the API."""
+        client = APIClient()
+        client.force_authenticate(user=self.referee)
+
+        response = client.post(
+            f"/api/scores/live/{self.match.id}/points/",
+            {"points": [1, 1, 2]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["sequence"], 3)
+        self.assertEqual(response.data["points"], {"player1": "30", "player2": "15"})
@@ -3,18 +3,24 @@ Tests for score services.
 """
 
 from datetime import date, timedelta
+from unittest import mock
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from apps.accounts.models import User
 from apps.scores.models import Dispute, Evidence, Score
-from apps.scores.services import DisputeService, ScoreService
+from apps.scores.services import DisputeService, ScoreService, SweeperService
 from apps.tournaments.models import Match, Tournament
+from apps.tournaments.services import MatchService
 from core.exceptions import (
     DisputeError,
     InvalidStateError,
     NotFoundError,
     PermissionDeniedError,
+    ScoreConflictError,
     ValidationError,
 )
 
@@ -111,6 +117,79 @@ class ScoreServiceTest(TestCase):
         with self.assertRaises(ValidationError):
             ScoreService.submit_score(self.match.id, set_scores, self.player1)
 
+    def test_submit_duplicate_score_fails(self):
+        """Test second submission by the same user hits the unique constraint."""
+        set_scores = [
+            {"player1": 6, "player2": 4},
+            {"player1": 6, "player2": 3},
+        ]
+        ScoreService.submit_score(self.match.id, set_scores, self.player1)
+
+        with self.assertRaises(ValidationError):
+            ScoreService.submit_score(self.match.id, set_scores, self.player1)
+
+        self.assertEqual(Score.objects.filter(match=self.match).count(), 1)
+
+    def test_matching_submissions_finalize_match(self):
+        """Test agreeing submissions from both players confirm each other."""
+        set_scores = [
+            {"player1": 6, "player2": 4},
+            {"player1": 6, "player2": 3},
+        ]
+        first = ScoreService.submit_score(self.match.id, set_scores, self.player1)
+        second = ScoreService.submit_score(self.match.id, set_scores, self.player2)
+
+        first.refresh_from_db()
+        self.assertTrue(first.is_confirmed)
+        self.assertEqual(first.confirmed_by, self.player2)
+        self.assertTrue(second.is_confirmed)
+        self.assertEqual(second.confirmed_by, self.player1)
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.status, Match.Status.COMPLETED)
+        self.assertEqual(self.match.winner, self.player1)
+
+    def test_conflicting_submissions_raise_conflict(self):
+        """Test disagreeing submissions are kept and flagged."""
+        ScoreService.submit_score(
+            self.match.id,
+            [{"player1": 6, "player2": 4}, {"player1": 6, "player2": 3}],
+            self.player1,
+        )
+
+        with self.assertRaises(ScoreConflictError) as ctx:
+            ScoreService.submit_score(
+                self.match.id,
+                [{"player1": 4, "player2": 6}, {"player1": 3, "player2": 6}],
+                self.player2,
+            )
+
+        self.assertEqual(ctx.exception.score.submitted_by, self.player2)
+        self.assertEqual(Score.objects.filter(is_confirmed=False).count(), 2)
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.status, Match.Status.IN_PROGRESS)
+
+    def test_update_to_matching_score_reconciles(self):
+        """Test fixing a conflicting score through an update finalizes the match."""
+        set_scores = [
+            {"player1": 6, "player2": 4},
+            {"player1": 6, "player2": 3},
+        ]
+        ScoreService.submit_score(self.match.id, set_scores, self.player1)
+        with self.assertRaises(ScoreConflictError) as ctx:
+            ScoreService.submit_score(
+                self.match.id,
+                [{"player1": 6, "player2": 4}, {"player1": 7, "player2": 5}],
+                self.player2,
+            )
+
+        score = ScoreService.update_score(
+            ctx.exception.score.id, set_scores, self.player2
+        )
+
+        self.assertTrue(score.is_confirmed)
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.status, Match.Status.COMPLETED)
+
     def test_confirm_score(self):
         """Test confirming opponent's score."""
         set_scores = [
@@ -126,6 +205,40 @@ class ScoreServiceTest(TestCase):
         self.match.refresh_from_db()
         self.assertEqual(self.match.status, Match.Status.COMPLETED)
 
+    def test_confirm_score_is_all_or_nothing(self):
+        """Test a failure while advancing the winner undoes the confirmation."""
+        set_scores = [
+            {"player1": 6, "player2": 4},
+            {"player1": 6, "player2": 3},
+        ]
+        score = ScoreService.submit_score(self.match.id, set_scores, self.player1)
+
+        with mock.patch.object(
+            MatchService, "advance_winner", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                ScoreService.confirm_score(score.id, self.player2)
+
+        score.refresh_from_db()
+        self.match.refresh_from_db()
+        self.assertFalse(score.is_confirmed)
+        self.assertEqual(self.match.status, Match.Status.IN_PROGRESS)
+
+    def test_confirm_score_locks_match_then_score(self):
+        """Test confirmation locks the rows in the same order as submission."""
+        set_scores = [
+            {"player1": 6, "player2": 4},
+            {"player1": 6, "player2": 3},
+        ]
+        score = ScoreService.submit_score(self.match.id, set_scores, self.player1)
+
+        with CaptureQueriesContext(connection) as queries:
+            ScoreService.confirm_score(score.id, self.player2)
+
+        locked = [q["sql"] for q in queries if q["sql"].endswith("FOR UPDATE")]
+        self.assertIn('FROM "matches"', locked[0])
+        self.assertIn('FROM "scores"', locked[1])
+
     def test_confirm_own_score_fails(self):
         """Test confirming own score fails."""
         set_scores = [
@@ -153,6 +266,69 @@ class ScoreServiceTest(TestCase):
 
         self.assertEqual(updated.set_scores, new_scores)
 
+    def test_update_score_records_revisions(self):
+        """Test updates are stored as compact per-set diffs."""
+        original = [
+            {"player1": 6, "player2": 4},
+            {"player1": 6, "player2": 3},
+        ]
+        score = ScoreService.submit_score(self.match.id, original, self.player1)
+        second = [
+            {"player1": 6, "player2": 4},
+            {"player1": 7, "player2": 5},
+        ]
+        ScoreService.update_score(score.id, second, self.player1)
+        third = [
+            {"player1": 4, "player2": 6},
+            {"player1": 7, "player2": 5},
+            {"player1": 6, "player2": 2},
+        ]
+        ScoreService.update_score(score.id, third, self.player1)
+
+        revisions = ScoreService.get_score_revisions(score.id)
+
+        self.assertEqual([r.revision for r in revisions], [1, 2, 3])
+        self.assertEqual(revisions[0].set_scores, original)
+        self.assertIsNone(revisions[1].set_scores)
+        self.assertEqual(revisions[1].changes, {"length": 2, "sets": [[1, 7, 5]]})
+        self.assertEqual(
+            [r.full_set_scores for r in revisions], [original, second, third]
+        )
+        self.assertEqual(
+            ScoreService.get_score_revision(score.id, 2).full_set_scores, second
+        )
+
+    def test_update_score_without_revisions(self):
+        """Test a score saved without history gets a base revision."""
+        original = [{"player1": 6, "player2": 4}, {"player1": 6, "player2": 3}]
+        score = Score.objects.create(
+            match=self.match, submitted_by=self.player1, set_scores=original
+        )
+        updated = [{"player1": 6, "player2": 4}, {"player1": 7, "player2": 5}]
+
+        ScoreService.update_score(score.id, updated, self.player1)
+
+        revisions = ScoreService.get_score_revisions(score.id)
+        self.assertEqual([r.revision for r in revisions], [1, 2])
+        self.assertEqual([r.full_set_scores for r in revisions], [original, updated])
+
+    def test_match_history_loads_in_one_query(self):
+        """Test the full match history is fetched with a single query."""
+        set_scores = [
+            {"player1": 6, "player2": 4},
+            {"player1": 6, "player2": 3},
+        ]
+        score = ScoreService.submit_score(self.match.id, set_scores, self.player1)
+        updated = [{"player1": 6, "player2": 4}, {"player1": 6, "player2": 2}]
+        ScoreService.update_score(score.id, updated, self.player1)
+        ScoreService.submit_score(self.match.id, updated, self.player2)
+
+        with self.assertNumQueries(1):
+            history = ScoreService.get_match_history(self.match.id)
+            names = [r.changed_by.username for r in history]
+
+        self.assertEqual(names, ["player1", "player1", "player2"])
+
     def test_update_confirmed_score_fails(self):
         """Test updating confirmed score fails."""
         set_scores = [
@@ -294,3 +470,267 @@ class DisputeServiceTest(TestCase):
         reviewed = DisputeService.mark_under_review(dispute.id, self.referee)
 
         self.assertEqual(reviewed.status, Dispute.Status.UNDER_REVIEW)
+        self.assertEqual(reviewed.claimed_by, self.referee)
+
+    def _disputed_match(self):
+        match = Match.objects.create(
+            tournament=self.tournament,
+            player1=self.player1,
+            player2=self.player2,
+            referee=self.referee,
+            status=Match.Status.COMPLETED,
+        )
+        return DisputeService.create_dispute(match.id, "Score dispute", self.player1)
+
+    def test_resolve_disputes_in_bulk(self):
+        """Test several disputes are resolved and their matches completed."""
+        first = DisputeService.create_dispute(
+            self.match.id, "Score dispute", self.player1
+        )
+        second = self._disputed_match()
+        self.tournament.refresh_from_db()
+        version = self.tournament.feed_version
+
+        resolved = DisputeService.resolve_disputes(
+            [
+                {
+                    "dispute": first.id,
+                    "resolution_notes": "Player 1 wins",
+                    "winner_id": self.player1.id,
+                },
+                {
+                    "dispute": second.id,
+                    "resolution_notes": "Player 2 wins",
+                    "winner_id": self.player2.id,
+                },
+            ],
+            self.organizer,
+        )
+
+        self.assertEqual(len(resolved), 2)
+        first.refresh_from_db()
+        self.assertEqual(first.status, Dispute.Status.RESOLVED)
+        self.assertEqual(first.resolved_by, self.organizer)
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.status, Match.Status.COMPLETED)
+        self.assertEqual(self.match.winner, self.player1)
+        second.match.refresh_from_db()
+        self.assertEqual(second.match.winner, self.player2)
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.feed_version, version + 2)
+
+    def test_resolve_disputes_rolls_back_on_error(self):
+        """Test one invalid resolution leaves every dispute open."""
+        first = DisputeService.create_dispute(
+            self.match.id, "Score dispute", self.player1
+        )
+        second = self._disputed_match()
+        outsider = User.objects.create_user(
+            username="outsider",
+            email="out@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+
+        with self.assertRaises(ValidationError):
+            DisputeService.resolve_disputes(
+                [
+                    {"dispute": first.id, "resolution_notes": "Player 1 wins"},
+                    {
+                        "dispute": second.id,
+                        "resolution_notes": "Someone else wins",
+                        "winner_id": outsider.id,
+                    },
+                ],
+                self.organizer,
+            )
+
+        first.refresh_from_db()
+        self.assertEqual(first.status, Dispute.Status.OPEN)
+
+    def test_resolve_disputes_organizer_only(self):
+        """Test referees cannot resolve disputes in bulk."""
+        dispute = DisputeService.create_dispute(
+            self.match.id, "Score dispute", self.player1
+        )
+
+        with self.assertRaises(PermissionDeniedError):
+            DisputeService.resolve_disputes(
+                [{"dispute": dispute.id, "resolution_notes": "Done"}], self.referee
+            )
+
+    def test_mark_under_review_claimed_by_other_fails(self):
+        """Test a dispute claimed by one reviewer cannot be taken by another."""
+        dispute = DisputeService.create_dispute(
+            self.match.id, "Score dispute", self.player1
+        )
+        DisputeService.mark_under_review(dispute.id, self.organizer)
+
+        with self.assertRaises(DisputeError):
+            DisputeService.mark_under_review(dispute.id, self.referee)
+
+    def test_dispute_takes_queue_fields_from_match(self):
+        """Test priority comes from the round and deadline from the tournament."""
+        self.match.round = Match.Round.SEMIFINAL
+        self.match.save()
+
+        dispute = DisputeService.create_dispute(
+            self.match.id, "Score dispute", self.player1
+        )
+
+        self.assertEqual(dispute.priority, 1)
+        self.assertEqual(dispute.deadline, self.tournament.end_date)
+
+    def test_claim_next_dispute_by_priority(self):
+        """Test later rounds are claimed first, then older disputes."""
+        early = DisputeService.create_dispute(
+            self.match.id, "Score dispute", self.player1
+        )
+        final = Match.objects.create(
+            tournament=self.tournament,
+            player1=self.player1,
+            player2=self.player2,
+            referee=self.referee,
+            round=Match.Round.FINAL,
+            status=Match.Status.COMPLETED,
+        )
+        urgent = DisputeService.create_dispute(final.id, "Final dispute", self.player2)
+
+        first = DisputeService.claim_next_dispute(self.referee)
+        second = DisputeService.claim_next_dispute(self.referee)
+
+        self.assertEqual((first, second), (urgent, early))
+        self.assertEqual(first.status, Dispute.Status.UNDER_REVIEW)
+        self.assertEqual(first.claimed_by, self.referee)
+        self.assertIsNone(DisputeService.claim_next_dispute(self.referee))
+
+    def test_claim_next_dispute_only_own_matches(self):
+        """Test referees only claim disputes on matches they referee."""
+        DisputeService.create_dispute(self.match.id, "Score dispute", self.player1)
+        other_referee = User.objects.create_user(
+            username="referee2",
+            email="ref2@example.com",
+            password="pass123",
+            role=User.Role.REFEREE,
+        )
+
+        self.assertIsNone(DisputeService.claim_next_dispute(other_referee))
+        self.assertIsNotNone(DisputeService.claim_next_dispute(self.organizer))
+
+
+class SweeperServiceTest(TestCase):
+    """Test cases for SweeperService."""
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.player1 = User.objects.create_user(
+            username="player1",
+            email="p1@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.player2 = User.objects.create_user(
+            username="player2",
+            email="p2@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            status=Tournament.Status.IN_PROGRESS,
+            created_by=self.organizer,
+        )
+        self.match = Match.objects.create(
+            tournament=self.tournament,
+            player1=self.player1,
+            player2=self.player2,
+            status=Match.Status.IN_PROGRESS,
+        )
+        self.set_scores = [
+            {"player1": 6, "player2": 4},
+            {"player1": 6, "player2": 3},
+        ]
+
+    def make_stale(self, hours=72):
+        stale = timezone.now() - timedelta(hours=hours)
+        Score.objects.filter(match=self.match).update(updated_at=stale)
+        Match.objects.filter(id=self.match.id).update(updated_at=stale)
+
+    def test_auto_confirms_single_stale_score(self):
+        """Test an unanswered score is confirmed after the window."""
+        score = ScoreService.submit_score(self.match.id, self.set_scores, self.player1)
+        self.make_stale()
+
+        results = SweeperService.sweep()
+
+        self.assertEqual(results["confirmed"], [self.match.id])
+        score.refresh_from_db()
+        self.assertTrue(score.is_confirmed)
+        self.assertIsNone(score.confirmed_by)
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.status, Match.Status.COMPLETED)
+        self.assertEqual(self.match.winner, self.player1)
+
+    def test_escalates_conflicting_scores(self):
+        """Test differing stale scores open a dispute."""
+        ScoreService.submit_score(self.match.id, self.set_scores, self.player1)
+        with self.assertRaises(ScoreConflictError):
+            ScoreService.submit_score(
+                self.match.id, list(reversed(self.set_scores)), self.player2
+            )
+        self.make_stale()
+
+        results = SweeperService.sweep()
+
+        self.assertEqual(results["escalated"], [self.match.id])
+        dispute = Dispute.objects.get(match=self.match)
+        self.assertEqual(dispute.raised_by, self.player1)
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.status, Match.Status.DISPUTED)
+
+    def test_recent_scores_are_left_alone(self):
+        """Test scores inside the window are not confirmed."""
+        score = ScoreService.submit_score(self.match.id, self.set_scores, self.player1)
+        self.make_stale(hours=1)
+
+        results = SweeperService.sweep()
+
+        self.assertEqual(results, {"confirmed": [], "escalated": [], "stuck": []})
+        score.refresh_from_db()
+        self.assertFalse(score.is_confirmed)
+
+    def test_reports_stuck_matches_without_scores(self):
+        """Test stale matches with nothing to confirm are reported."""
+        self.make_stale()
+
+        results = SweeperService.sweep()
+
+        self.assertEqual(results["stuck"], [self.match.id])
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.status, Match.Status.IN_PROGRESS)
+
+    def test_walks_every_batch(self):
+        """Test the sweep pages through matches in batches."""
+        for _ in range(2):
+            Match.objects.create(
+                tournament=self.tournament,
+                player1=self.player1,
+                player2=self.player2,
+                status=Match.Status.IN_PROGRESS,
+            )
+        Match.objects.update(updated_at=timezone.now() - timedelta(hours=72))
+
+        results = SweeperService.sweep(batch_size=2)
+
+        self.assertEqual(len(results["stuck"]), 3)
+        self.assertEqual(
+            len(SweeperService.sweep(batch_size=2, max_batches=1)["stuck"]), 2
+        )
@@ -0,0 +1,199 @@
+"""
+Tests for rate limiting on score and dispute writes.
+"""
+
+import threading
+import time
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.scores.services import ScoreService
+from apps.scores.throttling import TokenBucketThrottle, WriteUserThrottle
+from apps.tournaments.models import Match, Tournament
+
+THROTTLE_SETTINGS = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.SessionAuthentication",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": [
+        "rest_framework.permissions.IsAuthenticated",
+    ],
+    "DEFAULT_THROTTLE_RATES": {
+        "score_writes_user": "2/min",
+        "score_writes_ip": "3/min",
+        "dispute_writes_user": "1/min",
+        "dispute_writes_ip": "10/min",
+    },
+}
+
+
+@override_settings(REST_FRAMEWORK=THROTTLE_SETTINGS)
+class WriteThrottleTest(TestCase):
+    """Test cases for the token bucket write throttles."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.player1 = User.objects.create_user(
+            username="player1",
+            email="p1@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.player2 = User.objects.create_user(
+            username="player2",
+            email="p2@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            status=Tournament.Status.IN_PROGRESS,
+            created_by=self.organizer,
+        )
+        self.match = Match.objects.create(
+            tournament=self.tournament,
+            player1=self.player1,
+            player2=self.player2,
+            status=Match.Status.IN_PROGRESS,
+        )
+        self.score = ScoreService.submit_score(
+            self.match.id,
+            [{"player1": 6, "player2": 4}, {"player1": 6, "player2": 3}],
+            self.player1,
+        )
+        self.update = {
+            "set_scores": [{"player1": 6, "player2": 2}, {"player1": 6, "player2": 3}]
+        }
+
+    def put_score(self):
+        return self.client.put(
+            f"/api/scores/{self.score.id}/", self.update, format="json"
+        )
+
+    def test_user_bucket_returns_retry_after(self):
+        """Test a user over the limit gets 429 with Retry-After."""
+        self.client.force_authenticate(user=self.player1)
+
+        self.assertEqual(self.put_score().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.put_score().status_code, status.HTTP_200_OK)
+        response = self.put_score()
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "30")
+
+    def test_bucket_refills_over_time(self):
+        """Test tokens come back at the configured rate."""
+        self.client.force_authenticate(user=self.player1)
+        with mock.patch.object(TokenBucketThrottle, "timer", return_value=1000.0):
+            self.put_score()
+            self.put_score()
+            self.assertEqual(
+                self.put_score().status_code, status.HTTP_429_TOO_MANY_REQUESTS
+            )
+
+        with mock.patch.object(TokenBucketThrottle, "timer", return_value=1030.0):
+            self.assertEqual(self.put_score().status_code, status.HTTP_200_OK)
+
+    def test_concurrent_requests_cannot_overspend(self):
+        """Test N+1 simultaneous requests leave exactly one throttled."""
+        backend = type(caches["default"])
+        read = backend.get
+
+        def slow_get(self, *args, **kwargs):
+            # Give the other requests time to read the same bucket.
+            value = read(self, *args, **kwargs)
+            time.sleep(0.02)
+            return value
+
+        request = mock.Mock(user=self.player1)
+        view = mock.Mock(throttle_scope="score_writes")
+        results = []
+        barrier = threading.Barrier(3)
+
+        def attempt():
+            barrier.wait()
+            results.append(WriteUserThrottle().allow_request(request, view))
+
+        with mock.patch.object(backend, "get", slow_get):
+            threads = [threading.Thread(target=attempt) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(sorted(results), [False, True, True])
+
+    def test_ip_bucket_is_shared_between_users(self):
+        """Test the per-IP bucket limits all users behind one address."""
+        self.client.force_authenticate(user=self.player1)
+        self.put_score()
+        self.put_score()
+        self.client.force_authenticate(user=self.player2)
+        self.put_score()
+
+        response = self.put_score()
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_reads_are_not_throttled(self):
+        """Test GET on a score does not use write tokens."""
+        self.client.force_authenticate(user=self.player1)
+        for _ in range(5):
+            response = self.client.get(f"/api/scores/{self.score.id}/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.put_score().status_code, status.HTTP_200_OK)
+
+    def test_dispute_writes_have_own_scope(self):
+        """Test dispute creation is limited separately from scores."""
+        self.client.force_authenticate(user=self.player2)
+        payload = {"match": self.match.id, "reason": "Wrong score"}
+
+        self.client.post("/api/scores/disputes/create/", payload, format="json")
+        response = self.client.post(
+            "/api/scores/disputes/create/", payload, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.put_score().status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_metrics_endpoint(self):
+        """Test organizers can read allowed and throttled counts."""
+        self.client.force_authenticate(user=self.player1)
+        for _ in range(3):
+            self.put_score()
+
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.get("/api/scores/throttle-metrics/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["score_writes_user"], {"allowed": 2, "throttled": 1}
+        )
+        self.assertEqual(
+            response.data["score_writes_ip"], {"allowed": 3, "throttled": 0}
+        )
+
+    def test_metrics_endpoint_requires_organizer(self):
+        """Test players cannot read throttle metrics."""
+        self.client.force_authenticate(user=self.player1)
+
+        response = self.client.get("/api/scores/throttle-metrics/")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,314 @@
+"""
+Tests for resumable evidence uploads and content-addressed storage.
+"""
+
+import hashlib
+import io
+import shutil
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.scores.models import Dispute, Evidence, EvidenceBlob, EvidenceUpload
+from apps.scores.services import (
+    DisputeService,
+    EvidenceBlobService,
+    EvidenceUploadService,
+)
+from apps.tournaments.models import Match, Tournament
+
+CONTENT = b"0123456789" * 1000
+
+
+class EvidenceUploadTest(TestCase):
+    """Test cases for the chunked upload protocol and blob storage."""
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root,
+            EVIDENCE_UPLOAD_DIR=Path(media_root) / "uploads",
+            EVIDENCE_UPLOAD_CHUNK_SIZE=1024,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.player1 = User.objects.create_user(
+            username="player1",
+            email="p1@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.outsider = User.objects.create_user(
+            username="outsider",
+            email="out@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        self.player2 = User.objects.create_user(
+            username="player2",
+            email="p2@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            status=Tournament.Status.IN_PROGRESS,
+            created_by=self.organizer,
+        )
+        match = Match.objects.create(
+            tournament=tournament,
+            player1=self.player1,
+            player2=self.player2,
+            status=Match.Status.DISPUTED,
+        )
+        self.dispute = Dispute.objects.create(
+            match=match, raised_by=self.player1, reason="Line call"
+        )
+        self.client.force_authenticate(user=self.player1)
+
+    def start_upload(self, size=len(CONTENT), **extra):
+        response = self.client.post(
+            "/api/scores/evidence/uploads/",
+            {
+                "dispute": self.dispute.id,
+                "filename": "clip.mp4",
+                "size": size,
+                "description": "Phone video",
+                **extra,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.upload_data = response.data
+        return f"/api/scores/evidence/uploads/{response.data['id']}/"
+
+    def send(self, url, offset, chunk, **headers):
+        return self.client.generic(
+            "PATCH",
+            url,
+            chunk,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+            **headers,
+        )
+
+    def test_chunked_upload_creates_evidence(self):
+        """Test chunks are assembled into one evidence file."""
+        url = self.start_upload()
+
+        for offset in range(0, len(CONTENT), 3000):
+            response = self.send(url, offset, CONTENT[offset : offset + 3000])
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.post(
+            f"{url}complete/",
+            {"sha256": hashlib.sha256(CONTENT).hexdigest()},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        evidence = self.dispute.evidence.get()
+        with evidence.file.open("rb") as f:
+            self.assertEqual(f.read(), CONTENT)
+        upload = EvidenceUpload.objects.get()
+        self.assertEqual(upload.evidence, evidence)
+        self.assertEqual(upload.sha256, hashlib.sha256(CONTENT).hexdigest())
+
+    def test_resume_reports_offset(self):
+        """Test a client can ask where to resume after a dropped request."""
+        url = self.start_upload()
+        self.send(url, 0, CONTENT[:4000])
+
+        response = self.client.head(url)
+
+        self.assertEqual(response["Upload-Offset"], "4000")
+        self.assertEqual(response["Upload-Length"], str(len(CONTENT)))
+
+    def test_wrong_offset_conflicts(self):
+        """Test a chunk at the wrong offset is rejected with the real one."""
+        url = self.start_upload()
+        self.send(url, 0, CONTENT[:4000])
+
+        response = self.send(url, 2000, CONTENT[2000:6000])
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response["Upload-Offset"], "4000")
+
+    def test_chunk_is_written_under_row_lock(self):
+        """Test the offset check and the write happen with the upload locked."""
+        url = self.start_upload()
+        upload = EvidenceUpload.objects.get()
+
+        with CaptureQueriesContext(connection) as queries:
+            EvidenceUploadService.append_chunk(
+                upload.id, 0, io.BytesIO(CONTENT[:4000]), self.player1
+            )
+
+        locks = [
+            q
+            for q in queries
+            if q["sql"].startswith('SELECT "evidence_uploads"')
+            and "FOR UPDATE" in q["sql"]
+        ]
+        self.assertEqual(len(locks), 1)
+        self.assertEqual(self.client.head(url)["Upload-Offset"], "4000")
+
+    def test_bad_chunk_checksum_is_rolled_back(self):
+        """Test a corrupted chunk is not kept."""
+        url = self.start_upload()
+
+        response = self.send(
+            url, 0, CONTENT[:4000], HTTP_UPLOAD_CHECKSUM="sha256 " + "0" * 64
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.head(url)["Upload-Offset"], "0")
+
+    def test_chunk_past_declared_size(self):
+        """Test a client cannot write more than it declared."""
+        url = self.start_upload(size=100)
+
+        response = self.send(url, 0, CONTENT[:200])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_complete_requires_all_bytes(self):
+        """Test an unfinished upload cannot be completed."""
+        url = self.start_upload()
+        self.send(url, 0, CONTENT[:4000])
+
+        response = self.client.post(f"{url}complete/", {}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(self.dispute.evidence.exists())
+
+    def test_only_uploader_can_send_chunks(self):
+        """Test another user cannot write to an upload."""
+        url = self.start_upload()
+        self.client.force_authenticate(user=self.player2)
+
+        response = self.send(url, 0, CONTENT[:4000])
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_outsider_cannot_start_upload(self):
+        """Test players outside the match cannot upload evidence."""
+        self.client.force_authenticate(user=self.outsider)
+
+        response = self.client.post(
+            "/api/scores/evidence/uploads/",
+            {
+                "dispute": self.dispute.id,
+                "filename": "clip.mp4",
+                "size": 10,
+                "description": "Not mine",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_purge_stale_uploads(self):
+        """Test abandoned uploads are removed with their part files."""
+        upload = EvidenceUploadService.create_upload(
+            self.dispute.id, "clip.mp4", 10, "Old", self.player1
+        )
+        EvidenceUpload.objects.update(updated_at=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(EvidenceUploadService.purge_stale_uploads(), 1)
+        self.assertFalse(EvidenceUpload.objects.filter(id=upload.id).exists())
+
+    def add_evidence(self, user, content=CONTENT, name="clip.mp4"):
+        return DisputeService.add_evidence(
+            self.dispute.id, SimpleUploadedFile(name, content), "Clip", user
+        )
+
+    def test_same_content_is_stored_once(self):
+        """Test both players uploading the same clip share one blob."""
+        first = self.add_evidence(self.player1)
+        second = self.add_evidence(self.player2, name="copy.MP4")
+
+        self.assertEqual(first.blob, second.blob)
+        self.assertEqual(first.file.name, second.file.name)
+        blob = EvidenceBlob.objects.get()
+        self.assertEqual(blob.evidence.count(), 2)
+        self.assertEqual(blob.sha256, hashlib.sha256(CONTENT).hexdigest())
+        self.assertEqual(blob.size, len(CONTENT))
+
+    def test_chunked_upload_reuses_blob(self):
+        """Test a completed upload of known content links the existing blob."""
+        existing = self.add_evidence(self.player2)
+        url = self.start_upload()
+        self.send(url, 0, CONTENT)
+
+        response = self.client.post(f"{url}complete/", {}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(EvidenceBlob.objects.count(), 1)
+        evidence = Evidence.objects.get(id=response.data["id"])
+        self.assertEqual(evidence.blob, existing.blob)
+
+    def test_known_hash_skips_the_upload(self):
+        """Test declaring a hash the dispute already holds needs no bytes."""
+        self.add_evidence(self.player2)
+
+        self.start_upload(sha256=hashlib.sha256(CONTENT).hexdigest())
+
+        self.assertEqual(self.upload_data["offset"], len(CONTENT))
+        self.assertIsNotNone(self.upload_data["evidence"])
+        self.assertEqual(Evidence.objects.filter(submitted_by=self.player1).count(), 1)
+        self.assertEqual(EvidenceBlob.objects.get().evidence.count(), 2)
+
+    def test_hash_from_other_dispute_is_not_linked(self):
+        """Test a hash alone does not grant access to another dispute's file."""
+        other = Dispute.objects.create(
+            match=self.dispute.match, raised_by=self.player2, reason="Other"
+        )
+        DisputeService.add_evidence(
+            other.id, SimpleUploadedFile("clip.mp4", CONTENT), "Clip", self.player2
+        )
+
+        self.start_upload(sha256=hashlib.sha256(CONTENT).hexdigest())
+
+        self.assertEqual(self.upload_data["offset"], 0)
+        self.assertIsNone(self.upload_data["evidence"])
+
+    def test_purge_unreferenced_blobs(self):
+        """Test cleanup deletes orphaned blobs only."""
+        evidence = self.add_evidence(self.player1)
+        kept = self.add_evidence(self.player1, content=b"other clip")
+        name = evidence.blob.file.name
+        evidence.delete()
+        EvidenceBlob.objects.update(created_at=timezone.now() - timedelta(days=1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted = EvidenceBlobService.purge_unreferenced_blobs()
+
+        self.assertEqual(deleted, 1)
+        self.assertFalse(default_storage.exists(name))
+        self.assertEqual(EvidenceBlob.objects.get().id, kept.blob_id)
+        self.assertTrue(default_storage.exists(kept.file.name))
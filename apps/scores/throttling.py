@@ -0,0 +1,131 @@
+import time
+
+from django.core.cache import cache as default_cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+METRICS_CACHE_KEY = "throttle:metrics:{}:{}"
+METRICS_SCOPES_CACHE_KEY = "throttle:metrics:scopes"
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket keyed per view scope. The bucket holds up to the number of
+    requests in the configured rate and refills continuously, so clients get
+    short bursts but a steady average instead of a hard window reset.
+    """
+
+    cache = default_cache
+    cache_format = "throttle:bucket:%(scope)s:%(ident)s"
+    suffix = None
+    # The bucket is read and written under a cache lock (``cache.add``).
+    # The lock expires after LOCK_TIMEOUT seconds so a crashed worker cannot
+    # hold it, and a request that cannot get it within LOCK_WAIT is refused.
+    LOCK_TIMEOUT = 5
+    LOCK_WAIT = 1.0
+
+    def __init__(self):
+        # The rate depends on the view, so it is resolved in allow_request.
+        self.wait_seconds = None
+
+    def get_rate(self):
+        # Read through api_settings so rate changes in settings are picked up.
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_ident_key(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        view_scope = getattr(view, "throttle_scope", None)
+        if not view_scope:
+            return True
+
+        self.scope = f"{view_scope}_{self.suffix}"
+        self.rate = self.get_rate()
+        ident = self.get_ident_key(request)
+        if self.rate is None or ident is None:
+            return True
+
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        key = self.cache_format % {"scope": self.scope, "ident": ident}
+        refill_rate = self.num_requests / self.duration
+
+        if not self.acquire(key):
+            self.wait_seconds = 1 / refill_rate
+            record_throttle_metric(self.scope, "throttled")
+            return False
+        try:
+            now = self.timer()
+            tokens, updated_at = self.cache.get(key, (self.num_requests, now))
+            tokens = min(self.num_requests, tokens + (now - updated_at) * refill_rate)
+            if tokens >= 1:
+                self.cache.set(key, (tokens - 1, now), self.duration)
+        finally:
+            self.cache.delete(f"{key}:lock")
+
+        if tokens < 1:
+            self.wait_seconds = (1 - tokens) / refill_rate
+            record_throttle_metric(self.scope, "throttled")
+            return False
+
+        record_throttle_metric(self.scope, "allowed")
+        return True
+
+    def acquire(self, key):
+        """Take the bucket's lock, waiting up to ``LOCK_WAIT`` seconds."""
+        deadline = time.monotonic() + self.LOCK_WAIT
+        while not self.cache.add(f"{key}:lock", 1, self.LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class WriteUserThrottle(TokenBucketThrottle):
+    suffix = "user"
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return None
+
+
+class WriteIPThrottle(TokenBucketThrottle):
+    suffix = "ip"
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+def record_throttle_metric(scope, outcome):
+    key = METRICS_CACHE_KEY.format(scope, outcome)
+    if not default_cache.add(key, 1, None):
+        try:
+            default_cache.incr(key)
+        except ValueError:
+            default_cache.set(key, 1, None)
+
+    scopes = default_cache.get(METRICS_SCOPES_CACHE_KEY, set())
+    if scope not in scopes:
+        default_cache.set(METRICS_SCOPES_CACHE_KEY, scopes | {scope}, None)
+
+
+def get_throttle_metrics():
+    scopes = sorted(default_cache.get(METRICS_SCOPES_CACHE_KEY, set()))
+    keys = [
+        METRICS_CACHE_KEY.format(scope, outcome)
+        for scope in scopes
+        for outcome in ("allowed", "throttled")
+    ]
+    counts = default_cache.get_many(keys)
+    return {
+        scope: {
+            outcome: counts.get(METRICS_CACHE_KEY.format(scope, outcome), 0)
+            for outcome in ("allowed", "throttled")
+        }
+        for scope in scopes
+    }
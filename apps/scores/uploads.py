@@ -0,0 +1,89 @@
+import hashlib
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+
+from core.exceptions import ValidationError
+
+
+class StagedFile(File):
+    """
+    A finished upload on local disk. FileSystemStorage moves files that expose
+    temporary_file_path() instead of copying them.
+    """
+
+    def temporary_file_path(self):
+        return self.name
+
+
+def part_path(upload):
+    return Path(settings.EVIDENCE_UPLOAD_DIR) / f"{upload.id}.part"
+
+
+def incoming_name(upload):
+    return f"evidence/incoming/{upload.id}"
+
+
+def create_part(upload):
+    path = part_path(upload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    return path
+
+
+def remove_part(upload):
+    part_path(upload).unlink(missing_ok=True)
+
+
+def write_chunk(upload, offset, stream, checksum=None):
+    """
+    Stream a request body into the part file at offset, one block at a time.
+    Returns the number of bytes written. Anything written is rolled back when
+    the chunk runs past the declared size or fails its checksum.
+    """
+    chunk_size = settings.EVIDENCE_UPLOAD_CHUNK_SIZE
+    remaining = upload.size - offset
+    digest = hashlib.sha256()
+    written = 0
+
+    with open(part_path(upload), "r+b") as part:
+        part.seek(offset)
+        part.truncate()
+        try:
+            while stream is not None:
+                block = stream.read(chunk_size)
+                if not block:
+                    break
+                written += len(block)
+                if written > remaining:
+                    raise ValidationError("Chunk runs past the declared upload size.")
+                digest.update(block)
+                part.write(block)
+
+            if checksum and checksum.lower() != digest.hexdigest():
+                raise ValidationError("Chunk checksum does not match.")
+        except Exception:
+            part.truncate(offset)
+            raise
+        part.flush()
+        os.fsync(part.fileno())
+
+    return written
+
+
+def hash_file_object(file):
+    digest = hashlib.sha256()
+    for block in file.chunks(settings.EVIDENCE_UPLOAD_CHUNK_SIZE):
+        digest.update(block)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(settings.EVIDENCE_UPLOAD_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -9,9 +9,57 @@ urlpatterns = [
     path("<int:pk>/", views.ScoreDetailView.as_view(), name="score-detail"),
     path("<int:pk>/confirm/", views.ScoreConfirmView.as_view(), name="score-confirm"),
     path("match/<int:match_id>/", views.MatchScoresView.as_view(), name="match-scores"),
+    path(
+        "<int:pk>/revisions/",
+        views.ScoreRevisionListView.as_view(),
+        name="score-revisions",
+    ),
+    path(
+        "<int:pk>/revisions/<int:revision>/",
+        views.ScoreRevisionDetailView.as_view(),
+        name="score-revision-detail",
+    ),
+    path(
+        "match/<int:match_id>/history/",
+        views.MatchScoreHistoryView.as_view(),
+        name="match-score-history",
+    ),
+    path("live/<int:match_id>/", views.LiveScoreView.as_view(), name="live-score"),
+    path(
+        "live/<int:match_id>/points/",
+        views.LivePointsView.as_view(),
+        name="live-points",
+    ),
+    path("feed/match/<int:pk>/", views.MatchFeedView.as_view(), name="match-feed"),
+    path(
+        "feed/tournament/<int:pk>/",
+        views.TournamentFeedView.as_view(),
+        name="tournament-feed",
+    ),
+    path(
+        "feed/tournament/<int:pk>/bracket/",
+        views.TournamentBracketView.as_view(),
+        name="tournament-bracket",
+    ),
+    path(
+        "throttle-metrics/",
+        views.ThrottleMetricsView.as_view(),
+        name="throttle-metrics",
+    ),
     path("disputes/", views.DisputeListView.as_view(), name="dispute-list"),
     path("disputes/open/", views.OpenDisputesView.as_view(), name="open-disputes"),
     path("disputes/create/", views.DisputeCreateView.as_view(), name="dispute-create"),
+    path("disputes/claim/", views.DisputeClaimView.as_view(), name="dispute-claim"),
+    path(
+        "disputes/analytics/",
+        views.DisputeAnalyticsView.as_view(),
+        name="dispute-analytics",
+    ),
+    path(
+        "disputes/resolve/",
+        views.DisputeBulkResolveView.as_view(),
+        name="dispute-bulk-resolve",
+    ),
     path(
         "disputes/<int:pk>/", views.DisputeDetailView.as_view(), name="dispute-detail"
     ),
@@ -33,4 +81,29 @@ urlpatterns = [
     path(
         "evidence/submit/", views.EvidenceCreateView.as_view(), name="evidence-submit"
     ),
+    path(
+        "evidence/<int:pk>/download/",
+        views.EvidenceDownloadView.as_view(),
+        name="evidence-download",
+    ),
+    path(
+        "evidence/uploads/",
+        views.EvidenceUploadCreateView.as_view(),
+        name="evidence-upload-create",
+    ),
+    path(
+        "evidence/direct-uploads/",
+        views.EvidenceDirectUploadCreateView.as_view(),
+        name="evidence-direct-upload-create",
+    ),
+    path(
+        "evidence/uploads/<uuid:pk>/",
+        views.EvidenceUploadDetailView.as_view(),
+        name="evidence-upload-detail",
+    ),
+    path(
+        "evidence/uploads/<uuid:pk>/complete/",
+        views.EvidenceUploadCompleteView.as_view(),
+        name="evidence-upload-complete",
+    ),
 ]
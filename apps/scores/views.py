@@ -1,40 +1,72 @@
+import mimetypes
+import os
+
+from django.conf import settings
 from rest_framework import generics, status
 from rest_framework.parsers import FormParser, MultiPartParser
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.accounts.permissions import (
     CanResolveDispute,
     CanSubmitScore,
+    IsOrganizer,
     IsOrganizerOrReferee,
+    IsReferee,
 )
 from core.exceptions import (
     DisputeError,
     InvalidStateError,
     NotFoundError,
     PermissionDeniedError,
+    ScoreConflictError,
+    UploadOffsetError,
     ValidationError,
 )
+from core.http import send_file
 
-from .models import Dispute, Evidence, Score
+from .idempotency import idempotent
+from .models import Evidence, Score
 from .serializers import (
+    DisputeAnalyticsQuerySerializer,
+    DisputeBulkResolveSerializer,
     DisputeCreateSerializer,
     DisputeResolveSerializer,
     DisputeSerializer,
     EvidenceCreateSerializer,
+    EvidenceDirectUploadSerializer,
     EvidenceSerializer,
+    EvidenceUploadCompleteSerializer,
+    EvidenceUploadCreateSerializer,
+    EvidenceUploadSerializer,
+    LivePointsSerializer,
+    MatchFeedSerializer,
     ScoreListSerializer,
+    ScoreRevisionSerializer,
     ScoreSerializer,
     ScoreSubmitSerializer,
     ScoreUpdateSerializer,
 )
-from .services import DisputeService, ScoreService
+from .services import (
+    DisputeAnalyticsService,
+    DisputeService,
+    EvidenceUploadService,
+    FeedService,
+    LiveScoringService,
+    ScoreService,
+)
+from .throttling import WriteIPThrottle, WriteUserThrottle, get_throttle_metrics
+
+WRITE_THROTTLES = [WriteUserThrottle, WriteIPThrottle]
 
 
 class ScoreSubmitView(APIView):
     permission_classes = [CanSubmitScore]
+    throttle_classes = WRITE_THROTTLES
+    throttle_scope = "score_writes"
 
+    @idempotent
     def post(self, request):
         serializer = ScoreSubmitSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -46,6 +78,11 @@ class ScoreSubmitView(APIView):
                 request.user,
             )
             return Response(ScoreSerializer(score).data, status=status.HTTP_201_CREATED)
+        except ScoreConflictError as e:
+            return Response(
+                {"error": str(e), "score": ScoreSerializer(e.score).data},
+                status=status.HTTP_409_CONFLICT,
+            )
         except (
             ValidationError,
             PermissionDeniedError,
@@ -58,6 +95,13 @@ class ScoreSubmitView(APIView):
 class ScoreDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Score.objects.all()
     permission_classes = [IsAuthenticated]
+    throttle_classes = WRITE_THROTTLES
+    throttle_scope = "score_writes"
+
+    def get_throttles(self):
+        if self.request.method in ("PUT", "PATCH"):
+            return super().get_throttles()
+        return []
 
     def get_serializer_class(self):
         if self.request.method in ("PUT", "PATCH"):
@@ -73,6 +117,11 @@ class ScoreDetailView(generics.RetrieveUpdateDestroyAPIView):
                 self.kwargs["pk"], serializer.validated_data["set_scores"], request.user
             )
             return Response(ScoreSerializer(score).data)
+        except ScoreConflictError as e:
+            return Response(
+                {"error": str(e), "score": ScoreSerializer(e.score).data},
+                status=status.HTTP_409_CONFLICT,
+            )
         except (
             ValidationError,
             PermissionDeniedError,
@@ -92,6 +141,7 @@ class ScoreDetailView(generics.RetrieveUpdateDestroyAPIView):
 class ScoreConfirmView(APIView):
     permission_classes = [CanSubmitScore]
 
+    @idempotent
     def post(self, request, pk):
         try:
             score = ScoreService.confirm_score(pk, request.user)
@@ -113,9 +163,172 @@ class MatchScoresView(generics.ListAPIView):
         return ScoreService.get_match_scores(self.kwargs["match_id"])
 
 
+class ScoreRevisionListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            revisions = ScoreService.get_score_revisions(pk)
+            return Response(ScoreRevisionSerializer(revisions, many=True).data)
+        except NotFoundError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+
+class ScoreRevisionDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, revision):
+        try:
+            revision = ScoreService.get_score_revision(pk, revision)
+            return Response(ScoreRevisionSerializer(revision).data)
+        except NotFoundError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+
+class MatchScoreHistoryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, match_id):
+        revisions = ScoreService.get_match_history(match_id)
+        return Response(ScoreRevisionSerializer(revisions, many=True).data)
+
+
+class LiveScoreView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, match_id):
+        try:
+            session = LiveScoringService.get_live_state(match_id)
+            return Response(session.to_dict())
+        except NotFoundError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+
+class LivePointsView(APIView):
+    permission_classes = [IsReferee]
+
+    def post(self, request, match_id):
+        serializer = LivePointsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            session = LiveScoringService.record_points(
+                match_id,
+                serializer.validated_data["points"],
+                request.user,
+                serializer.validated_data.get("sequence"),
+            )
+            return Response(session.to_dict())
+        except (
+            ValidationError,
+            PermissionDeniedError,
+            NotFoundError,
+            InvalidStateError,
+        ) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class LiveFeedView(APIView):
+    permission_classes = [AllowAny]
+    etag_prefix = None
+
+    def get_version(self, pk):
+        raise NotImplementedError
+
+    def get_changes(self, pk, since):
+        raise NotImplementedError
+
+    def make_etag(self, pk, version):
+        return f'"{self.etag_prefix}{pk}-v{version}"'
+
+    def get_since(self, request, pk):
+        since = request.query_params.get("since")
+        if since is None:
+            etag = request.headers.get("If-None-Match", "").removeprefix("W/")
+            prefix = f'"{self.etag_prefix}{pk}-v'
+            if not (etag.startswith(prefix) and etag.endswith('"')):
+                return None
+            since = etag[len(prefix) : -1]
+        try:
+            return max(int(since), 0)
+        except ValueError:
+            return None
+
+    def get_wait(self, request):
+        try:
+            wait = float(request.query_params.get("wait", 0))
+        except ValueError:
+            wait = 0
+        return min(max(wait, 0), settings.LIVE_FEED_MAX_WAIT)
+
+    def get(self, request, pk):
+        since = self.get_since(request, pk)
+        # Clients poll again after this many seconds. Waiting is capped by
+        # LIVE_FEED_MAX_WAIT, which is 0 unless a deployment turns it on.
+        headers = {"Retry-After": str(settings.LIVE_FEED_POLL_INTERVAL)}
+        try:
+            version = self.get_version(pk)
+            wait = self.get_wait(request)
+            if since is not None and version <= since and wait:
+                version = FeedService.wait_for_change(
+                    lambda: self.get_version(pk), since, wait
+                )
+            headers["ETag"] = self.make_etag(pk, version)
+            if since is not None and version <= since:
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            data = self.get_changes(pk, since)
+        except NotFoundError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+        data["version"] = version
+        return Response(data, headers={**headers, "Cache-Control": "no-cache"})
+
+
+class MatchFeedView(LiveFeedView):
+    etag_prefix = "m"
+
+    def get_version(self, pk):
+        return FeedService.get_match_version(pk)
+
+    def get_changes(self, pk, since):
+        match, live_state = FeedService.get_match_changes(pk)
+        return {"match": MatchFeedSerializer(match).data, "live": live_state}
+
+
+class TournamentFeedView(LiveFeedView):
+    etag_prefix = "t"
+
+    def get_version(self, pk):
+        return FeedService.get_tournament_version(pk)
+
+    def get_changes(self, pk, since):
+        matches = FeedService.get_tournament_changes(pk, since)
+        return {"matches": MatchFeedSerializer(matches, many=True).data}
+
+
+class TournamentBracketView(LiveFeedView):
+    etag_prefix = "b"
+
+    def get_version(self, pk):
+        return FeedService.get_tournament_version(pk)
+
+    def get_changes(self, pk, since):
+        return FeedService.get_bracket(pk)
+
+
+class ThrottleMetricsView(APIView):
+    permission_classes = [IsOrganizer]
+
+    def get(self, request):
+        return Response(get_throttle_metrics())
+
+
 class DisputeCreateView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_classes = WRITE_THROTTLES
+    throttle_scope = "dispute_writes"
 
+    @idempotent
     def post(self, request):
         serializer = DisputeCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -143,29 +356,18 @@ class DisputeListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = Dispute.objects.all()
-
-        status_filter = self.request.query_params.get("status")
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-
-        if user.is_player:
-            from django.db.models import Q
-
-            queryset = queryset.filter(Q(match__player1=user) | Q(match__player2=user))
-
-        elif user.is_referee:
-            queryset = queryset.filter(match__referee=user)
-
-        return queryset
+        return DisputeService.get_user_disputes(
+            self.request.user, self.request.query_params.get("status")
+        )
 
 
 class DisputeDetailView(generics.RetrieveAPIView):
-    queryset = Dispute.objects.all()
     serializer_class = DisputeSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        return DisputeService.get_disputes()
+
 
 class DisputeResolveView(APIView):
     permission_classes = [CanResolveDispute]
@@ -197,6 +399,52 @@ class DisputeResolveView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class DisputeBulkResolveView(APIView):
+    permission_classes = [IsOrganizer]
+
+    def post(self, request):
+        serializer = DisputeBulkResolveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            resolved = DisputeService.resolve_disputes(
+                serializer.validated_data["resolutions"], request.user
+            )
+        except (
+            ValidationError,
+            PermissionDeniedError,
+            NotFoundError,
+            InvalidStateError,
+        ) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        disputes = DisputeService.get_disputes().filter(
+            id__in=[dispute.id for dispute in resolved]
+        )
+        return Response(
+            {
+                "message": f"{len(resolved)} disputes resolved.",
+                "disputes": DisputeSerializer(disputes, many=True).data,
+            }
+        )
+
+
+class DisputeAnalyticsView(APIView):
+    permission_classes = [IsOrganizer]
+
+    def get(self, request):
+        serializer = DisputeAnalyticsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(
+            DisputeAnalyticsService.get_analytics(
+                tournament_id=serializer.validated_data.get("tournament"),
+                since=serializer.validated_data.get("since"),
+                until=serializer.validated_data.get("until"),
+            )
+        )
+
+
 class DisputeReviewView(APIView):
     permission_classes = [CanResolveDispute]
 
@@ -209,12 +457,26 @@ class DisputeReviewView(APIView):
                     "dispute": DisputeSerializer(dispute).data,
                 }
             )
-        except (PermissionDeniedError, NotFoundError) as e:
+        except DisputeError as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+        except (PermissionDeniedError, NotFoundError, InvalidStateError) as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class DisputeClaimView(APIView):
+    permission_classes = [CanResolveDispute]
+
+    def post(self, request):
+        dispute = DisputeService.claim_next_dispute(request.user)
+        if dispute is None:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(DisputeSerializer(dispute).data)
+
+
 class EvidenceCreateView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_classes = WRITE_THROTTLES
+    throttle_scope = "dispute_writes"
     parser_classes = [MultiPartParser, FormParser]
 
     def post(self, request):
@@ -240,6 +502,223 @@ class EvidenceCreateView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class EvidenceUploadCreateView(APIView):
+    permission_classes = [IsAuthenticated]
+    throttle_classes = WRITE_THROTTLES
+    throttle_scope = "dispute_writes"
+
+    def post(self, request):
+        serializer = EvidenceUploadCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            upload = EvidenceUploadService.create_upload(
+                serializer.validated_data["dispute"].id,
+                serializer.validated_data["filename"],
+                serializer.validated_data["size"],
+                serializer.validated_data["description"],
+                request.user,
+                serializer.validated_data.get("sha256"),
+            )
+            return Response(
+                EvidenceUploadSerializer(upload).data,
+                status=status.HTTP_201_CREATED,
+                headers={
+                    "Location": request.build_absolute_uri(f"{upload.id}/"),
+                    "Upload-Offset": upload.offset,
+                },
+            )
+        except (
+            ValidationError,
+            PermissionDeniedError,
+            NotFoundError,
+            InvalidStateError,
+        ) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class EvidenceDirectUploadCreateView(APIView):
+    """
+    Start an upload that goes straight to the evidence bucket. The response
+    carries a presigned URL; once the client has PUT the file there it calls
+    the upload's complete endpoint to create the evidence.
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_classes = WRITE_THROTTLES
+    throttle_scope = "dispute_writes"
+
+    def post(self, request):
+        serializer = EvidenceDirectUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            upload = EvidenceUploadService.create_upload(
+                data["dispute"].id,
+                data["filename"],
+                data["size"],
+                data["description"],
+                request.user,
+                data["sha256"],
+                direct=True,
+            )
+        except (
+            ValidationError,
+            PermissionDeniedError,
+            NotFoundError,
+            InvalidStateError,
+        ) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = EvidenceUploadSerializer(upload).data
+        response["upload_url"] = response["upload_headers"] = None
+        if not upload.is_complete:
+            content_type = (
+                data.get("content_type")
+                or mimetypes.guess_type(upload.filename)[0]
+                or "application/octet-stream"
+            )
+            url, headers = EvidenceUploadService.presign_upload(upload, content_type)
+            response["upload_url"] = url
+            response["upload_headers"] = headers
+
+        return Response(response, status=status.HTTP_201_CREATED)
+
+
+class EvidenceUploadDetailView(APIView):
+    """
+    GET/HEAD report how many bytes the server has. PATCH appends a chunk sent
+    as the raw request body at the Upload-Offset header; the body is streamed
+    to disk, never parsed or buffered.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            upload = EvidenceUploadService.get_upload(pk, request.user)
+        except (PermissionDeniedError, NotFoundError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(
+            EvidenceUploadSerializer(upload).data,
+            headers={
+                "Upload-Offset": upload.offset,
+                "Upload-Length": upload.size,
+                "Cache-Control": "no-store",
+            },
+        )
+
+    def patch(self, request, pk):
+        try:
+            offset = int(request.headers["Upload-Offset"])
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "Upload-Offset header is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        checksum = None
+        if "Upload-Checksum" in request.headers:
+            algorithm, _, checksum = request.headers["Upload-Checksum"].partition(" ")
+            if algorithm.lower() != "sha256":
+                return Response(
+                    {"error": "Only sha256 chunk checksums are supported."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        try:
+            upload = EvidenceUploadService.append_chunk(
+                pk, offset, request.stream, request.user, checksum
+            )
+            return Response(
+                status=status.HTTP_204_NO_CONTENT,
+                headers={"Upload-Offset": upload.offset},
+            )
+        except UploadOffsetError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_409_CONFLICT,
+                headers={"Upload-Offset": e.offset},
+            )
+        except (PermissionDeniedError, NotFoundError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except (ValidationError, InvalidStateError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class EvidenceUploadCompleteView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        serializer = EvidenceUploadCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            evidence = EvidenceUploadService.complete_upload(
+                pk, request.user, serializer.validated_data.get("sha256")
+            )
+            return Response(
+                EvidenceSerializer(evidence).data, status=status.HTTP_201_CREATED
+            )
+        except (PermissionDeniedError, NotFoundError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except (ValidationError, InvalidStateError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class EvidenceDownloadView(APIView):
+    permission_classes = [IsAuthenticated]
+    renditions = ("thumbnail", "preview")
+
+    def get(self, request, pk):
+        rendition = request.query_params.get("rendition")
+        if rendition is not None and rendition not in self.renditions:
+            return Response(
+                {"error": "Unknown rendition."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            evidence = DisputeService.get_evidence_for_download(pk, request.user)
+        except NotFoundError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except PermissionDeniedError as e:
+            return Response({"error": str(e)}, status=status.HTTP_403_FORBIDDEN)
+
+        field_file = evidence.file
+        if rendition:
+            field_file = getattr(evidence.blob, rendition, None)
+            if not field_file:
+                return Response(
+                    {"error": f"This evidence has no {rendition}."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+        filename = os.path.basename(field_file.name)
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+        # Blob content never changes under its hash, so clients may keep it.
+        if evidence.blob:
+            etag = evidence.blob.sha256
+            if rendition:
+                etag = f"{etag}-{rendition}"
+            cache_control = "private, max-age=31536000, immutable"
+        else:
+            etag = f"evidence-{evidence.id}-{int(evidence.updated_at.timestamp())}"
+            cache_control = "private, no-cache"
+
+        return send_file(
+            request,
+            field_file,
+            etag=etag,
+            last_modified=evidence.updated_at,
+            content_type=content_type,
+            filename=filename,
+            cache_control=cache_control,
+        )
+
+
 class DisputeEvidenceView(generics.ListAPIView):
     serializer_class = EvidenceSerializer
     permission_classes = [IsAuthenticated]
@@ -4,7 +4,7 @@ from django.shortcuts import get_object_or_404, redirect, render
 
 from apps.tournaments.models import Match
 
-from .models import Dispute, Evidence, Score
+from .models import Dispute, Score
 from .services import DisputeService, ScoreService
 
 
@@ -58,12 +58,11 @@ def score_confirm(request, pk):
 @login_required
 def dispute_list(request):
     user = request.user
-    if user.role == "ORGANIZER":
-        disputes = Dispute.objects.all()
-    elif user.role == "REFEREE":
-        disputes = Dispute.objects.filter(match__referee=user)
-    else:
-        disputes = Dispute.objects.filter(raised_by=user)
+    disputes = DisputeService.get_disputes()
+    if user.role == "REFEREE":
+        disputes = disputes.filter(match__referee=user)
+    elif user.role != "ORGANIZER":
+        disputes = disputes.filter(raised_by=user)
 
     status = request.GET.get("status")
     if status:
@@ -73,8 +72,9 @@ def dispute_list(request):
 
 
 def dispute_detail(request, pk):
-    dispute = get_object_or_404(Dispute, pk=pk)
-    evidence = Evidence.objects.filter(dispute=dispute)
+    dispute = get_object_or_404(DisputeService.get_disputes(), pk=pk)
+    evidence = DisputeService.get_dispute_evidence(dispute.id)
+    score_history = ScoreService.get_match_history(dispute.match_id)
 
     return render(
         request,
@@ -82,6 +82,7 @@ def dispute_detail(request, pk):
         {
             "dispute": dispute,
             "evidence": evidence,
+            "score_history": score_history,
         },
     )
 
@@ -148,7 +149,7 @@ def evidence_add(request, dispute_id):
             description = request.POST.get("description")
             file = request.FILES.get("file")
 
-            DisputeService.add_evidence(dispute, request.user, file, description)
+            DisputeService.add_evidence(dispute.id, file, description, request.user)
             messages.success(request, "Evidence added!")
         except Exception as e:
             messages.error(request, str(e))
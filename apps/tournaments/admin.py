@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Match, Tournament
+from .models import Match, RefereeAvailability, Tournament
+from .services import TournamentService
 
 
 @admin.register(Tournament)
@@ -18,6 +19,9 @@ class TournamentAdmin(admin.ModelAdmin):
     date_hierarchy = "start_date"
     filter_horizontal = ["players", "referees"]
 
+    def get_queryset(self, request):
+        return TournamentService.get_tournaments()
+
 
 @admin.register(Match)
 class MatchAdmin(admin.ModelAdmin):
@@ -33,3 +37,10 @@ class MatchAdmin(admin.ModelAdmin):
     list_filter = ["status", "round", "tournament"]
     search_fields = ["tournament__name", "player1__username", "player2__username"]
     raw_id_fields = ["tournament", "player1", "player2", "referee", "winner"]
+
+
+@admin.register(RefereeAvailability)
+class RefereeAvailabilityAdmin(admin.ModelAdmin):
+    list_display = ["referee", "tournament", "start", "end"]
+    list_filter = ["tournament"]
+    raw_id_fields = ["tournament", "referee"]
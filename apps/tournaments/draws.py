@@ -0,0 +1,100 @@
+from .models import Match
+
+MAX_DRAW_SIZE = 128
+
+# First round of a draw with this many slots.
+ROUND_BY_SIZE = {
+    128: Match.Round.ROUND_128,
+    64: Match.Round.ROUND_64,
+    32: Match.Round.ROUND_32,
+    16: Match.Round.ROUND_16,
+    8: Match.Round.QUARTERFINAL,
+    4: Match.Round.SEMIFINAL,
+    2: Match.Round.FINAL,
+}
+
+NEXT_ROUND = {
+    Match.Round.ROUND_128: Match.Round.ROUND_64,
+    Match.Round.ROUND_64: Match.Round.ROUND_32,
+    Match.Round.ROUND_32: Match.Round.ROUND_16,
+    Match.Round.ROUND_16: Match.Round.QUARTERFINAL,
+    Match.Round.QUARTERFINAL: Match.Round.SEMIFINAL,
+    Match.Round.SEMIFINAL: Match.Round.FINAL,
+}
+
+
+def draw_size(player_count):
+    size = 2
+    while size < player_count:
+        size *= 2
+    return size
+
+
+def seed_positions(size):
+    """
+    Seed numbers in bracket order, e.g. ``[1, 8, 4, 5, 2, 7, 3, 6]`` for 8.
+    Seed ``k`` meets seed ``size + 1 - k`` in the first round, so the top
+    seeds can only meet in later rounds and byes go to the top seeds.
+    """
+    seeds = [1]
+    while len(seeds) < size:
+        total = len(seeds) * 2 + 1
+        seeds = [seed for top in seeds for seed in (top, total - top)]
+    return seeds
+
+
+def build_draw(tournament, players):
+    """
+    Build unsaved matches for every round from players in seed order.
+    First round pairs with a bye are left out and the seeded player goes
+    straight into the second round.
+    """
+    size = draw_size(len(players))
+    slots = [
+        players[seed - 1] if seed <= len(players) else None
+        for seed in seed_positions(size)
+    ]
+
+    matches = []
+    first_round = True
+    while len(slots) > 1:
+        advancing = []
+        for position in range(1, len(slots) // 2 + 1):
+            player1, player2 = slots[2 * position - 2], slots[2 * position - 1]
+            if first_round and (player1 is None or player2 is None):
+                advancing.append(player1 or player2)
+                continue
+
+            matches.append(
+                Match(
+                    tournament=tournament,
+                    player1=player1,
+                    player2=player2,
+                    round=ROUND_BY_SIZE[len(slots)],
+                    bracket_position=position,
+                )
+            )
+            advancing.append(None)
+        slots = advancing
+        first_round = False
+
+    return matches
+
+
+def link_matches(matches):
+    """
+    Point every saved match at the match its winner plays next: position
+    ``p`` feeds position ``(p + 1) // 2`` of the next round, odd positions
+    into the ``player1`` slot and even positions into ``player2``.
+    """
+    by_position = {(match.round, match.bracket_position): match for match in matches}
+    linked = []
+    for match in matches:
+        next_round = NEXT_ROUND.get(match.round)
+        parent = by_position.get((next_round, (match.bracket_position + 1) // 2))
+        if parent is None:
+            continue
+        match.next_match = parent
+        match.next_slot = 1 if match.bracket_position % 2 else 2
+        linked.append(match)
+    return linked
@@ -0,0 +1,90 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.accounts.models import User
+from apps.tournaments import draws, scheduling
+from apps.tournaments.models import Tournament
+
+DRAW_SIZES = [8, 12, 16, 24, 32, 48, 64, 96, 128]
+
+
+def synthetic_event(match_count, referee_count, slot_count, rng):
+    """
+    Unsaved brackets of mixed sizes adding up to ``match_count`` matches,
+    like several draws played over one weekend, and referees who each miss
+    a random block of slots.
+    """
+    matches, next_id, next_player = [], 1, 1
+    tournament = Tournament(id=1)
+    remaining = match_count
+    while remaining:
+        size = min(rng.choice(DRAW_SIZES), remaining + 1)
+        players = [User(id=next_player + i) for i in range(size)]
+        next_player += size
+
+        draw = draws.build_draw(tournament, players)
+        for match in draw:
+            match.id = next_id
+            next_id += 1
+        draws.link_matches(draw)
+        matches.extend(draw)
+        remaining -= len(draw)
+
+    referees = list(range(1, referee_count + 1))
+    availability = {}
+    for referee in referees:
+        gap = rng.randrange(slot_count // 4 + 1)
+        start = rng.randrange(slot_count - gap + 1)
+        availability[referee] = set(range(slot_count)) - set(range(start, start + gap))
+    return matches, referees, availability
+
+
+class Command(BaseCommand):
+    help = (
+        "Schedule synthetic events in memory and report makespan and solve "
+        "time for the greedy pass and after local search."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=5)
+        parser.add_argument("--matches", type=int, default=256)
+        parser.add_argument("--courts", type=int, default=16)
+        parser.add_argument("--referees", type=int, default=20)
+        parser.add_argument("--slots", type=int, default=32)
+        parser.add_argument("--rest", type=int, default=1)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        courts = [f"Court {i}" for i in range(1, options["courts"] + 1)]
+
+        for event in range(1, options["events"] + 1):
+            matches, referees, availability = synthetic_event(
+                options["matches"], options["referees"], options["slots"], rng
+            )
+            scheduler = scheduling.Scheduler(
+                matches,
+                courts,
+                referees,
+                options["slots"],
+                rest=options["rest"],
+                availability=availability,
+            )
+
+            started = time.perf_counter()
+            assignments = scheduler.solve()
+            elapsed = time.perf_counter() - started
+
+            problems = scheduling.check_schedule(
+                matches, assignments, options["rest"], availability
+            )
+            self.stdout.write(
+                f"event {event}: {len(matches)} matches, "
+                f"greedy {scheduler.greedy_makespan} slots, "
+                f"final {scheduler.makespan} slots, "
+                f"{elapsed:.2f}s, {len(problems)} problems"
+            )
+            for problem in problems:
+                self.stdout.write(self.style.ERROR(f"  {problem}"))
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tournaments", "0003_stale_match_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="match",
+            name="bracket_position",
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="match",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("bracket_position__isnull", False)),
+                fields=("tournament", "round", "bracket_position"),
+                name="unique_bracket_position",
+            ),
+        ),
+    ]
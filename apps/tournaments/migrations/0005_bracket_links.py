@@ -0,0 +1,65 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+NEXT_ROUND = {
+    "R128": "R64",
+    "R64": "R32",
+    "R32": "R16",
+    "R16": "QF",
+    "QF": "SF",
+    "SF": "F",
+}
+
+
+def link_drawn_matches(apps, schema_editor):
+    """
+    Link matches created by the draw generator to the match their winner
+    plays next.
+    """
+    Match = apps.get_model("tournaments", "Match")
+
+    matches = list(Match.objects.filter(bracket_position__isnull=False))
+    by_position = {(m.tournament_id, m.round, m.bracket_position): m for m in matches}
+    linked = []
+    for match in matches:
+        parent = by_position.get(
+            (
+                match.tournament_id,
+                NEXT_ROUND.get(match.round),
+                (match.bracket_position + 1) // 2,
+            )
+        )
+        if parent is not None:
+            match.next_match = parent
+            match.next_slot = 1 if match.bracket_position % 2 else 2
+            linked.append(match)
+    Match.objects.bulk_update(linked, ["next_match", "next_slot"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tournaments", "0004_bracket_position"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="match",
+            name="next_match",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="feeder_matches",
+                to="tournaments.match",
+            ),
+        ),
+        migrations.AddField(
+            model_name="match",
+            name="next_slot",
+            field=models.PositiveSmallIntegerField(
+                blank=True, choices=[(1, "Player 1"), (2, "Player 2")], null=True
+            ),
+        ),
+        migrations.RunPython(link_drawn_matches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+import core.db
+
+
+def fill_scheduled_end(apps, schema_editor):
+    Match = apps.get_model("tournaments", "Match")
+    Match.objects.filter(scheduled_time__isnull=False).update(
+        scheduled_end=models.F("scheduled_time")
+        + timedelta(minutes=settings.MATCH_DURATION_MINUTES)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tournaments", "0006_referee_availability"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="match",
+            name="scheduled_end",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_scheduled_end, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="match",
+            index=django.contrib.postgres.indexes.GistIndex(
+                core.db.TsTzRange("scheduled_time", "scheduled_end"),
+                condition=models.Q(("scheduled_time__isnull", False)),
+                name="matches_booking_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="match",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("scheduled_end__isnull", True),
+                    ("scheduled_end__gt", models.F("scheduled_time")),
+                    _connector="OR",
+                ),
+                name="match_end_after_start",
+            ),
+        ),
+    ]
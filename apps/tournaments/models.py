@@ -1,8 +1,25 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchVector
 from django.db import models
 
+from core.db import TsTzRange
 from core.mixins import TimestampMixin
 
+SEARCH_CONFIG = "english"
+
+
+def tournament_search_vector():
+    """
+    Weighted full-text vector over name, location and description. Queries
+    must build the vector here to match ``tournaments_search_idx``.
+    """
+    return (
+        SearchVector("name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("location", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="C", config=SEARCH_CONFIG)
+    )
+
 
 class Tournament(TimestampMixin):
     class Status(models.TextChoices):
@@ -40,16 +57,23 @@ class Tournament(TimestampMixin):
         blank=True,
         limit_choices_to={"role": "REFEREE"},
     )
+    feed_version = models.PositiveIntegerField(default=0)
 
     class Meta:
         db_table = "tournaments"
         ordering = ["-start_date"]
+        indexes = [
+            GinIndex(tournament_search_vector(), name="tournaments_search_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
     @property
     def player_count(self):
+        # Set on tournaments loaded through TournamentService.get_tournaments().
+        if hasattr(self, "player_total"):
+            return self.player_total
         return self.players.count()
 
     @property
@@ -99,6 +123,7 @@ class Match(TimestampMixin):
         related_name="refereed_matches",
     )
     scheduled_time = models.DateTimeField(null=True, blank=True)
+    scheduled_end = models.DateTimeField(null=True, blank=True)
     court = models.CharField(max_length=50, blank=True)
     round = models.CharField(
         max_length=10, choices=Round.choices, default=Round.ROUND_32
@@ -113,11 +138,48 @@ class Match(TimestampMixin):
         blank=True,
         related_name="won_matches",
     )
+    version = models.PositiveIntegerField(default=0)
+    bracket_position = models.PositiveSmallIntegerField(null=True, blank=True)
+    next_match = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="feeder_matches",
+    )
+    next_slot = models.PositiveSmallIntegerField(
+        choices=[(1, "Player 1"), (2, "Player 2")], null=True, blank=True
+    )
 
     class Meta:
         db_table = "matches"
         ordering = ["scheduled_time"]
         verbose_name_plural = "matches"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tournament", "round", "bracket_position"],
+                condition=models.Q(bracket_position__isnull=False),
+                name="unique_bracket_position",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(scheduled_end__isnull=True)
+                | models.Q(scheduled_end__gt=models.F("scheduled_time")),
+                name="match_end_after_start",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["tournament", "version"]),
+            models.Index(
+                fields=["status", "updated_at"],
+                condition=models.Q(status="IN_PROGRESS"),
+                name="matches_in_progress_idx",
+            ),
+            GistIndex(
+                TsTzRange("scheduled_time", "scheduled_end"),
+                condition=models.Q(scheduled_time__isnull=False),
+                name="matches_booking_idx",
+            ),
+        ]
 
     def __str__(self):
         p1 = self.player1.username if self.player1 else "TBD"
@@ -130,3 +192,30 @@ class Match(TimestampMixin):
 
     def is_player_in_match(self, user):
         return user in (self.player1, self.player2)
+
+
+class RefereeAvailability(TimestampMixin):
+    tournament = models.ForeignKey(
+        Tournament, on_delete=models.CASCADE, related_name="referee_availability"
+    )
+    referee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="availability",
+    )
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+
+    class Meta:
+        db_table = "referee_availability"
+        ordering = ["start"]
+        verbose_name_plural = "referee availability"
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(end__gt=models.F("start")),
+                name="availability_end_after_start",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.referee.username}: {self.start:%Y-%m-%d %H:%M}-{self.end:%H:%M}"
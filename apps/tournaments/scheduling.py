@@ -0,0 +1,307 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
+
+from core.exceptions import ValidationError
+
+from .models import Match
+
+ROUND_ORDER = {value: order for order, value in enumerate(Match.Round.values)}
+
+
+def slot_times(start, until, length, day_end):
+    """
+    Start times of every slot from ``start`` to the last day, ``until``.
+    Each day runs from the time of day of ``start`` to ``day_end``.
+    """
+    times = []
+    day = start
+    while day.date() <= until:
+        close = datetime.combine(day.date(), day_end, tzinfo=day.tzinfo)
+        time = day
+        while time + length <= close:
+            times.append(time)
+            time += length
+        day += timedelta(days=1)
+    return times
+
+
+def available_slots(times, length, windows):
+    return {
+        slot
+        for slot, time in enumerate(times)
+        if any(start <= time and time + length <= end for start, end in windows)
+    }
+
+
+def booked_slots(times, length, start, end):
+    """Slots overlapping a booking that runs from ``start`` to ``end``."""
+    return [
+        slot for slot, time in enumerate(times) if time < end and start < time + length
+    ]
+
+
+def find_overlaps(bookings):
+    """
+    Pairs of bookings of the same resource whose ``[start, end)`` ranges
+    overlap. ``bookings`` are ``(resource, start, end, match)`` tuples and
+    each resource is swept once in start order.
+    """
+    overlaps = []
+    bookings = sorted(bookings, key=itemgetter(0, 1))
+    for resource, group in groupby(bookings, key=itemgetter(0)):
+        active = []
+        for _, start, end, match in group:
+            active = [
+                (other_end, other) for other_end, other in active if other_end > start
+            ]
+            overlaps.extend((resource, other, match) for _, other in active)
+            active.append((end, match))
+    return overlaps
+
+
+class Scheduler:
+    """
+    Give every match a slot, a court and a referee.
+
+    A slot is one match length on every court. Each court and referee holds
+    at most one match per slot, referees only work slots they are available
+    for, players get ``rest`` free slots between matches, and a bracket
+    match comes ``rest`` slots after the matches feeding it.
+
+    Matches are first placed greedily, earliest round first, in the
+    earliest slot that fits. The schedule is then improved by alternately
+    pushing every match as late as it can go without growing the schedule
+    and pulling it back as early as possible, which closes the gaps the
+    greedy pass leaves behind.
+
+    ``bookings`` are ``(slots, court, users)`` tuples for matches that
+    already hold their slots. Their court (``None`` for another
+    tournament's court) and users are taken for those slots, and players
+    still need rest around them.
+    """
+
+    def __init__(
+        self,
+        matches,
+        courts,
+        referees,
+        slot_count,
+        rest=0,
+        availability=None,
+        bookings=(),
+    ):
+        self.matches = {match.id: match for match in matches}
+        self.courts = list(courts)
+        self.referees = list(referees)
+        self.slot_count = slot_count
+        self.rest = rest
+        # Referees without an entry can work any slot.
+        self.availability = availability or {}
+
+        self.feeders = defaultdict(list)
+        for match in matches:
+            if match.next_match_id in self.matches:
+                self.feeders[match.next_match_id].append(match.id)
+
+        self.assignments = {}
+        self.courts_used = defaultdict(set)
+        self.referees_used = defaultdict(set)
+        self.referee_load = defaultdict(int)
+        self.player_slots = defaultdict(dict)
+
+        for booking, (slots, court, users) in enumerate(bookings):
+            for slot in slots:
+                if court is not None:
+                    self.courts_used[slot].add(court)
+                for user in users:
+                    self.referees_used[slot].add(user)
+                    # Keyed apart from match ids so unassigning never drops it.
+                    self.player_slots[user][("booking", booking, slot)] = slot
+
+    @staticmethod
+    def _players(match):
+        return [
+            player
+            for player in (match.player1_id, match.player2_id)
+            if player is not None
+        ]
+
+    @property
+    def makespan(self):
+        if not self.assignments:
+            return 0
+        return max(slot for slot, _, _ in self.assignments.values()) + 1
+
+    def _cost(self):
+        return (
+            self.makespan,
+            sum(slot for slot, _, _ in self.assignments.values()),
+        )
+
+    def _assign(self, match, slot, court, referee):
+        self.assignments[match.id] = (slot, court, referee)
+        self.courts_used[slot].add(court)
+        if referee is not None:
+            self.referees_used[slot].add(referee)
+            self.referee_load[referee] += 1
+        for player in self._players(match):
+            self.player_slots[player][match.id] = slot
+
+    def _unassign(self, match):
+        slot, court, referee = self.assignments.pop(match.id)
+        self.courts_used[slot].discard(court)
+        if referee is not None:
+            self.referees_used[slot].discard(referee)
+            self.referee_load[referee] -= 1
+        for player in self._players(match):
+            del self.player_slots[player][match.id]
+        return slot, court, referee
+
+    def _window(self, match, limit):
+        """Slots ``[low, high)`` the bracket links allow for ``match``."""
+        low = 0
+        for feeder in self.feeders[match.id]:
+            if feeder in self.assignments:
+                low = max(low, self.assignments[feeder][0] + 1 + self.rest)
+
+        high = limit
+        if match.next_match_id in self.assignments:
+            high = min(high, self.assignments[match.next_match_id][0] - self.rest)
+        return low, high
+
+    def _rested(self, player, slot):
+        return all(
+            abs(slot - other) > self.rest
+            for other in self.player_slots[player].values()
+        )
+
+    def _referee_for(self, slot):
+        free = [
+            referee
+            for referee in self.referees
+            if referee not in self.referees_used[slot]
+            and (referee not in self.availability or slot in self.availability[referee])
+        ]
+        return min(free, key=lambda referee: self.referee_load[referee], default=None)
+
+    def _place(self, match, slots):
+        players = self._players(match)
+        for slot in slots:
+            court = next(
+                (c for c in self.courts if c not in self.courts_used[slot]), None
+            )
+            if court is None:
+                continue
+            if not all(self._rested(player, slot) for player in players):
+                continue
+            referee = self._referee_for(slot)
+            if referee is None and self.referees:
+                continue
+            return slot, court, referee
+        return None
+
+    def _greedy(self):
+        order = sorted(
+            self.matches.values(),
+            key=lambda m: (ROUND_ORDER.get(m.round, 0), m.bracket_position or 0, m.id),
+        )
+        unplaced = 0
+        for match in order:
+            low, high = self._window(match, self.slot_count)
+            placement = self._place(match, range(low, high))
+            if placement is None:
+                unplaced += 1
+                continue
+            self._assign(match, *placement)
+
+        if unplaced:
+            raise ValidationError(
+                f"Could not fit {unplaced} matches into the available slots."
+            )
+
+    def _justify(self, late):
+        """
+        Move every match in turn to the latest (``late``) or earliest slot
+        it fits, never past the current end of the schedule. Its current
+        slot always fits, so nothing is ever left unplaced.
+        """
+        limit = self.makespan
+        order = sorted(
+            self.assignments, key=lambda match_id: self.assignments[match_id][0]
+        )
+        if late:
+            order.reverse()
+
+        for match_id in order:
+            match = self.matches[match_id]
+            current = self._unassign(match)
+            low, high = self._window(match, limit)
+            slots = range(high - 1, low - 1, -1) if late else range(low, high)
+            self._assign(match, *(self._place(match, slots) or current))
+
+    def _restore(self, assignments):
+        for match_id in list(self.assignments):
+            self._unassign(self.matches[match_id])
+        for match_id, placement in assignments.items():
+            self._assign(self.matches[match_id], *placement)
+
+    def solve(self, max_passes=20):
+        """
+        Return ``{match_id: (slot, court, referee_id)}``. Raises
+        ``ValidationError`` when the matches do not fit.
+        """
+        self._greedy()
+        self.greedy_makespan = self.makespan
+
+        best, best_cost = dict(self.assignments), self._cost()
+        for _ in range(max_passes):
+            self._justify(late=True)
+            self._justify(late=False)
+            cost = self._cost()
+            if cost >= best_cost:
+                break
+            best, best_cost = dict(self.assignments), cost
+
+        self._restore(best)
+        return self.assignments
+
+
+def check_schedule(matches, assignments, rest=0, availability=None):
+    """
+    Return a list of broken constraints, empty for a valid schedule.
+    Used by the benchmark and the tests rather than the solver itself.
+    """
+    availability = availability or {}
+    problems = []
+    courts, referees, players = set(), set(), defaultdict(list)
+    by_id = {match.id: match for match in matches}
+
+    for match in matches:
+        if match.id not in assignments:
+            problems.append(f"match {match.id} is not scheduled")
+            continue
+        slot, court, referee = assignments[match.id]
+        if (slot, court) in courts:
+            problems.append(f"court {court} double-booked in slot {slot}")
+        courts.add((slot, court))
+        if referee is not None:
+            if (slot, referee) in referees:
+                problems.append(f"referee {referee} double-booked in slot {slot}")
+            referees.add((slot, referee))
+            if referee in availability and slot not in availability[referee]:
+                problems.append(f"referee {referee} unavailable in slot {slot}")
+        for player in Scheduler._players(match):
+            players[player].append(slot)
+
+        parent = by_id.get(match.next_match_id)
+        if parent is not None and parent.id in assignments:
+            if assignments[parent.id][0] <= slot + rest:
+                problems.append(f"match {parent.id} starts before its feeders")
+
+    for player, slots in players.items():
+        slots.sort()
+        if any(b - a <= rest for a, b in zip(slots, slots[1:])):
+            problems.append(f"player {player} does not get enough rest")
+    return problems
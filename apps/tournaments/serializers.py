@@ -1,8 +1,10 @@
+from datetime import time
+
 from rest_framework import serializers
 
 from apps.accounts.serializers import UserPublicSerializer
 
-from .models import Match, Tournament
+from .models import Match, RefereeAvailability, Tournament
 
 
 class TournamentSerializer(serializers.ModelSerializer):
@@ -108,8 +110,12 @@ class MatchSerializer(serializers.ModelSerializer):
             "player2",
             "referee",
             "scheduled_time",
+            "scheduled_end",
             "court",
             "round",
+            "bracket_position",
+            "next_match",
+            "next_slot",
             "status",
             "winner",
             "created_at",
@@ -127,10 +133,18 @@ class MatchCreateSerializer(serializers.ModelSerializer):
             "player2",
             "referee",
             "scheduled_time",
+            "scheduled_end",
             "court",
             "round",
         ]
 
+    def validate(self, attrs):
+        if attrs.get("scheduled_end") and not attrs.get("scheduled_time"):
+            raise serializers.ValidationError(
+                {"scheduled_time": "An end time needs a start time."}
+            )
+        return attrs
+
 
 class MatchListSerializer(serializers.ModelSerializer):
     player1_name = serializers.CharField(source="player1.username", read_only=True)
@@ -147,6 +161,7 @@ class MatchListSerializer(serializers.ModelSerializer):
             "scheduled_time",
             "court",
             "round",
+            "bracket_position",
             "status",
         ]
 
@@ -155,6 +170,22 @@ class AddPlayerSerializer(serializers.Serializer):
     player_id = serializers.IntegerField()
 
 
+class BulkAddPlayersSerializer(serializers.Serializer):
+    players = serializers.ListField(
+        child=serializers.CharField(allow_blank=True, trim_whitespace=True),
+        required=False,
+        allow_empty=False,
+    )
+    file = serializers.FileField(required=False)
+
+    def validate(self, attrs):
+        if ("players" in attrs) == ("file" in attrs):
+            raise serializers.ValidationError(
+                "Send either a list of players or a CSV file."
+            )
+        return attrs
+
+
 class AssignRefereeSerializer(serializers.Serializer):
     referee_id = serializers.IntegerField()
 
@@ -167,3 +198,49 @@ class AssignPlayersSerializer(serializers.Serializer):
         if attrs["player1_id"] == attrs["player2_id"]:
             raise serializers.ValidationError("Players must be different.")
         return attrs
+
+
+class RefereeAvailabilitySerializer(serializers.ModelSerializer):
+    referee = UserPublicSerializer(read_only=True)
+
+    class Meta:
+        model = RefereeAvailability
+        fields = ["id", "referee", "start", "end"]
+
+
+class RefereeAvailabilityCreateSerializer(serializers.Serializer):
+    referee_id = serializers.IntegerField(required=False)
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        if attrs["start"] >= attrs["end"]:
+            raise serializers.ValidationError({"end": "End must be after start."})
+        return attrs
+
+
+class ScheduleSerializer(serializers.Serializer):
+    start = serializers.DateTimeField()
+    courts = serializers.ListField(
+        child=serializers.CharField(max_length=50), min_length=1
+    )
+    slot_minutes = serializers.IntegerField(default=90, min_value=15, max_value=480)
+    rest_minutes = serializers.IntegerField(default=60, min_value=0)
+    day_end = serializers.TimeField(default=time(21, 0))
+
+    def validate_courts(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Court names must be unique.")
+        return value
+
+
+class ScheduleEntrySerializer(serializers.Serializer):
+    match = serializers.IntegerField()
+    scheduled_time = serializers.DateTimeField()
+    scheduled_end = serializers.DateTimeField(required=False)
+    court = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    referee = serializers.IntegerField(required=False, allow_null=True)
+
+
+class ScheduleCheckSerializer(serializers.Serializer):
+    matches = ScheduleEntrySerializer(many=True, allow_empty=False)
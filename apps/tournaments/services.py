@@ -1,6 +1,22 @@
-from django.db import transaction
+import csv
+import io
+import math
+import random
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Lower
+from django.utils import timezone
 
 from apps.accounts.models import User
+from apps.accounts.services import AccountService
+from core.db import AnyOf, TsTzRange
 from core.exceptions import (
     InvalidStateError,
     NotFoundError,
@@ -8,10 +24,23 @@ from core.exceptions import (
     ValidationError,
 )
 
-from .models import Match, Tournament
+from . import draws, scheduling
+from .models import (
+    SEARCH_CONFIG,
+    Match,
+    RefereeAvailability,
+    Tournament,
+    tournament_search_vector,
+)
+
+MATCH_VERSION_CACHE_KEY = "feed:match:{}:version"
+TOURNAMENT_VERSION_CACHE_KEY = "feed:tournament:{}:version"
+BRACKET_CACHE_KEY = "feed:tournament:{}:bracket:v{}"
 
 
 class TournamentService:
+    MAX_BULK_PLAYERS = 1000
+
     @staticmethod
     def create_tournament(data, created_by):
         if not created_by.is_organizer:
@@ -80,6 +109,128 @@ class TournamentService:
         tournament.players.add(player)
         return tournament
 
+    @staticmethod
+    def _find_players(identifiers):
+        """
+        Players matching any of the ids, usernames or emails, in one query,
+        keyed by ``(kind, value)``. Every identifier is tried as a username,
+        since usernames may contain ``@`` or be all digits.
+        """
+        ids, usernames, emails = set(), set(), set()
+        for identifier in identifiers:
+            if not identifier:
+                continue
+            usernames.add(identifier)
+            if identifier.isdigit():
+                ids.add(int(identifier))
+            elif "@" in identifier:
+                emails.add(identifier.lower())
+
+        players = User.objects.filter(role=User.Role.PLAYER).annotate(
+            email_lower=Lower("email")
+        )
+        players = players.filter(
+            Q(id__in=ids) | Q(username__in=usernames) | Q(email_lower__in=emails)
+        ).only("id", "username", "email")
+
+        found = {}
+        for player in players:
+            found["id", player.id] = player
+            found["username", player.username] = player
+            if player.email:
+                found["email", player.email.lower()] = player
+        return found
+
+    @staticmethod
+    def _match_player(found, identifier):
+        if not identifier:
+            return None
+        if identifier.isdigit() and ("id", int(identifier)) in found:
+            return found["id", int(identifier)]
+        if ("email", identifier.lower()) in found:
+            return found["email", identifier.lower()]
+        return found.get(("username", identifier))
+
+    @staticmethod
+    @transaction.atomic
+    def register_players(tournament, identifiers, user):
+        """
+        Register many players at once. ``identifiers`` are player ids,
+        usernames or emails, and the result has one entry per identifier
+        saying whether it was added and why not. Players are added in
+        order until the tournament is full.
+        """
+        if not user.is_organizer:
+            raise PermissionDeniedError("Only organizers can add players.")
+
+        if tournament.status not in (
+            Tournament.Status.DRAFT,
+            Tournament.Status.REGISTRATION,
+        ):
+            raise InvalidStateError("Cannot add players after registration closes.")
+
+        if len(identifiers) > TournamentService.MAX_BULK_PLAYERS:
+            raise ValidationError(
+                f"At most {TournamentService.MAX_BULK_PLAYERS} players at a time."
+            )
+
+        # Concurrent registrations wait here, so capacity is checked once.
+        Tournament.objects.select_for_update().only("id").get(id=tournament.id)
+        registered = set(tournament.players.values_list("id", flat=True))
+        found = TournamentService._find_players(identifiers)
+
+        results, added = [], []
+        for row, identifier in enumerate(identifiers, 1):
+            player = TournamentService._match_player(found, identifier)
+            result = {
+                "row": row,
+                "player": identifier,
+                "player_id": player.id if player else None,
+            }
+            if player is None:
+                result["status"] = "not_found"
+            elif player.id in registered:
+                result["status"] = "already_registered"
+            elif player.id in added:
+                result["status"] = "duplicate"
+            elif len(registered) + len(added) >= tournament.max_players:
+                result["status"] = "full"
+            else:
+                result["status"] = "added"
+                added.append(player.id)
+            results.append(result)
+
+        Through = Tournament.players.through
+        Through.objects.bulk_create(
+            [Through(tournament_id=tournament.id, user_id=i) for i in added],
+            ignore_conflicts=True,
+        )
+        return results
+
+    @staticmethod
+    def read_players_csv(file):
+        """
+        Player identifiers from an uploaded CSV. A header naming an ``id``,
+        ``player_id``, ``username`` or ``email`` column picks that column,
+        otherwise the first column is used.
+        """
+        try:
+            text = file.read().decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise ValidationError("CSV file must be UTF-8.")
+
+        rows = [row for row in csv.reader(io.StringIO(text)) if any(row)]
+        column = 0
+        if rows:
+            header = [cell.strip().lower() for cell in rows[0]]
+            for name in ("player_id", "id", "username", "email"):
+                if name in header:
+                    column = header.index(name)
+                    rows = rows[1:]
+                    break
+
+        return [row[column].strip() if len(row) > column else "" for row in rows]
+
     @staticmethod
     def remove_player(tournament, player_id, user):
         if not user.is_organizer:
@@ -108,6 +259,33 @@ class TournamentService:
         tournament.referees.add(referee)
         return tournament
 
+    @staticmethod
+    def add_referee_availability(tournament, data, user):
+        if user.is_organizer:
+            referee_id = data.get("referee_id")
+            if referee_id is None:
+                raise ValidationError("Organizers must give a referee.")
+        elif user.is_referee:
+            referee_id = data.get("referee_id", user.id)
+            if referee_id != user.id:
+                raise PermissionDeniedError(
+                    "Referees can only set their own availability."
+                )
+        else:
+            raise PermissionDeniedError(
+                "Only organizers or referees can set availability."
+            )
+
+        if not tournament.referees.filter(id=referee_id).exists():
+            raise ValidationError("Referee is not part of this tournament.")
+
+        return RefereeAvailability.objects.create(
+            tournament=tournament,
+            referee_id=referee_id,
+            start=data["start"],
+            end=data["end"],
+        )
+
     @staticmethod
     def open_registration(tournament, user):
         if not user.is_organizer:
@@ -144,6 +322,54 @@ class TournamentService:
         tournament.save()
         return tournament
 
+    @staticmethod
+    def get_tournaments():
+        """
+        Tournaments with their creator and an annotated ``player_total``, so
+        lists don't run a COUNT per tournament.
+        """
+        registrations = (
+            Tournament.players.through.objects.filter(tournament_id=OuterRef("pk"))
+            .order_by()
+            .values("tournament_id")
+            .annotate(total=Count("*"))
+            .values("total")
+        )
+        return Tournament.objects.select_related("created_by").annotate(
+            player_total=Coalesce(Subquery(registrations), 0)
+        )
+
+    @staticmethod
+    def search_tournaments(text, queryset=None):
+        """
+        Tournaments whose name, location or description match ``text``, best
+        match first, then tournaments with a registered player of that name.
+        The ids are the UNION of the text matches and the tournaments of
+        matching players, and each lookup can use its own GIN index.
+        """
+        if queryset is None:
+            queryset = TournamentService.get_tournaments()
+        vector = tournament_search_vector()
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+        matching = (
+            Tournament.objects.alias(search=vector)
+            .filter(search=query)
+            .order_by()
+            .values("id")
+        )
+        registered = (
+            Tournament.players.through.objects.filter(
+                user__in=AccountService.search_names(text)
+            )
+            .order_by()
+            .values("tournament_id")
+        )
+        return (
+            queryset.filter(id__in=matching.union(registered))
+            .annotate(rank=SearchRank(vector, query))
+            .order_by("-rank", "-start_date", "id")
+        )
+
     @staticmethod
     def get_tournament_matches(tournament):
         return tournament.matches.all()
@@ -163,6 +389,41 @@ class TournamentService:
 
 class MatchService:
     @staticmethod
+    def search_matches(text, queryset=None):
+        """
+        Matches where either player's name matches ``text``, or that belong
+        to a tournament whose name, location or description does.
+        """
+        if queryset is None:
+            queryset = Match.objects.all()
+        players = ArraySubquery(AccountService.search_names(text).values("id"))
+        tournaments = ArraySubquery(
+            Tournament.objects.alias(search=tournament_search_vector())
+            .filter(
+                search=SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+            )
+            .order_by()
+            .values("id")
+        )
+        return queryset.filter(
+            Q(AnyOf("player1", players))
+            | Q(AnyOf("player2", players))
+            | Q(AnyOf("tournament", tournaments))
+        )
+
+    @staticmethod
+    def _set_schedule(match, scheduled_time, scheduled_end=None):
+        if scheduled_time and not scheduled_end:
+            scheduled_end = scheduled_time + timedelta(
+                minutes=settings.MATCH_DURATION_MINUTES
+            )
+        if scheduled_end and scheduled_end <= scheduled_time:
+            raise ValidationError("Match must end after it starts.")
+        match.scheduled_time = scheduled_time
+        match.scheduled_end = scheduled_end if scheduled_time else None
+
+    @staticmethod
+    @transaction.atomic
     def create_match(data, user):
         if not user.is_organizer:
             raise PermissionDeniedError("Only organizers can create matches.")
@@ -174,18 +435,41 @@ class MatchService:
         ):
             raise InvalidStateError("Cannot create matches for this tournament.")
 
-        match = Match.objects.create(
+        match = Match(
             tournament=tournament,
             player1=data.get("player1"),
             player2=data.get("player2"),
             referee=data.get("referee"),
-            scheduled_time=data.get("scheduled_time"),
             court=data.get("court", ""),
             round=data.get("round", Match.Round.ROUND_32),
         )
+        MatchService._set_schedule(
+            match, data.get("scheduled_time"), data.get("scheduled_end")
+        )
+        ConflictService.check([match])
+        match.save()
+        MatchService.touch(match)
         return match
 
     @staticmethod
+    @transaction.atomic
+    def reschedule_match(match, data, user):
+        if not user.is_organizer:
+            raise PermissionDeniedError("Only organizers can edit matches.")
+
+        match.court = data.get("court", match.court)
+        match.round = data.get("round", match.round)
+        if "scheduled_time" in data:
+            MatchService._set_schedule(
+                match, data["scheduled_time"], data.get("scheduled_end")
+            )
+        ConflictService.check([match])
+        match.save()
+        MatchService.touch(match)
+        return match
+
+    @staticmethod
+    @transaction.atomic
     def assign_players(match, player1_id, player2_id, user):
         if not user.is_organizer:
             raise PermissionDeniedError("Only organizers can assign players.")
@@ -207,10 +491,13 @@ class MatchService:
 
         match.player1 = player1
         match.player2 = player2
+        ConflictService.check([match])
         match.save()
+        MatchService.touch(match)
         return match
 
     @staticmethod
+    @transaction.atomic
     def assign_referee(match, referee_id, user):
         if not user.is_organizer:
             raise PermissionDeniedError("Only organizers can assign referees.")
@@ -221,7 +508,9 @@ class MatchService:
             raise NotFoundError("Referee not found.")
 
         match.referee = referee
+        ConflictService.check([match])
         match.save()
+        MatchService.touch(match)
         return match
 
     @staticmethod
@@ -239,8 +528,81 @@ class MatchService:
 
         match.status = Match.Status.IN_PROGRESS
         match.save()
+        MatchService.touch(match)
         return match
 
+    @staticmethod
+    @transaction.atomic
+    def touch(match):
+        Tournament.objects.filter(id=match.tournament_id).update(
+            feed_version=F("feed_version") + 1
+        )
+        version = Tournament.objects.values_list("feed_version", flat=True).get(
+            id=match.tournament_id
+        )
+        Match.objects.filter(id=match.id).update(version=version)
+        match.version = version
+
+        transaction.on_commit(
+            lambda: cache.set_many(
+                {
+                    MATCH_VERSION_CACHE_KEY.format(match.id): version,
+                    TOURNAMENT_VERSION_CACHE_KEY.format(match.tournament_id): version,
+                },
+                settings.LIVE_FEED_CACHE_TTL,
+            )
+        )
+        return version
+
+    @staticmethod
+    @transaction.atomic
+    def touch_many(matches):
+        """
+        Touch several matches with one version bump per tournament instead of
+        one per match. Each match still gets its own version.
+        """
+        by_tournament = {}
+        for match in matches:
+            by_tournament.setdefault(match.tournament_id, []).append(match)
+
+        versions = {}
+        for tournament_id, tournament_matches in by_tournament.items():
+            Tournament.objects.filter(id=tournament_id).update(
+                feed_version=F("feed_version") + len(tournament_matches)
+            )
+            latest = Tournament.objects.values_list("feed_version", flat=True).get(
+                id=tournament_id
+            )
+            first = latest - len(tournament_matches) + 1
+            for version, match in enumerate(tournament_matches, first):
+                match.version = version
+                versions[MATCH_VERSION_CACHE_KEY.format(match.id)] = version
+            versions[TOURNAMENT_VERSION_CACHE_KEY.format(tournament_id)] = latest
+
+        Match.objects.bulk_update(matches, ["version"])
+
+        transaction.on_commit(
+            lambda: cache.set_many(versions, settings.LIVE_FEED_CACHE_TTL)
+        )
+
+    @staticmethod
+    def advance_winner(match):
+        """
+        Put the winner into their slot of the next bracket match. Only the
+        linked row is written, and only while that match has not started.
+        """
+        if not (match.next_match_id and match.winner_id):
+            return
+
+        slot = "player1" if match.next_slot == 1 else "player2"
+        advanced = Match.objects.filter(
+            id=match.next_match_id, status=Match.Status.SCHEDULED
+        ).update(**{slot: match.winner_id, "updated_at": timezone.now()})
+        if advanced:
+            MatchService.touch(
+                Match(id=match.next_match_id, tournament_id=match.tournament_id)
+            )
+
     @staticmethod
     def get_user_matches(user):
         if user.is_referee:
@@ -258,3 +620,318 @@ class MatchService:
 
 
 from django.db import models
+
+
+class DrawService:
+    @staticmethod
+    def _seeded_players(tournament):
+        """
+        Registered players in seed order: ranked players by global position,
+        then unranked players in random order.
+        """
+        players = list(tournament.players.select_related("global_ranking"))
+        ranked, unranked = [], []
+        for player in players:
+            ranking = getattr(player, "global_ranking", None)
+            if ranking and ranking.position:
+                ranked.append(player)
+            else:
+                unranked.append(player)
+
+        ranked.sort(key=lambda player: player.global_ranking.position)
+        random.shuffle(unranked)
+        return ranked + unranked
+
+    @staticmethod
+    @transaction.atomic
+    def generate_draw(tournament, user):
+        if not user.is_organizer:
+            raise PermissionDeniedError("Only organizers can generate draws.")
+
+        if tournament.status not in (
+            Tournament.Status.REGISTRATION,
+            Tournament.Status.IN_PROGRESS,
+        ):
+            raise InvalidStateError("Cannot generate a draw for this tournament.")
+
+        if tournament.matches.exists():
+            raise InvalidStateError("Tournament already has matches.")
+
+        players = DrawService._seeded_players(tournament)
+        if len(players) < 2:
+            raise ValidationError("A draw needs at least 2 players.")
+        if len(players) > draws.MAX_DRAW_SIZE:
+            raise ValidationError(
+                f"A draw can have at most {draws.MAX_DRAW_SIZE} players."
+            )
+
+        matches = Match.objects.bulk_create(draws.build_draw(tournament, players))
+        Match.objects.bulk_update(
+            draws.link_matches(matches), ["next_match", "next_slot"]
+        )
+        MatchService.touch_many(matches)
+        return matches
+
+
+class ScheduleService:
+    @staticmethod
+    def _availability(tournament, times, length):
+        windows = {}
+        for referee_id, start, end in tournament.referee_availability.values_list(
+            "referee_id", "start", "end"
+        ):
+            windows.setdefault(referee_id, []).append((start, end))
+        return {
+            referee_id: scheduling.available_slots(times, length, referee_windows)
+            for referee_id, referee_windows in windows.items()
+        }
+
+    @staticmethod
+    def _bookings(tournament, matches, referees, times, length):
+        """
+        Slots already taken by other matches: this tournament's started or
+        finished matches, and any other tournament's matches of the same
+        players and referees.
+        """
+        if not times:
+            return []
+        users = set(referees)
+        for match in matches:
+            users.update(scheduling.Scheduler._players(match))
+        booked = (
+            Match.objects.alias(booking=TsTzRange("scheduled_time", "scheduled_end"))
+            .filter(
+                scheduled_time__isnull=False,
+                booking__overlap=(times[0], times[-1] + length),
+            )
+            .filter(
+                Q(tournament=tournament)
+                | Q(player1_id__in=users)
+                | Q(player2_id__in=users)
+                | Q(referee_id__in=users)
+            )
+            .exclude(id__in=[match.id for match in matches])
+            .exclude(status=Match.Status.CANCELLED)
+            .order_by()
+        )
+        return [
+            (
+                scheduling.booked_slots(
+                    times, length, match.scheduled_time, ConflictService._end(match)
+                ),
+                match.court if match.tournament_id == tournament.id else None,
+                {match.player1_id, match.player2_id, match.referee_id} - {None},
+            )
+            for match in booked
+        ]
+
+    @staticmethod
+    @transaction.atomic
+    def schedule_matches(tournament, data, user):
+        """
+        Assign a time, court and referee to every scheduled match of the
+        tournament. Matches already started keep their slot, and courts,
+        players and referees are never given a slot they are booked for.
+        """
+        if not user.is_organizer:
+            raise PermissionDeniedError("Only organizers can schedule matches.")
+
+        if tournament.status not in (
+            Tournament.Status.REGISTRATION,
+            Tournament.Status.IN_PROGRESS,
+        ):
+            raise InvalidStateError("Cannot schedule matches for this tournament.")
+
+        matches = list(
+            tournament.matches.filter(status=Match.Status.SCHEDULED)
+            .select_for_update()
+            .order_by("id")
+        )
+        if not matches:
+            raise ValidationError("No matches to schedule.")
+
+        referees = list(tournament.referees.values_list("id", flat=True))
+        if not referees:
+            raise ValidationError("Tournament has no referees.")
+
+        length = timedelta(minutes=data["slot_minutes"])
+        times = scheduling.slot_times(
+            data["start"], tournament.end_date, length, data["day_end"]
+        )
+        scheduler = scheduling.Scheduler(
+            matches,
+            data["courts"],
+            referees,
+            len(times),
+            rest=math.ceil(data["rest_minutes"] / data["slot_minutes"]),
+            availability=ScheduleService._availability(tournament, times, length),
+            bookings=ScheduleService._bookings(
+                tournament, matches, referees, times, length
+            ),
+        )
+        assignments = scheduler.solve()
+
+        now = timezone.now()
+        for match in matches:
+            slot, court, referee_id = assignments[match.id]
+            match.scheduled_time = times[slot]
+            match.scheduled_end = times[slot] + length
+            match.court = court
+            match.referee_id = referee_id
+            match.updated_at = now
+        ConflictService.check(matches)
+        Match.objects.bulk_update(
+            matches,
+            ["scheduled_time", "scheduled_end", "court", "referee", "updated_at"],
+        )
+        MatchService.touch_many(matches)
+        return matches
+
+
+class ConflictService:
+    # Advisory lock keys for courts live above every user id.
+    COURT_LOCK_BASE = 1 << 40
+
+    @staticmethod
+    def _resources(match):
+        resources = []
+        if match.court:
+            resources.append(("court", match.tournament_id, match.court))
+        for user_id in {match.player1_id, match.player2_id, match.referee_id}:
+            if user_id is not None:
+                resources.append(("user", user_id))
+        return resources
+
+    @staticmethod
+    def _end(match):
+        return match.scheduled_end or match.scheduled_time + timedelta(
+            minutes=settings.MATCH_DURATION_MINUTES
+        )
+
+    @staticmethod
+    def _lock_key(resource):
+        if resource[0] == "user":
+            return resource[1]
+        name = f"{resource[1]}:{resource[2]}".encode()
+        return ConflictService.COURT_LOCK_BASE + zlib.crc32(name)
+
+    @staticmethod
+    def lock(matches):
+        """
+        Take a transaction-level advisory lock per court and participant so
+        two requests can't book the same slot between checking and saving.
+        Keys are sorted to keep lock order stable.
+        """
+        keys = sorted(
+            {
+                ConflictService._lock_key(resource)
+                for match in matches
+                if match.scheduled_time
+                for resource in ConflictService._resources(match)
+            }
+        )
+        if keys:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(key) FROM unnest(%s::bigint[]) key",
+                    [keys],
+                )
+
+    @staticmethod
+    def find_conflicts(matches):
+        """
+        Check proposed matches against each other and against booked ones.
+        Booked matches overlapping the schedule are fetched in one query
+        through the ``matches_booking_idx`` GiST index, then each court and
+        participant is swept for overlaps in memory.
+        """
+        proposed = [
+            match
+            for match in matches
+            if match.scheduled_time and match.status != Match.Status.CANCELLED
+        ]
+        if not proposed:
+            return []
+
+        users = {
+            resource[1]
+            for match in proposed
+            for resource in ConflictService._resources(match)
+            if resource[0] == "user"
+        }
+        booked = (
+            Match.objects.alias(booking=TsTzRange("scheduled_time", "scheduled_end"))
+            .filter(
+                scheduled_time__isnull=False,
+                booking__overlap=(
+                    min(match.scheduled_time for match in proposed),
+                    max(ConflictService._end(match) for match in proposed),
+                ),
+            )
+            .filter(
+                Q(
+                    tournament_id__in={match.tournament_id for match in proposed},
+                    court__in={match.court for match in proposed if match.court},
+                )
+                | Q(player1_id__in=users)
+                | Q(player2_id__in=users)
+                | Q(referee_id__in=users)
+            )
+            .exclude(id__in=[match.id for match in proposed if match.id])
+            .exclude(status=Match.Status.CANCELLED)
+            .order_by()
+        )
+
+        bookings = [
+            (resource, match.scheduled_time, ConflictService._end(match), match)
+            for match in [*proposed, *booked]
+            for resource in ConflictService._resources(match)
+        ]
+        proposed_ids = {id(match) for match in proposed}
+        conflicts = []
+        for resource, first, second in scheduling.find_overlaps(bookings):
+            if id(first) not in proposed_ids:
+                first, second = second, first
+            if id(first) not in proposed_ids:
+                continue
+            conflict = {"match": first.id, "conflicts_with": second.id}
+            if resource[0] == "court":
+                conflict["court"] = resource[2]
+            else:
+                conflict["user"] = resource[1]
+            conflicts.append(conflict)
+        return conflicts
+
+    @staticmethod
+    def check(matches):
+        """Lock the bookings and raise ``ValidationError`` on any overlap."""
+        ConflictService.lock(matches)
+        conflicts = ConflictService.find_conflicts(matches)
+        if conflicts:
+            conflict = conflicts[0]
+            if "court" in conflict:
+                message = f"Court {conflict['court']} is already booked at that time."
+            else:
+                message = "A player or referee is already booked at that time."
+            if len(conflicts) > 1:
+                message += f" ({len(conflicts)} conflicts in total.)"
+            raise ValidationError(message)
+
+    @staticmethod
+    def check_schedule(tournament, entries):
+        """
+        Conflicts for a whole proposed schedule of ``entries``, each giving
+        a match id and its new time, and optionally its court and referee.
+        Nothing is saved.
+        """
+        matches = tournament.matches.in_bulk([entry["match"] for entry in entries])
+        for entry in entries:
+            match = matches.get(entry["match"])
+            if match is None:
+                raise NotFoundError(f"Match {entry['match']} not found.")
+            MatchService._set_schedule(
+                match, entry["scheduled_time"], entry.get("scheduled_end")
+            )
+            match.court = entry.get("court", match.court)
+            match.referee_id = entry.get("referee", match.referee_id)
+        return ConflictService.find_conflicts(list(matches.values()))
@@ -0,0 +1,174 @@
+"""
+Tests for court and participant booking conflicts.
+"""
+
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.tournaments.models import Match, Tournament
+from apps.tournaments.scheduling import find_overlaps
+from apps.tournaments.services import MatchService
+from core.db import TsTzRange
+from core.exceptions import ValidationError
+
+
+class FindOverlapsTest(SimpleTestCase):
+    """Test cases for the overlap sweep."""
+
+    def test_half_open_ranges(self):
+        """Test back-to-back bookings do not overlap but nested ones do."""
+        bookings = [
+            ("A", 0, 10, "first"),
+            ("A", 10, 20, "second"),
+            ("A", 12, 14, "third"),
+            ("B", 0, 30, "other court"),
+        ]
+
+        self.assertEqual(find_overlaps(bookings), [("A", "second", "third")])
+
+
+class ConflictServiceTest(TestCase):
+    """Test cases for ConflictService."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.players = [
+            User.objects.create_user(
+                username=f"player{i}",
+                email=f"p{i}@example.com",
+                password="pass123",
+                role=User.Role.PLAYER,
+            )
+            for i in range(4)
+        ]
+        self.tournaments = [
+            Tournament.objects.create(
+                name=f"Tournament {i}",
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=7),
+                location="Test City",
+                status=Tournament.Status.REGISTRATION,
+                created_by=self.organizer,
+            )
+            for i in range(2)
+        ]
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.match = MatchService.create_match(
+            {
+                "tournament": self.tournaments[0],
+                "player1": self.players[0],
+                "player2": self.players[1],
+                "court": "Centre",
+                "scheduled_time": self.start,
+            },
+            self.organizer,
+        )
+
+    def create(self, tournament, player1, player2, court, start):
+        return MatchService.create_match(
+            {
+                "tournament": tournament,
+                "player1": player1,
+                "player2": player2,
+                "court": court,
+                "scheduled_time": start,
+            },
+            self.organizer,
+        )
+
+    def test_court_double_booking(self):
+        """Test a court cannot host two overlapping matches."""
+        with self.assertRaisesMessage(ValidationError, "Court Centre"):
+            self.create(
+                self.tournaments[0],
+                self.players[2],
+                self.players[3],
+                "Centre",
+                self.start + timedelta(minutes=30),
+            )
+
+        match = self.create(
+            self.tournaments[0],
+            self.players[2],
+            self.players[3],
+            "Centre",
+            self.start + timedelta(minutes=90),
+        )
+        self.assertEqual(match.scheduled_end, self.start + timedelta(minutes=180))
+
+    def test_courts_belong_to_their_tournament(self):
+        """Test another tournament may use a court with the same name."""
+        self.create(
+            self.tournaments[1], self.players[2], self.players[3], "Centre", self.start
+        )
+
+        self.assertEqual(Match.objects.count(), 2)
+
+    def test_player_double_booking_across_tournaments(self):
+        """Test a player cannot be in two places at once."""
+        with self.assertRaises(ValidationError):
+            self.create(
+                self.tournaments[1],
+                self.players[0],
+                self.players[3],
+                "Court 2",
+                self.start + timedelta(minutes=60),
+            )
+
+    def test_overlap_query_uses_booking_index(self):
+        """Test the overlap probe can be answered from the GiST index."""
+        queryset = Match.objects.alias(
+            booking=TsTzRange("scheduled_time", "scheduled_end")
+        ).filter(
+            scheduled_time__isnull=False,
+            booking__overlap=(self.start, self.start + timedelta(hours=1)),
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+
+        self.assertIn("matches_booking_idx", plan)
+
+    def test_schedule_check_endpoint(self):
+        """Test a whole proposed schedule is checked in one call."""
+        other = self.create(
+            self.tournaments[0], self.players[2], self.players[3], "Court 2", None
+        )
+        self.client.force_authenticate(user=self.organizer)
+        later = self.start + timedelta(hours=3)
+
+        response = self.client.post(
+            f"/api/tournaments/{self.tournaments[0].id}/schedule/check/",
+            {
+                "matches": [
+                    {"match": self.match.id, "scheduled_time": later.isoformat()},
+                    {
+                        "match": other.id,
+                        "scheduled_time": (later + timedelta(minutes=45)).isoformat(),
+                        "court": "Centre",
+                    },
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["conflicts"],
+            [{"match": self.match.id, "conflicts_with": other.id, "court": "Centre"}],
+        )
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.scheduled_time, self.start)
@@ -0,0 +1,188 @@
+"""
+Tests for draw generation.
+"""
+
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.models import User
+from apps.rankings.models import GlobalRanking
+from apps.tournaments.draws import draw_size, seed_positions
+from apps.tournaments.models import Match, Tournament
+from apps.scores.services import ScoreService
+from apps.tournaments.services import DrawService, MatchService
+from core.exceptions import InvalidStateError, PermissionDeniedError
+
+
+class SeedPositionsTest(SimpleTestCase):
+    """Test cases for standard seed placement."""
+
+    def test_eight_player_order(self):
+        """Test the usual 1-8, 4-5, 2-7, 3-6 layout."""
+        self.assertEqual(seed_positions(8), [1, 8, 4, 5, 2, 7, 3, 6])
+
+    def test_top_seeds_in_opposite_halves(self):
+        """Test seeds 1 and 2 can only meet in the final."""
+        positions = seed_positions(128)
+
+        self.assertEqual(sorted(positions), list(range(1, 129)))
+        self.assertIn(1, positions[:64])
+        self.assertIn(2, positions[64:])
+
+    def test_draw_size(self):
+        """Test draws round up to the next power of two."""
+        self.assertEqual([draw_size(n) for n in (2, 3, 8, 9, 100)], [2, 4, 8, 16, 128])
+
+
+class DrawServiceTest(TestCase):
+    """Test cases for DrawService."""
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            status=Tournament.Status.REGISTRATION,
+            created_by=self.organizer,
+        )
+
+    def register(self, count):
+        players = [
+            User.objects.create_user(
+                username=f"player{i}",
+                email=f"p{i}@example.com",
+                password="pass123",
+                role=User.Role.PLAYER,
+            )
+            for i in range(1, count + 1)
+        ]
+        self.tournament.players.add(*players)
+        return players
+
+    def test_full_draw(self):
+        """Test 8 players make quarterfinals, semifinals and a final."""
+        players = self.register(8)
+        for position, player in enumerate(players, 1):
+            GlobalRanking.objects.create(player=player, position=position)
+
+        with CaptureQueriesContext(connection) as queries:
+            matches = DrawService.generate_draw(self.tournament, self.organizer)
+
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "matches"')]
+        self.assertEqual(len(inserts), 1)
+
+        self.assertEqual(len(matches), 7)
+        rounds = [match.round for match in matches]
+        self.assertEqual(rounds.count(Match.Round.QUARTERFINAL), 4)
+        self.assertEqual(rounds.count(Match.Round.FINAL), 1)
+        first = Match.objects.get(round=Match.Round.QUARTERFINAL, bracket_position=1)
+        self.assertEqual((first.player1, first.player2), (players[0], players[7]))
+
+    def test_byes_go_to_top_seeds(self):
+        """Test with 6 players seeds 1 and 2 skip the first round."""
+        players = self.register(6)
+        for position, player in enumerate(players, 1):
+            GlobalRanking.objects.create(player=player, position=position)
+
+        DrawService.generate_draw(self.tournament, self.organizer)
+
+        self.assertEqual(
+            Match.objects.filter(round=Match.Round.QUARTERFINAL).count(), 2
+        )
+        semis = Match.objects.filter(round=Match.Round.SEMIFINAL).order_by(
+            "bracket_position"
+        )
+        self.assertEqual([m.player1 for m in semis], [players[0], players[1]])
+        self.assertEqual([m.player2 for m in semis], [None, None])
+
+    def test_unranked_players_fill_the_draw(self):
+        """Test players without a ranking are drawn after the seeds."""
+        players = self.register(3)
+        GlobalRanking.objects.create(player=players[2], position=1)
+
+        DrawService.generate_draw(self.tournament, self.organizer)
+
+        final = Match.objects.get(round=Match.Round.FINAL)
+        self.assertEqual(final.player1, players[2])
+        self.assertEqual(Match.objects.count(), 2)
+
+    def test_draw_only_once(self):
+        """Test a tournament with matches cannot be drawn again."""
+        self.register(4)
+        DrawService.generate_draw(self.tournament, self.organizer)
+
+        with self.assertRaises(InvalidStateError):
+            DrawService.generate_draw(self.tournament, self.organizer)
+
+    def test_organizer_only(self):
+        """Test players cannot generate draws."""
+        players = self.register(2)
+
+        with self.assertRaises(PermissionDeniedError):
+            DrawService.generate_draw(self.tournament, players[0])
+
+    def test_matches_are_linked_to_next_round(self):
+        """Test each match points at the slot its winner plays next."""
+        self.register(8)
+        DrawService.generate_draw(self.tournament, self.organizer)
+
+        final = Match.objects.get(round=Match.Round.FINAL)
+        semis = Match.objects.filter(round=Match.Round.SEMIFINAL).order_by(
+            "bracket_position"
+        )
+        self.assertEqual([m.next_match for m in semis], [final, final])
+        self.assertEqual([m.next_slot for m in semis], [1, 2])
+        quarter = Match.objects.get(round=Match.Round.QUARTERFINAL, bracket_position=4)
+        self.assertEqual((quarter.next_match, quarter.next_slot), (semis[1], 2))
+        self.assertIsNone(final.next_match)
+
+    def test_winner_advances_on_confirmed_score(self):
+        """Test finishing a match fills the next match without a scan."""
+        players = self.register(4)
+        referee = User.objects.create_user(
+            username="referee",
+            email="ref@example.com",
+            password="pass123",
+            role=User.Role.REFEREE,
+        )
+        DrawService.generate_draw(self.tournament, self.organizer)
+        semi = Match.objects.get(round=Match.Round.SEMIFINAL, bracket_position=2)
+        Match.objects.filter(id=semi.id).update(
+            referee=referee, status=Match.Status.IN_PROGRESS
+        )
+
+        ScoreService.submit_score(
+            semi.id,
+            [{"player1": 6, "player2": 4}, {"player1": 6, "player2": 4}],
+            referee,
+        )
+
+        final = Match.objects.get(round=Match.Round.FINAL)
+        self.assertIsNone(final.player1)
+        self.assertEqual(final.player2, semi.player1)
+        self.assertIn(final.player2, players)
+
+    def test_advance_winner_writes_one_row(self):
+        """Test advancing only updates the next match, whatever the draw size."""
+        self.register(16)
+        DrawService.generate_draw(self.tournament, self.organizer)
+        match = Match.objects.get(round=Match.Round.ROUND_16, bracket_position=3)
+        match.winner = match.player2
+
+        with CaptureQueriesContext(connection) as queries:
+            MatchService.advance_winner(match)
+
+        writes = [q for q in queries if q["sql"].startswith('UPDATE "matches"')]
+        self.assertEqual(len(writes), 2)
+        quarter = Match.objects.get(round=Match.Round.QUARTERFINAL, bracket_position=2)
+        self.assertEqual(quarter.player1, match.player2)
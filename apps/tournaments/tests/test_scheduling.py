@@ -0,0 +1,282 @@
+"""
+Tests for the match scheduler.
+"""
+
+import random
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import Q
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.tournaments import scheduling
+from apps.tournaments.management.commands.benchmark_scheduler import synthetic_event
+from apps.tournaments.models import Match, RefereeAvailability, Tournament
+from apps.tournaments.services import DrawService
+from core.exceptions import ValidationError
+
+
+def make_match(match_id, player1, player2, round=Match.Round.ROUND_32, **kwargs):
+    return Match(
+        id=match_id,
+        player1_id=player1,
+        player2_id=player2,
+        round=round,
+        **kwargs,
+    )
+
+
+class SchedulerTest(SimpleTestCase):
+    """Test cases for the scheduling heuristic."""
+
+    def test_players_rest_between_matches(self):
+        """Test a player's matches are more than rest slots apart."""
+        matches = [make_match(1, 1, 2), make_match(2, 1, 3), make_match(3, 4, 5)]
+
+        assignments = scheduling.Scheduler(matches, ["A", "B"], [], 10, rest=2).solve()
+
+        slots = sorted(assignments[match_id][0] for match_id in (1, 2))
+        self.assertEqual(slots, [0, 3])
+        self.assertEqual(assignments[3][0], 0)
+
+    def test_bracket_match_follows_feeders(self):
+        """Test a final is played after both semifinals plus rest."""
+        final = make_match(3, None, None, Match.Round.FINAL)
+        semis = [
+            make_match(1, 1, 2, Match.Round.SEMIFINAL, next_match_id=3),
+            make_match(2, 3, 4, Match.Round.SEMIFINAL, next_match_id=3),
+        ]
+
+        assignments = scheduling.Scheduler(
+            semis + [final], ["A"], [], 10, rest=1
+        ).solve()
+
+        self.assertEqual(assignments[3][0], 3)
+
+    def test_referee_availability(self):
+        """Test referees only work slots they are available for."""
+        matches = [make_match(i, 2 * i, 2 * i + 1) for i in range(1, 4)]
+
+        assignments = scheduling.Scheduler(
+            matches, ["A", "B", "C"], [10, 20], 5, availability={20: {2}}
+        ).solve()
+
+        self.assertEqual(
+            sorted((slot, referee) for slot, _, referee in assignments.values()),
+            [(0, 10), (1, 10), (2, 20)],
+        )
+
+    def test_bookings_block_slots(self):
+        """Test booked courts, referees and players are scheduled around."""
+        matches = [make_match(1, 1, 2), make_match(2, 3, 4)]
+        bookings = [([0], "A", {1, 10}), ([0, 1], None, {3})]
+
+        assignments = scheduling.Scheduler(
+            matches, ["A", "B"], [10, 20], 10, rest=1, bookings=bookings
+        ).solve()
+
+        self.assertEqual(assignments[1], (2, "A", 10))
+        self.assertEqual(assignments[2], (3, "A", 20))
+
+    def test_not_enough_slots(self):
+        """Test an impossible schedule raises instead of dropping matches."""
+        matches = [make_match(1, 1, 2), make_match(2, 1, 3)]
+
+        with self.assertRaises(ValidationError):
+            scheduling.Scheduler(matches, ["A"], [], 1).solve()
+
+    def test_large_event(self):
+        """Test a 256 match event gets a valid schedule."""
+        rng = random.Random(1)
+        matches, referees, availability = synthetic_event(256, 20, 32, rng)
+        scheduler = scheduling.Scheduler(
+            matches,
+            [f"Court {i}" for i in range(16)],
+            referees,
+            32,
+            rest=1,
+            availability=availability,
+        )
+
+        assignments = scheduler.solve()
+
+        self.assertEqual(len(assignments), 256)
+        self.assertLessEqual(scheduler.makespan, scheduler.greedy_makespan)
+        self.assertEqual(
+            scheduling.check_schedule(matches, assignments, 1, availability), []
+        )
+
+    def test_slot_times_stop_at_day_end(self):
+        """Test each day runs from the start time to the day end."""
+        start = datetime(2030, 5, 1, 18, 0, tzinfo=timezone.get_current_timezone())
+
+        times = scheduling.slot_times(
+            start, date(2030, 5, 2), timedelta(minutes=90), time(21, 0)
+        )
+
+        self.assertEqual(
+            [t.strftime("%d %H:%M") for t in times][1:3], ["01 19:30", "02 18:00"]
+        )
+
+
+class ScheduleServiceTest(TestCase):
+    """Test cases for scheduling a tournament through the API."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.referee = User.objects.create_user(
+            username="referee",
+            email="ref@example.com",
+            password="pass123",
+            role=User.Role.REFEREE,
+        )
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=2),
+            location="Test City",
+            status=Tournament.Status.REGISTRATION,
+            created_by=self.organizer,
+        )
+        self.tournament.referees.add(self.referee)
+        players = [
+            User.objects.create_user(
+                username=f"player{i}",
+                email=f"p{i}@example.com",
+                password="pass123",
+                role=User.Role.PLAYER,
+            )
+            for i in range(8)
+        ]
+        self.tournament.players.add(*players)
+        DrawService.generate_draw(self.tournament, self.organizer)
+        self.start = timezone.now().replace(
+            hour=9, minute=0, second=0, microsecond=0
+        ) + timedelta(days=1)
+
+    def test_schedule_endpoint(self):
+        """Test every match gets a time, court and referee."""
+        self.client.force_authenticate(user=self.organizer)
+
+        response = self.client.post(
+            f"/api/tournaments/{self.tournament.id}/schedule/",
+            {"start": self.start.isoformat(), "courts": ["1", "2"]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        matches = Match.objects.filter(tournament=self.tournament)
+        self.assertFalse(matches.filter(scheduled_time__isnull=True).exists())
+        self.assertFalse(matches.exclude(referee=self.referee).exists())
+        final = matches.get(round=Match.Round.FINAL)
+        semi = matches.filter(round=Match.Round.SEMIFINAL).latest("scheduled_time")
+        self.assertGreaterEqual(
+            final.scheduled_time - semi.scheduled_time, timedelta(minutes=150)
+        )
+
+    def test_schedule_avoids_existing_bookings(self):
+        """Test started and other tournaments' matches keep their slots."""
+        length = timedelta(minutes=90)
+        started = Match.objects.filter(tournament=self.tournament).first()
+        Match.objects.filter(id=started.id).update(
+            status=Match.Status.IN_PROGRESS,
+            scheduled_time=self.start,
+            scheduled_end=self.start + length,
+            court="1",
+            referee=self.referee,
+        )
+        player = (
+            Match.objects.filter(tournament=self.tournament, player1__isnull=False)
+            .exclude(id=started.id)
+            .first()
+            .player1
+        )
+        other = Tournament.objects.create(
+            name="Other Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=2),
+            location="Other City",
+            created_by=self.organizer,
+        )
+        elsewhere = Match.objects.create(
+            tournament=other,
+            player1=player,
+            scheduled_time=self.start + length,
+            scheduled_end=self.start + 2 * length,
+            court="1",
+        )
+        self.client.force_authenticate(user=self.organizer)
+
+        response = self.client.post(
+            f"/api/tournaments/{self.tournament.id}/schedule/",
+            {"start": self.start.isoformat(), "courts": ["1", "2"]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        started.refresh_from_db()
+        self.assertEqual(started.scheduled_time, self.start)
+        scheduled = Match.objects.filter(
+            tournament=self.tournament, status=Match.Status.SCHEDULED
+        )
+        self.assertFalse(scheduled.filter(scheduled_time=self.start).exists())
+        self.assertFalse(
+            scheduled.filter(Q(player1=player) | Q(player2=player))
+            .filter(scheduled_time__lt=elsewhere.scheduled_end + length)
+            .exists()
+        )
+
+    def test_availability_limits_schedule(self):
+        """Test a referee's windows bound the slots they are given."""
+        self.client.force_authenticate(user=self.referee)
+        end = self.start + timedelta(hours=6)
+        response = self.client.post(
+            f"/api/tournaments/{self.tournament.id}/availability/",
+            {"start": self.start.isoformat(), "end": end.isoformat()},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.post(
+            f"/api/tournaments/{self.tournament.id}/schedule/",
+            {"start": self.start.isoformat(), "courts": ["1", "2"]},
+            format="json",
+        )
+
+        # One referee for seven matches in four 90 minute slots.
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Match.objects.filter(scheduled_time__isnull=False).exists())
+
+    def test_referee_cannot_set_others_availability(self):
+        """Test referees only manage their own availability."""
+        other = User.objects.create_user(
+            username="other",
+            email="other@example.com",
+            password="pass123",
+            role=User.Role.REFEREE,
+        )
+        self.tournament.referees.add(other)
+        self.client.force_authenticate(user=self.referee)
+
+        response = self.client.post(
+            f"/api/tournaments/{self.tournament.id}/availability/",
+            {
+                "referee_id": other.id,
+                "start": self.start.isoformat(),
+                "end": (self.start + timedelta(hours=2)).isoformat(),
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(RefereeAvailability.objects.exists())
@@ -0,0 +1,123 @@
+"""
+Tests for tournament and match search.
+"""
+
+from datetime import date, timedelta
+
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.tournaments.models import Match, Tournament
+from apps.tournaments.services import MatchService, TournamentService
+
+
+class SearchTest(TestCase):
+    """Test cases for full-text search."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.player = User.objects.create_user(
+            username="rfed",
+            email="rfed@example.com",
+            password="pass123",
+            first_name="Roger",
+            last_name="Federer",
+            role=User.Role.PLAYER,
+        )
+        self.opponent = User.objects.create_user(
+            username="rnad",
+            email="rnad@example.com",
+            password="pass123",
+            first_name="Rafael",
+            last_name="Nadal",
+            role=User.Role.PLAYER,
+        )
+        self.open = self.create("Basel Open", "Basel", "Indoor hard courts")
+        self.cup = self.create("Autumn Cup", "Zurich", "Held near the Basel border")
+        self.masters = self.create("Clay Masters", "Madrid", "")
+        self.masters.players.add(self.player)
+        self.match = Match.objects.create(
+            tournament=self.cup, player1=self.opponent, player2=self.player
+        )
+        Match.objects.create(tournament=self.masters)
+
+    def create(self, name, location, description):
+        return Tournament.objects.create(
+            name=name,
+            description=description,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location=location,
+            created_by=self.organizer,
+        )
+
+    def test_name_ranks_above_description(self):
+        """Test a name match is listed before a description match."""
+        results = list(TournamentService.search_tournaments("basel"))
+
+        self.assertEqual(results, [self.open, self.cup])
+        self.assertGreater(results[0].rank, results[1].rank)
+
+    def test_stemmed_terms(self):
+        """Test words match regardless of their ending."""
+        results = TournamentService.search_tournaments("court")
+
+        self.assertEqual(list(results), [self.open])
+
+    def test_player_names_find_tournaments(self):
+        """Test a registered player's name finds their tournament."""
+        results = TournamentService.search_tournaments("federer")
+
+        self.assertEqual(list(results), [self.masters])
+
+    def test_location_matches(self):
+        """Test a tournament is found by its location."""
+        results = TournamentService.search_tournaments("madrid")
+
+        self.assertEqual(list(results), [self.masters])
+
+    def test_search_is_one_query(self):
+        """Test text and player matches come back from a single query."""
+        with self.assertNumQueries(1):
+            by_player = list(TournamentService.search_tournaments("roger"))
+        with self.assertNumQueries(1):
+            by_text = list(TournamentService.search_tournaments("basel"))
+        with self.assertNumQueries(1):
+            matches = list(MatchService.search_matches("roger"))
+
+        self.assertEqual(by_player, [self.masters])
+        self.assertEqual(by_text, [self.open, self.cup])
+        self.assertEqual(matches, [self.match])
+
+    def test_search_matches(self):
+        """Test matches are found by player or tournament."""
+        by_player = MatchService.search_matches("Roger Federer")
+        by_tournament = MatchService.search_matches("madrid")
+
+        self.assertEqual(list(by_player), [self.match])
+        self.assertEqual(
+            list(by_tournament), list(Match.objects.filter(tournament=self.masters))
+        )
+
+    def test_search_endpoints(self):
+        """Test the list endpoints accept a search parameter."""
+        self.client.force_authenticate(user=self.player)
+        response = self.client.get("/api/tournaments/", {"search": "zurich"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([t["id"] for t in response.data["results"]], [self.cup.id])
+
+        response = self.client.get(
+            "/api/tournaments/matches/", {"search": "nadal", "tournament": self.cup.id}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
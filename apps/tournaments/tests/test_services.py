@@ -4,7 +4,12 @@ Tests for tournament services.
 
 from datetime import date, timedelta
 
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
 
 from apps.accounts.models import User
 from apps.tournaments.models import Match, Tournament
@@ -180,6 +185,192 @@ class TournamentServiceTest(TestCase):
             TournamentService.start_tournament(tournament, self.organizer)
 
 
+class BulkRegistrationTest(TestCase):
+    """Test cases for registering many players at once."""
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        self.players = [
+            User.objects.create_user(
+                username=f"player{i}",
+                email=f"player{i}@example.com",
+                password="pass123",
+                role=User.Role.PLAYER,
+            )
+            for i in range(5)
+        ]
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            location="Test City",
+            status=Tournament.Status.REGISTRATION,
+            max_players=4,
+            created_by=self.organizer,
+        )
+        self.tournament.players.add(self.players[0])
+
+    def test_per_row_results(self):
+        """Test every row reports whether it was added and why not."""
+        rows = [
+            str(self.players[1].id),
+            "player2",
+            "PLAYER3@example.com",
+            "player2",
+            self.players[0].username,
+            "organizer",
+            "player4",
+        ]
+
+        results = TournamentService.register_players(
+            self.tournament, rows, self.organizer
+        )
+
+        self.assertEqual(
+            [result["status"] for result in results],
+            [
+                "added",
+                "added",
+                "added",
+                "duplicate",
+                "already_registered",
+                "not_found",
+                "full",
+            ],
+        )
+        self.assertEqual(self.tournament.players.count(), 4)
+
+    def test_blank_rows_and_unusual_usernames(self):
+        """Test blank rows are not found and any username can be matched."""
+        User.objects.create_user(
+            username="noemail", email="", password="pass123", role=User.Role.PLAYER
+        )
+        at_sign = User.objects.create_user(
+            username="ace@court",
+            email="ace@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+        digits = User.objects.create_user(
+            username="900001",
+            email="digits@example.com",
+            password="pass123",
+            role=User.Role.PLAYER,
+        )
+
+        results = TournamentService.register_players(
+            self.tournament, ["", "ace@court", "900001"], self.organizer
+        )
+
+        self.assertEqual(
+            [(result["status"], result["player_id"]) for result in results],
+            [("not_found", None), ("added", at_sign.id), ("added", digits.id)],
+        )
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Test 128 players are registered with a fixed number of queries."""
+        self.tournament.max_players = 128
+        users = User.objects.bulk_create(
+            User(
+                username=f"bulk{i}", email=f"bulk{i}@example.com", role=User.Role.PLAYER
+            )
+            for i in range(127)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            results = TournamentService.register_players(
+                self.tournament, [user.username for user in users], self.organizer
+            )
+
+        # Savepoint, lock, registered ids, players, insert, release.
+        self.assertEqual(len(queries), 6)
+        self.assertTrue(all(result["status"] == "added" for result in results))
+        self.assertEqual(self.tournament.players.count(), 128)
+
+    def test_csv_import_endpoint(self):
+        """Test a CSV with a header imports from the named column."""
+        client = APIClient()
+        client.force_authenticate(user=self.organizer)
+        upload = SimpleUploadedFile(
+            "players.csv",
+            b"name,email\r\nOne,player1@example.com\r\n\r\nTwo,nobody@example.com\r\n",
+            content_type="text/csv",
+        )
+
+        response = client.post(
+            f"/api/tournaments/{self.tournament.id}/add-players/",
+            {"file": upload},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["added"], 1)
+        self.assertEqual(
+            [(r["row"], r["status"]) for r in response.data["results"]],
+            [(1, "added"), (2, "not_found")],
+        )
+
+    def test_registration_closed(self):
+        """Test bulk registration follows the same status rules."""
+        self.tournament.status = Tournament.Status.IN_PROGRESS
+
+        with self.assertRaises(InvalidStateError):
+            TournamentService.register_players(
+                self.tournament, ["player1"], self.organizer
+            )
+
+
+class TournamentListQueryTest(TestCase):
+    """Test tournament lists count players without a query per tournament."""
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            email="org@example.com",
+            password="pass123",
+            role=User.Role.ORGANIZER,
+        )
+        players = User.objects.bulk_create(
+            User(username=f"p{i}", email=f"p{i}@example.com", role=User.Role.PLAYER)
+            for i in range(3)
+        )
+        for count in range(4):
+            tournament = Tournament.objects.create(
+                name=f"Tournament {count}",
+                start_date=date.today() + timedelta(days=count),
+                end_date=date.today() + timedelta(days=7),
+                location="Test City",
+                created_by=self.organizer,
+            )
+            tournament.players.add(*players[:count])
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.organizer)
+
+    def test_list_query_count(self):
+        """Test the list is a count and a page query."""
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/tournaments/")
+
+        self.assertEqual(
+            [t["player_count"] for t in response.data["results"]], [3, 2, 1, 0]
+        )
+
+    def test_detail_query_count(self):
+        """Test the detail view loads players and referees once."""
+        tournament = Tournament.objects.get(name="Tournament 2")
+
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/api/tournaments/{tournament.id}/")
+
+        self.assertEqual(response.data["player_count"], 2)
+        self.assertEqual(len(response.data["players"]), 2)
+
+
 class MatchServiceTest(TestCase):
     """Test cases for MatchService."""
 
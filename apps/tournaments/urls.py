@@ -12,6 +12,11 @@ urlpatterns = [
         views.TournamentAddPlayerView.as_view(),
         name="add-player",
     ),
+    path(
+        "<int:pk>/add-players/",
+        views.TournamentBulkAddPlayersView.as_view(),
+        name="add-players",
+    ),
     path(
         "<int:pk>/remove-player/<int:player_id>/",
         views.TournamentRemovePlayerView.as_view(),
@@ -27,6 +32,22 @@ urlpatterns = [
         views.TournamentStatusView.as_view(),
         name="tournament-status",
     ),
+    path("<int:pk>/draw/", views.TournamentDrawView.as_view(), name="tournament-draw"),
+    path(
+        "<int:pk>/schedule/",
+        views.TournamentScheduleView.as_view(),
+        name="tournament-schedule",
+    ),
+    path(
+        "<int:pk>/schedule/check/",
+        views.TournamentScheduleCheckView.as_view(),
+        name="schedule-check",
+    ),
+    path(
+        "<int:pk>/availability/",
+        views.TournamentAvailabilityView.as_view(),
+        name="referee-availability",
+    ),
     path(
         "<int:pk>/matches/",
         views.TournamentMatchesView.as_view(),
@@ -4,7 +4,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.accounts.permissions import IsOrganizer, IsOrganizerOrReadOnly
+from apps.accounts.permissions import (
+    IsOrganizer,
+    IsOrganizerOrReadOnly,
+    IsOrganizerOrReferee,
+)
 from core.exceptions import (
     InvalidStateError,
     NotFoundError,
@@ -12,20 +16,31 @@ from core.exceptions import (
     ValidationError,
 )
 
-from .models import Match, Tournament
+from .models import Match, RefereeAvailability, Tournament
 from .serializers import (
     AddPlayerSerializer,
     AssignPlayersSerializer,
     AssignRefereeSerializer,
+    BulkAddPlayersSerializer,
     MatchCreateSerializer,
     MatchListSerializer,
     MatchSerializer,
+    RefereeAvailabilityCreateSerializer,
+    RefereeAvailabilitySerializer,
+    ScheduleCheckSerializer,
+    ScheduleSerializer,
     TournamentCreateSerializer,
     TournamentDetailSerializer,
     TournamentListSerializer,
     TournamentSerializer,
 )
-from .services import MatchService, TournamentService
+from .services import (
+    ConflictService,
+    DrawService,
+    MatchService,
+    ScheduleService,
+    TournamentService,
+)
 
 
 class TournamentListCreateView(generics.ListCreateAPIView):
@@ -37,10 +52,13 @@ class TournamentListCreateView(generics.ListCreateAPIView):
         return TournamentListSerializer
 
     def get_queryset(self):
-        queryset = Tournament.objects.all()
+        queryset = TournamentService.get_tournaments()
         status_filter = self.request.query_params.get("status")
+        search = self.request.query_params.get("search", "").strip()
         if status_filter:
             queryset = queryset.filter(status=status_filter)
+        if search:
+            queryset = TournamentService.search_tournaments(search, queryset)
         return queryset
 
     def perform_create(self, serializer):
@@ -54,9 +72,14 @@ class TournamentListCreateView(generics.ListCreateAPIView):
 
 
 class TournamentDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Tournament.objects.all()
     permission_classes = [IsOrganizerOrReadOnly]
 
+    def get_queryset(self):
+        queryset = TournamentService.get_tournaments()
+        if self.request.method == "GET":
+            queryset = queryset.prefetch_related("players", "referees")
+        return queryset
+
     def get_serializer_class(self):
         if self.request.method == "GET":
             return TournamentDetailSerializer
@@ -101,6 +124,34 @@ class TournamentAddPlayerView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class TournamentBulkAddPlayersView(APIView):
+    permission_classes = [IsOrganizer]
+
+    def post(self, request, pk):
+        serializer = BulkAddPlayersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            tournament = Tournament.objects.get(pk=pk)
+            if "file" in serializer.validated_data:
+                players = TournamentService.read_players_csv(
+                    serializer.validated_data["file"]
+                )
+            else:
+                players = serializer.validated_data["players"]
+            results = TournamentService.register_players(
+                tournament, players, request.user
+            )
+            added = sum(1 for result in results if result["status"] == "added")
+            return Response({"added": added, "results": results})
+        except Tournament.DoesNotExist:
+            return Response(
+                {"error": "Tournament not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        except (ValidationError, InvalidStateError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
 class TournamentRemovePlayerView(APIView):
     permission_classes = [IsOrganizer]
 
@@ -172,12 +223,117 @@ class TournamentStatusView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class TournamentDrawView(APIView):
+    permission_classes = [IsOrganizer]
+
+    def post(self, request, pk):
+        try:
+            tournament = Tournament.objects.get(pk=pk)
+            matches = DrawService.generate_draw(tournament, request.user)
+            return Response(
+                {
+                    "message": f"Draw generated with {len(matches)} matches.",
+                    "matches": MatchListSerializer(matches, many=True).data,
+                },
+                status=status.HTTP_201_CREATED,
+            )
+        except Tournament.DoesNotExist:
+            return Response(
+                {"error": "Tournament not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        except (PermissionDeniedError, InvalidStateError, ValidationError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TournamentScheduleView(APIView):
+    permission_classes = [IsOrganizer]
+
+    def post(self, request, pk):
+        serializer = ScheduleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            tournament = Tournament.objects.get(pk=pk)
+            matches = ScheduleService.schedule_matches(
+                tournament, serializer.validated_data, request.user
+            )
+            return Response(
+                {
+                    "message": f"Scheduled {len(matches)} matches.",
+                    "matches": MatchListSerializer(matches, many=True).data,
+                }
+            )
+        except Tournament.DoesNotExist:
+            return Response(
+                {"error": "Tournament not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        except (PermissionDeniedError, InvalidStateError, ValidationError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TournamentScheduleCheckView(APIView):
+    permission_classes = [IsOrganizer]
+
+    def post(self, request, pk):
+        serializer = ScheduleCheckSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            tournament = Tournament.objects.get(pk=pk)
+            conflicts = ConflictService.check_schedule(
+                tournament, serializer.validated_data["matches"]
+            )
+            return Response({"conflicts": conflicts})
+        except Tournament.DoesNotExist:
+            return Response(
+                {"error": "Tournament not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        except NotFoundError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except ValidationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TournamentAvailabilityView(APIView):
+    permission_classes = [IsOrganizerOrReferee]
+
+    def get(self, request, pk):
+        availability = RefereeAvailability.objects.filter(
+            tournament_id=pk
+        ).select_related("referee")
+        return Response(RefereeAvailabilitySerializer(availability, many=True).data)
+
+    def post(self, request, pk):
+        serializer = RefereeAvailabilityCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            tournament = Tournament.objects.get(pk=pk)
+            availability = TournamentService.add_referee_availability(
+                tournament, serializer.validated_data, request.user
+            )
+            return Response(
+                RefereeAvailabilitySerializer(availability).data,
+                status=status.HTTP_201_CREATED,
+            )
+        except Tournament.DoesNotExist:
+            return Response(
+                {"error": "Tournament not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        except PermissionDeniedError as e:
+            return Response({"error": str(e)}, status=status.HTTP_403_FORBIDDEN)
+        except ValidationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
 class TournamentMatchesView(generics.ListAPIView):
     serializer_class = MatchListSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Match.objects.filter(tournament_id=self.kwargs["pk"])
+        return Match.objects.filter(tournament_id=self.kwargs["pk"]).select_related(
+            "tournament", "player1", "player2"
+        )
 
 
 class MatchListCreateView(generics.ListCreateAPIView):
@@ -192,11 +348,14 @@ class MatchListCreateView(generics.ListCreateAPIView):
         queryset = Match.objects.all()
         tournament_id = self.request.query_params.get("tournament")
         status_filter = self.request.query_params.get("status")
+        search = self.request.query_params.get("search", "").strip()
 
         if tournament_id:
             queryset = queryset.filter(tournament_id=tournament_id)
         if status_filter:
             queryset = queryset.filter(status=status_filter)
+        if search:
+            queryset = MatchService.search_matches(search, queryset)
 
         return queryset
 
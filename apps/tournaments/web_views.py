@@ -2,16 +2,26 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from apps.accounts.models import User
 from apps.scores.models import Dispute, Score
+from core.exceptions import TennisException
 
 from .models import Match, Tournament
 from .services import MatchService, TournamentService
 
 
+def _parse_scheduled_time(value):
+    scheduled = parse_datetime(value) if value else None
+    if scheduled and timezone.is_naive(scheduled):
+        scheduled = timezone.make_aware(scheduled)
+    return scheduled
+
+
 def tournament_list(request):
-    tournaments = Tournament.objects.all()
+    tournaments = TournamentService.get_tournaments()
     status = request.GET.get("status")
     if status:
         tournaments = tournaments.filter(status=status)
@@ -25,14 +35,6 @@ def tournament_detail(request, pk):
     tournament = get_object_or_404(Tournament, pk=pk)
     matches = tournament.matches.all()
 
-    available_players = User.objects.filter(role=User.Role.PLAYER).exclude(
-        id__in=tournament.players.values_list("id", flat=True)
-    )
-
-    available_referees = User.objects.filter(role=User.Role.REFEREE).exclude(
-        id__in=tournament.referees.values_list("id", flat=True)
-    )
-
     if request.method == "POST" and request.user.is_authenticated:
         action = request.POST.get("action")
         try:
@@ -55,8 +57,6 @@ def tournament_detail(request, pk):
         {
             "tournament": tournament,
             "matches": matches,
-            "available_players": available_players,
-            "available_referees": available_referees,
         },
     )
 
@@ -120,10 +120,20 @@ def tournament_add_player(request, pk):
     tournament = get_object_or_404(Tournament, pk=pk)
 
     if request.method == "POST":
-        player_id = request.POST.get("player_id")
         try:
-            TournamentService.add_player(tournament, int(player_id), request.user)
-            messages.success(request, "Player added!")
+            if "csv_file" in request.FILES:
+                players = TournamentService.read_players_csv(request.FILES["csv_file"])
+            else:
+                players = request.POST.getlist("player_id")
+            results = TournamentService.register_players(
+                tournament, players, request.user
+            )
+            added = sum(1 for result in results if result["status"] == "added")
+            skipped = len(results) - added
+            if added:
+                messages.success(request, f"{added} player(s) added!")
+            if skipped:
+                messages.warning(request, f"{skipped} row(s) skipped.")
         except Exception as e:
             messages.error(request, str(e))
 
@@ -223,6 +233,9 @@ def match_create(request, tournament_id):
                 ),
                 "round": request.POST.get("round", "R32"),
                 "court": request.POST.get("court", ""),
+                "scheduled_time": _parse_scheduled_time(
+                    request.POST.get("scheduled_time")
+                ),
             }
             match = MatchService.create_match(data, request.user)
             messages.success(request, "Match created!")
@@ -246,14 +259,19 @@ def match_edit(request, pk):
     match = get_object_or_404(Match, pk=pk)
 
     if request.method == "POST":
-        match.court = request.POST.get("court", "")
-        match.round = request.POST.get("round", match.round)
-        scheduled = request.POST.get("scheduled_time")
+        data = {
+            "court": request.POST.get("court", ""),
+            "round": request.POST.get("round", match.round),
+        }
+        scheduled = _parse_scheduled_time(request.POST.get("scheduled_time"))
         if scheduled:
-            match.scheduled_time = scheduled
-        match.save()
-        messages.success(request, "Match updated!")
-        return redirect("match_detail", pk=pk)
+            data["scheduled_time"] = scheduled
+        try:
+            MatchService.reschedule_match(match, data, request.user)
+            messages.success(request, "Match updated!")
+            return redirect("match_detail", pk=pk)
+        except TennisException as e:
+            messages.error(request, str(e))
 
     return render(
         request,
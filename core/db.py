@@ -0,0 +1,24 @@
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.db.models import BooleanField, Func
+
+
+class TsTzRange(Func):
+    """``tstzrange(start, end)``, half open like the bookings it describes."""
+
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
+class AnyOf(Func):
+    """
+    ``expression = ANY(array)``. Unlike ``IN (subquery)``, it can be an
+    index condition when OR-ed with other indexed conditions.
+    """
+
+    output_field = BooleanField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        lhs, array = self.get_source_expressions()
+        lhs_sql, lhs_params = compiler.compile(lhs)
+        array_sql, array_params = compiler.compile(array)
+        return f"{lhs_sql} = ANY({array_sql})", (*lhs_params, *array_params)
@@ -19,8 +19,16 @@ class InvalidStateError(TennisException):
 
 
 class ScoreConflictError(TennisException):
-    pass
+    def __init__(self, message, score=None):
+        super().__init__(message)
+        self.score = score
 
 
 class DisputeError(TennisException):
     pass
+
+
+class UploadOffsetError(TennisException):
+    def __init__(self, message, offset):
+        super().__init__(message)
+        self.offset = offset
@@ -0,0 +1,147 @@
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseNotModified,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+from django.utils.http import http_date, parse_etags
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+BLOCK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    Return the inclusive (start, end) of a single byte range, or None when the
+    whole file should be sent. Multiple ranges are answered with the whole
+    file, which RFC 9110 allows.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable
+    return start, end
+
+
+def iter_range(f, start, length):
+    try:
+        f.seek(start)
+        while length > 0:
+            block = f.read(min(BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+    finally:
+        f.close()
+
+
+def send_file(
+    request,
+    field_file,
+    *,
+    etag,
+    last_modified,
+    content_type="application/octet-stream",
+    filename=None,
+    cache_control="private, max-age=3600",
+):
+    """
+    Serve a stored file after the caller has checked permissions.
+
+    Files in remote storage (S3 and the like) are answered with a redirect to
+    the storage's short-lived signed URL. With SENDFILE_HEADER set, the web server (nginx X-Accel-Redirect or
+    Apache/lighttpd X-Sendfile) streams the file and handles ranges itself.
+    Otherwise whole files go through FileResponse, which lets the WSGI server
+    use sendfile(), and single ranges are streamed in fixed-size blocks.
+    """
+    quoted_etag = f'"{etag}"'
+    headers = {
+        "ETag": quoted_etag,
+        "Last-Modified": http_date(last_modified.timestamp()),
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+    if filename:
+        headers["Content-Disposition"] = f"inline; filename*=UTF-8''{quote(filename)}"
+
+    if quoted_etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+        for header in ("ETag", "Cache-Control", "Last-Modified"):
+            response[header] = headers[header]
+        return response
+
+    try:
+        field_file.path
+    except NotImplementedError:
+        return HttpResponseRedirect(
+            field_file.url, headers={"Cache-Control": "no-store"}
+        )
+
+    if settings.SENDFILE_HEADER:
+        response = HttpResponse(content_type=content_type, headers=headers)
+        if settings.SENDFILE_HEADER == "X-Accel-Redirect":
+            location = settings.SENDFILE_INTERNAL_URL + quote(field_file.name)
+        else:
+            location = field_file.path
+        response[settings.SENDFILE_HEADER] = location
+        return response
+
+    size = field_file.size
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if not if_range or if_range == quoted_etag:
+        try:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        except RangeNotSatisfiable:
+            return HttpResponse(
+                status=416, headers={"Content-Range": f"bytes */{size}", **headers}
+            )
+
+    if request.method == "HEAD":
+        return HttpResponse(
+            content_type=content_type,
+            headers={"Content-Length": size, **headers},
+        )
+
+    if byte_range is None:
+        return FileResponse(
+            field_file.open("rb"),
+            content_type=content_type,
+            filename=filename or "",
+            headers=headers,
+        )
+
+    start, end = byte_range
+    length = end - start + 1
+    response = StreamingHttpResponse(
+        iter_range(field_file.open("rb"), start, length),
+        status=206,
+        content_type=content_type,
+        headers=headers,
+    )
+    response["Content-Length"] = length
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
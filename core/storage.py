@@ -0,0 +1,100 @@
+import base64
+import posixpath
+
+from django.conf import settings
+from django.core.files.storage import storages
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import LazyObject, empty
+
+EVIDENCE_STORAGE_ALIAS = "evidence"
+
+
+class EvidenceStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = storages[EVIDENCE_STORAGE_ALIAS]
+
+
+evidence_storage = EvidenceStorage()
+
+
+def get_evidence_storage():
+    return evidence_storage
+
+
+@receiver(setting_changed)
+def reset_evidence_storage(*, setting, **kwargs):
+    if setting in ("STORAGES", "MEDIA_ROOT"):
+        evidence_storage._wrapped = empty
+
+
+def supports_direct_upload(storage=evidence_storage):
+    """Direct uploads need an S3-compatible backend (django-storages S3Storage)."""
+    return hasattr(storage, "bucket_name") and hasattr(storage, "connection")
+
+
+class DirectUploads:
+    """
+    Presigned PUT uploads straight into the evidence bucket. The client sends
+    x-amz-checksum-sha256 as a signed header, so the store itself rejects
+    bytes that do not match the hash declared when the upload was created.
+    """
+
+    def __init__(self, storage=evidence_storage):
+        if not supports_direct_upload(storage):
+            raise NotImplementedError(
+                "Evidence storage does not support direct uploads."
+            )
+        self.storage = storage
+        self.client = storage.connection.meta.client
+        self.bucket = storage.bucket_name
+
+    def key(self, name):
+        location = getattr(self.storage, "location", "")
+        return posixpath.join(location, name) if location else name
+
+    def presign_put(self, name, size, sha256, content_type):
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+        url = self.client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self.key(name),
+                "ContentLength": size,
+                "ContentType": content_type,
+                "ChecksumSHA256": checksum,
+            },
+            ExpiresIn=settings.EVIDENCE_DIRECT_UPLOAD_EXPIRY,
+        )
+        headers = {
+            "Content-Type": content_type,
+            "x-amz-checksum-sha256": checksum,
+        }
+        return url, headers
+
+    def head(self, name):
+        """Return (size, sha256 hex or None) of an uploaded object, or None."""
+        try:
+            response = self.client.head_object(
+                Bucket=self.bucket, Key=self.key(name), ChecksumMode="ENABLED"
+            )
+        except self.client.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+        checksum = response.get("ChecksumSHA256")
+        sha256 = base64.b64decode(checksum).hex() if checksum else None
+        return response["ContentLength"], sha256
+
+    def move(self, source, target):
+        # Managed copy switches to multipart copy for large objects.
+        self.client.copy(
+            {"Bucket": self.bucket, "Key": self.key(source)},
+            self.bucket,
+            self.key(target),
+        )
+        self.client.delete_object(Bucket=self.bucket, Key=self.key(source))
+
+    def delete(self, name):
+        self.client.delete_object(Bucket=self.bucket, Key=self.key(name))
@@ -8,6 +8,11 @@ def evidence_upload_path(instance, filename):
     return os.path.join("evidence", str(instance.dispute.id), new_filename)
 
 
+def evidence_blob_path(sha256, filename):
+    ext = os.path.splitext(filename)[1].lower()
+    return os.path.join("evidence", "blobs", sha256[:2], f"{sha256}{ext}")
+
+
 def validate_set_scores(set_scores):
     if not isinstance(set_scores, list):
         return False, "Set scores must be a list"
@@ -53,6 +58,26 @@ def validate_set_scores(set_scores):
     return True, None
 
 
+def diff_set_scores(old, new):
+    changes = [
+        [i, set_score["player1"], set_score["player2"]]
+        for i, set_score in enumerate(new)
+        if i >= len(old) or old[i] != set_score
+    ]
+    return {"length": len(new), "sets": changes}
+
+
+def apply_set_scores_diff(set_scores, diff):
+    result = [dict(set_score) for set_score in set_scores[: diff["length"]]]
+    for i, p1, p2 in diff["sets"]:
+        set_score = {"player1": p1, "player2": p2}
+        if i < len(result):
+            result[i] = set_score
+        else:
+            result.append(set_score)
+    return result
+
+
 def determine_match_winner(set_scores):
     player1_sets = 0
     player2_sets = 0
@@ -18,12 +18,14 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "corsheaders",
     "apps.accounts",
     "apps.tournaments",
     "apps.scores",
     "apps.rankings",
+    "apps.media",
 ]
 
 MIDDLEWARE = [
@@ -68,6 +70,15 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"
@@ -90,9 +101,50 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    "evidence": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+}
+
+# Evidence goes to an S3-compatible bucket (AWS, MinIO, ...) when a bucket is
+# configured. Needs the optional boto3 and django-storages packages.
+EVIDENCE_S3_BUCKET = os.getenv("EVIDENCE_S3_BUCKET", "")
+if EVIDENCE_S3_BUCKET:
+    STORAGES["evidence"] = {
+        "BACKEND": "storages.backends.s3.S3Storage",
+        "OPTIONS": {
+            "bucket_name": EVIDENCE_S3_BUCKET,
+            "endpoint_url": os.getenv("EVIDENCE_S3_ENDPOINT_URL") or None,
+            "region_name": os.getenv("EVIDENCE_S3_REGION") or None,
+            "access_key": os.getenv("EVIDENCE_S3_ACCESS_KEY") or None,
+            "secret_key": os.getenv("EVIDENCE_S3_SECRET_KEY") or None,
+            "querystring_expire": 300,
+        },
+    }
+EVIDENCE_DIRECT_UPLOAD_EXPIRY = int(os.getenv("EVIDENCE_DIRECT_UPLOAD_EXPIRY", "3600"))
+
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+EVIDENCE_UPLOAD_DIR = Path(os.getenv("EVIDENCE_UPLOAD_DIR", MEDIA_ROOT / "uploads"))
+EVIDENCE_UPLOAD_CHUNK_SIZE = 64 * 1024
+EVIDENCE_UPLOAD_MAX_SIZE = int(os.getenv("EVIDENCE_UPLOAD_MAX_SIZE", 2 * 1024**3))
+EVIDENCE_UPLOAD_EXPIRY_HOURS = int(os.getenv("EVIDENCE_UPLOAD_EXPIRY_HOURS", "24"))
+EVIDENCE_BLOB_GRACE_HOURS = int(os.getenv("EVIDENCE_BLOB_GRACE_HOURS", "1"))
+
+# "X-Accel-Redirect" (nginx) or "X-Sendfile" (Apache, lighttpd) hands evidence
+# downloads to the web server; empty serves them from Django.
+SENDFILE_HEADER = os.getenv("SENDFILE_HEADER", "")
+SENDFILE_INTERNAL_URL = os.getenv("SENDFILE_INTERNAL_URL", "/protected-media/")
+
+MEDIA_WORKERS = int(os.getenv("MEDIA_WORKERS", os.cpu_count() or 1))
+MEDIA_BATCH_SIZE = int(os.getenv("MEDIA_BATCH_SIZE", "8"))
+MEDIA_POLL_INTERVAL = float(os.getenv("MEDIA_POLL_INTERVAL", "2"))
+MEDIA_JOB_TIMEOUT = int(os.getenv("MEDIA_JOB_TIMEOUT", "600"))
+MEDIA_JOB_MAX_ATTEMPTS = 3
+MEDIA_RENDITION_SIZES = {"thumb": (320, 320), "web": (1600, 1600)}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
@@ -105,6 +157,12 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
+    "DEFAULT_THROTTLE_RATES": {
+        "score_writes_user": os.getenv("THROTTLE_SCORE_WRITES_USER", "30/min"),
+        "score_writes_ip": os.getenv("THROTTLE_SCORE_WRITES_IP", "120/min"),
+        "dispute_writes_user": os.getenv("THROTTLE_DISPUTE_WRITES_USER", "10/min"),
+        "dispute_writes_ip": os.getenv("THROTTLE_DISPUTE_WRITES_IP", "60/min"),
+    },
 }
 
 CORS_ALLOW_ALL_ORIGINS = DEBUG
@@ -116,3 +174,24 @@ CORS_ALLOWED_ORIGINS = (
     if not DEBUG
     else []
 )
+
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", "86400"))
+
+LIVE_SCORING_BEST_OF = int(os.getenv("LIVE_SCORING_BEST_OF", "3"))
+
+LIVE_FEED_CACHE_TTL = int(os.getenv("LIVE_FEED_CACHE_TTL", "2"))
+LIVE_FEED_POLL_INTERVAL = int(os.getenv("LIVE_FEED_POLL_INTERVAL", "2"))
+# Long polling holds a worker while it waits, so it is off unless enabled.
+LIVE_FEED_MAX_WAIT = int(os.getenv("LIVE_FEED_MAX_WAIT", "0"))
+LIVE_FEED_WAIT_INTERVAL = float(os.getenv("LIVE_FEED_WAIT_INTERVAL", "0.5"))
+LIVE_STATE_CACHE_TTL = int(os.getenv("LIVE_STATE_CACHE_TTL", "300"))
+BRACKET_CACHE_TTL = int(os.getenv("BRACKET_CACHE_TTL", "3600"))
+
+SCORE_AUTO_CONFIRM_AFTER_HOURS = int(os.getenv("SCORE_AUTO_CONFIRM_AFTER_HOURS", "48"))
+SWEEPER_BATCH_SIZE = int(os.getenv("SWEEPER_BATCH_SIZE", "100"))
+
+# Court and player bookings last this long unless an end time is given.
+MATCH_DURATION_MINUTES = int(os.getenv("MATCH_DURATION_MINUTES", "90"))
+
+# Dispute analytics keep one rollup row per day for this long, then one per month.
+DISPUTE_ROLLUP_DAILY_DAYS = int(os.getenv("DISPUTE_ROLLUP_DAILY_DAYS", "90"))